@@ -25,6 +25,88 @@ class Settings:
     # Production detection (Vercel)
     IS_PRODUCTION: bool = os.getenv("VERCEL_ENV") == "production"
 
+    # Inference micro-batching (concurrent predictions merged into one model call)
+    INFERENCE_BATCHING: bool = os.getenv("INFERENCE_BATCHING", "true").lower() == "true"
+    INFERENCE_BATCH_WINDOW_MS: float = float(os.getenv("INFERENCE_BATCH_WINDOW_MS", "2"))
+    INFERENCE_MAX_BATCH_SIZE: int = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "64"))
+
+    # Prediction cache (canonical draft / quantized game state -> result, LRU)
+    PREDICTION_CACHE: bool = os.getenv("PREDICTION_CACHE", "true").lower() == "true"
+    PREDICTION_CACHE_SIZE: int = int(os.getenv("PREDICTION_CACHE_SIZE", "4096"))
+
+    # HTTP response cache for data routes ("memory" = per worker, "sqlite" = shared by workers on the host)
+    RESPONSE_CACHE: bool = os.getenv("RESPONSE_CACHE", "true").lower() == "true"
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+    RESPONSE_CACHE_PATH: str = os.getenv("RESPONSE_CACHE_PATH", "/tmp/lol_api_response_cache.sqlite")
+
+    # Executor pools for blocking work (per workload class)
+    CPU_EXECUTOR_WORKERS: int = int(os.getenv("CPU_EXECUTOR_WORKERS", "2"))
+    CPU_EXECUTOR_MAX_QUEUE: int = int(os.getenv("CPU_EXECUTOR_MAX_QUEUE", "256"))
+    IO_EXECUTOR_WORKERS: int = int(os.getenv("IO_EXECUTOR_WORKERS", "8"))
+    IO_EXECUTOR_MAX_QUEUE: int = int(os.getenv("IO_EXECUTOR_MAX_QUEUE", "64"))
+
+    # Read backend: "postgres" (Supabase) or "sqlite" (embedded export, see api/core/embedded_db.py)
+    DB_BACKEND: str = os.getenv("DB_BACKEND", "postgres")
+    EMBEDDED_DB_PATH: str = os.getenv("EMBEDDED_DB_PATH", "./data/lol_data.sqlite")
+
+    # PostgreSQL connection pool (api/core/db_pool.py)
+    DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+    DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_MAX_IDLE_SECONDS: float = float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300"))
+    DB_POOL_MAX_LIFETIME_SECONDS: float = float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800"))
+    DB_POOL_HEALTH_CHECK_SECONDS: float = float(os.getenv("DB_POOL_HEALTH_CHECK_SECONDS", "30"))
+    # Server-side prepared statements for hot queries (disable behind a transaction-mode pgbouncer)
+    DB_PREPARED_STATEMENTS: bool = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+    # Async driver (asyncpg, if installed) for DB queries awaited directly by routers
+    DB_ASYNC_DRIVER: bool = os.getenv("DB_ASYNC_DRIVER", "false").lower() == "true"
+    # Database statistics: exact counts recomputed in the background this often; estimate query timeout
+    DB_STATS_TTL_SECONDS: float = float(os.getenv("DB_STATS_TTL_SECONDS", "300"))
+    DB_STATS_TIMEOUT_MS: int = int(os.getenv("DB_STATS_TIMEOUT_MS", "2000"))
+
+    # Model loading: "lazy" (each component on first use) or "eager" (all at startup)
+    MODEL_LOADING: str = os.getenv("MODEL_LOADING", "lazy")
+    # Lazy mode: preload everything in the background after the first response
+    MODEL_WARMUP: bool = os.getenv("MODEL_WARMUP", "true").lower() == "true"
+
+    # Engine snapshot (single-file bundle of DB data + models, see api/services/engine_snapshot.py)
+    ENGINE_SNAPSHOT: bool = os.getenv("ENGINE_SNAPSHOT", "true").lower() == "true"
+    ENGINE_SNAPSHOT_PATH: str = os.getenv("ENGINE_SNAPSHOT_PATH", "./models/engine_snapshot.bin")
+
+    # Model hot reload: poll interval of the model file watcher (0 = off, see api/services/model_reloader.py)
+    MODEL_RELOAD_POLL_SECONDS: float = float(os.getenv("MODEL_RELOAD_POLL_SECONDS", "10"))
+
+    # Background delta refresh of champion stats / synergies (0 = off, see api/services/data_refresher.py)
+    DATA_REFRESH_INTERVAL_SECONDS: float = float(os.getenv("DATA_REFRESH_INTERVAL_SECONDS", "300"))
+    # Re-read window behind the crawled_at watermark (catches slow loader transactions)
+    DATA_REFRESH_OVERLAP_SECONDS: float = float(os.getenv("DATA_REFRESH_OVERLAP_SECONDS", "120"))
+
+    # Riot live client API (override to point at scripts/live_client_standin.py); async transport via httpx
+    LIVE_CLIENT_URL: str = os.getenv("LIVE_CLIENT_URL", "https://127.0.0.1:2999/liveclientdata")
+    LIVE_CLIENT_ASYNC: bool = os.getenv("LIVE_CLIENT_ASYNC", "true").lower() == "true"
+    # Record every allgamedata payload the API polls into session files in this directory (empty = off, see live_session.py)
+    LIVE_RECORD_DIR: str = os.getenv("LIVE_RECORD_DIR", "")
+
+    # Live game stream (/api/live/stream): activeplayer / allgamedata poll rates, idle heartbeat
+    LIVE_PLAYER_POLL_SECONDS: float = float(os.getenv("LIVE_PLAYER_POLL_SECONDS", "1"))
+    LIVE_DATA_POLL_SECONDS: float = float(os.getenv("LIVE_DATA_POLL_SECONDS", "3"))
+    LIVE_STREAM_HEARTBEAT_SECONDS: float = float(os.getenv("LIVE_STREAM_HEARTBEAT_SECONDS", "15"))
+
+    # Pushed live sessions (/api/live/sessions): preallocated slots per worker, expiry after this long without a push
+    LIVE_SESSION_CAPACITY: int = int(os.getenv("LIVE_SESSION_CAPACITY", "5000"))
+    LIVE_SESSION_IDLE_SECONDS: float = float(os.getenv("LIVE_SESSION_IDLE_SECONDS", "120"))
+
+    # Monte Carlo partial-draft predictions (mode="monte_carlo")
+    CHAMPION_MC_SAMPLES: int = int(os.getenv("CHAMPION_MC_SAMPLES", "1000"))
+    CHAMPION_MC_MAX_SAMPLES: int = int(os.getenv("CHAMPION_MC_MAX_SAMPLES", "10000"))
+
+    # Draft ban search (beam-searched minimax, see ChampionMatchupPredictor.ban_suggestions)
+    DRAFT_BEAM_WIDTH: int = int(os.getenv("DRAFT_BEAM_WIDTH", "4"))
+    DRAFT_SEARCH_DEPTH: int = int(os.getenv("DRAFT_SEARCH_DEPTH", "3"))
+    DRAFT_SEARCH_BUDGET_MS: float = float(os.getenv("DRAFT_SEARCH_BUDGET_MS", "200"))
+    DRAFT_SEARCH_MAX_ROWS: int = int(os.getenv("DRAFT_SEARCH_MAX_ROWS", "20000"))
+
     @property
     def cors_origins(self) -> List[str]:
         """Get CORS origins as list"""
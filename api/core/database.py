@@ -1,15 +1,33 @@
 """
 Database Connection Module
-Provides PostgreSQL connection to Supabase
+Provides PostgreSQL connection to Supabase (pooled, see api/core/db_pool.py)
+
+With DB_BACKEND=sqlite, the read queries below run against an embedded
+SQLite export instead (see api/core/embedded_db.py), so their SQL is kept
+portable; PostgreSQL-only statements are branched on EMBEDDED.
 """
 
+import asyncio
 import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from typing import Optional, Dict, List
 from contextlib import contextmanager
 
+from api.core.config import settings
+from api.core.db_pool import ConnectionPool, PooledConnection, POOL_WAIT_MS_BUCKETS
+from api.core.executors import run_io
 from api.core.logging import logger
+from api.core.metrics import Histogram
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
 
 
 # Database Configuration
@@ -21,7 +39,12 @@ if SUPABASE_URL and SUPABASE_URL.startswith("postgres://"):
     SUPABASE_URL = SUPABASE_URL.replace("postgres://", "postgresql://", 1)
     logger.info("✓ Converted postgres:// to postgresql:// for SQLAlchemy compatibility")
 
-if not SUPABASE_URL:
+# Read backend: "postgres" (Supabase) or "sqlite" (embedded export)
+EMBEDDED = settings.DB_BACKEND == 'sqlite'
+
+if EMBEDDED:
+    logger.info(f"✓ Database reads served from embedded export {settings.EMBEDDED_DB_PATH}")
+elif not SUPABASE_URL:
     logger.warning("⚠️  Database URL not set - database features will be disabled")
 
 
@@ -52,33 +75,284 @@ def get_db_connection():
         raise RuntimeError(f"Failed to connect to database: {e}")
 
 
+# ============================================================================
+# CONNECTION POOL
+# ============================================================================
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def _connect_pooled() -> PooledConnection:
+    try:
+        return psycopg2.connect(
+            SUPABASE_URL,
+            connection_factory=PooledConnection,
+            cursor_factory=RealDictCursor
+        )
+    except psycopg2.Error as e:
+        logger.error(f"❌ Database connection failed: {e}")
+        raise RuntimeError(f"Failed to connect to database: {e}")
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Shared connection pool (created on first use)
+
+    Raises:
+        RuntimeError: If database URL not configured
+    """
+    global _pool
+    if _pool is None:
+        if not SUPABASE_URL:
+            raise RuntimeError(
+                "Database not configured. Set SUPABASE_URL or POSTGRES_URL environment variable."
+            )
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    SUPABASE_URL,
+                    min_size=settings.DB_POOL_MIN_SIZE,
+                    max_size=settings.DB_POOL_MAX_SIZE,
+                    timeout=settings.DB_POOL_TIMEOUT,
+                    max_idle=settings.DB_POOL_MAX_IDLE_SECONDS,
+                    max_lifetime=settings.DB_POOL_MAX_LIFETIME_SECONDS,
+                    health_check_after=settings.DB_POOL_HEALTH_CHECK_SECONDS,
+                    connect=_connect_pooled
+                )
+    return _pool
+
+
+def close_pool():
+    """Close the shared pool (shutdown, or in a pre-fork master before forking)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
 @contextmanager
 def get_db_cursor():
     """
-    Context manager for database cursor
+    Context manager for database cursor (on a pooled connection, or on
+    the embedded export with DB_BACKEND=sqlite)
 
     Usage:
         with get_db_cursor() as cur:
             cur.execute("SELECT * FROM matches")
             rows = cur.fetchall()
     """
-    conn = get_db_connection()
-    try:
+    if EMBEDDED:
+        with get_embedded_db().cursor() as cur:
+            yield cur
+        return
+
+    with get_pool().connection() as conn:
         cur = conn.cursor()
-        yield cur
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        cur.close()
-        conn.close()
+        try:
+            yield cur
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cur.close()
+
+
+# ============================================================================
+# EMBEDDED BACKEND (DB_BACKEND=sqlite)
+# ============================================================================
+
+_embedded_db = None
+
+
+def get_embedded_db():
+    """
+    Embedded SQLite export (opened on first use)
+
+    Raises:
+        RuntimeError: If the export file is missing or outdated
+    """
+    global _embedded_db
+    if _embedded_db is None:
+        from api.core.embedded_db import EmbeddedDatabase
+        with _pool_lock:
+            if _embedded_db is None:
+                _embedded_db = EmbeddedDatabase(settings.EMBEDDED_DB_PATH)
+    return _embedded_db
+
+
+def _timestamp(value) -> Optional[datetime]:
+    """Timestamp column aggregate as datetime (SQLite returns MAX(crawled_at) as ISO text)"""
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+# ============================================================================
+# HOT QUERIES (server-side prepared statements)
+# ============================================================================
+
+# Statement name -> SQL with $1..$n placeholders
+HOT_QUERIES = {
+    'hot_match_count': "SELECT COUNT(*) as count FROM matches",
+    'hot_champion_count': "SELECT COUNT(DISTINCT champion_id) as count FROM match_champions",
+    'hot_snapshot_count': "SELECT COUNT(*) as count FROM match_snapshots",
+    'hot_database_size': "SELECT pg_database_size(current_database()) as size",
+    'hot_data_watermark': "SELECT COUNT(*) as count, MAX(crawled_at) as max_crawled_at FROM matches",
+    'hot_champion_winrate': """
+        SELECT
+            COUNT(*) as games,
+            SUM(CASE WHEN m.blue_win AND mc.team = 'blue' THEN 1
+                     WHEN NOT m.blue_win AND mc.team = 'red' THEN 1
+                     ELSE 0 END) as wins
+        FROM match_champions mc
+        JOIN matches m ON mc.match_id = m.match_id
+        WHERE mc.champion_id = $1
+    """,
+}
+
+_PLACEHOLDER = re.compile(r'\$\d+')
+
+
+def execute_prepared(cur, name: str, statement: str, params: tuple = ()):
+    """
+    Run a hot query, as a prepared statement on pooled connections
+
+    Each pooled session PREPAREs a statement once and EXECUTEs it
+    afterwards (DB_PREPARED_STATEMENTS=false - e.g. behind a transaction-
+    mode pgbouncer - runs it as plain SQL instead).
+
+    Args:
+        cur: Cursor from get_db_cursor()
+        name: Statement name (unique per statement text)
+        statement: SQL with $1..$n placeholders, in parameter order
+        params: Parameter values
+    """
+    conn = cur.connection
+    if settings.DB_PREPARED_STATEMENTS and isinstance(conn, PooledConnection):
+        conn.execute_prepared(cur, name, statement, params)
+    else:
+        cur.execute(_PLACEHOLDER.sub('%s', statement), params or None)
+
+
+def execute_hot(cur, name: str, params: tuple = ()):
+    """Run one of HOT_QUERIES by name"""
+    execute_prepared(cur, name, HOT_QUERIES[name], params)
+
+
+# ============================================================================
+# ASYNC DRIVER (optional asyncpg path for routers)
+# ============================================================================
+
+_async_pool = None
+_async_pool_lock = asyncio.Lock()
+_async_wait_ms = Histogram(POOL_WAIT_MS_BUCKETS)
+_async_checkouts = 0
+
+
+def async_driver_enabled() -> bool:
+    """asyncpg requested (DB_ASYNC_DRIVER), installed and a database configured"""
+    return settings.DB_ASYNC_DRIVER and asyncpg is not None and bool(SUPABASE_URL) and not EMBEDDED
+
+
+async def _get_async_pool():
+    global _async_pool
+    if _async_pool is None:
+        async with _async_pool_lock:
+            if _async_pool is None:
+                _async_pool = await asyncpg.create_pool(
+                    SUPABASE_URL,
+                    min_size=settings.DB_POOL_MIN_SIZE,
+                    max_size=settings.DB_POOL_MAX_SIZE,
+                    max_inactive_connection_lifetime=settings.DB_POOL_MAX_IDLE_SECONDS
+                )
+                logger.info("✓ asyncpg pool created")
+    return _async_pool
+
+
+async def fetch_hot_async(name: str, params: tuple = ()) -> List[Dict]:
+    """
+    Run one of HOT_QUERIES from async code
+
+    With the async driver, the query runs on an asyncpg pool (whose
+    statement cache prepares it per connection) without a thread hop;
+    otherwise it runs on the pooled psycopg2 path on the io executor.
+    """
+    global _async_checkouts
+    if not async_driver_enabled():
+        return await run_io(_fetch_hot, name, params)
+
+    pool = await _get_async_pool()
+    started = time.perf_counter()
+    async with pool.acquire() as conn:
+        _async_wait_ms.observe((time.perf_counter() - started) * 1000)
+        _async_checkouts += 1
+        rows = await conn.fetch(HOT_QUERIES[name], *params)
+    return [dict(row) for row in rows]
+
+
+def _fetch_hot(name: str, params: tuple = ()) -> List[Dict]:
+    with get_db_cursor() as cur:
+        execute_hot(cur, name, params)
+        return [dict(row) for row in cur.fetchall()]
+
+
+async def close_async_pool():
+    """Close the asyncpg pool (shutdown)"""
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+
+
+def get_pool_stats() -> Dict:
+    """Connection pool metrics for the health endpoint"""
+    return {
+        'backend': settings.DB_BACKEND,
+        'sync': _pool.get_stats() if _pool is not None else None,
+        'async': {
+            'enabled': async_driver_enabled(),
+            'checkouts': _async_checkouts,
+            'wait_ms': _async_wait_ms.snapshot()
+        } if async_driver_enabled() else None,
+        'prepared_statements': settings.DB_PREPARED_STATEMENTS
+    }
+
+
+def get_data_watermark() -> Dict:
+    """
+    Get the current data watermark (match count + latest crawl time)
+
+    Snapshots of DB-derived data record this when they are built; a
+    different watermark means new matches were ingested since.
+
+    Returns:
+        {"matches": 12345, "max_crawled_at": "2025-01-01T12:00:00"}
+    """
+    with get_db_cursor() as cur:
+        execute_hot(cur, 'hot_data_watermark')
+        row = cur.fetchone()
+
+    max_crawled_at = _timestamp(row['max_crawled_at'])
+    return {
+        'matches': int(row['count']),
+        'max_crawled_at': max_crawled_at.isoformat() if max_crawled_at else None
+    }
 
 
 # ============================================================================
 # CHAMPION STATS QUERIES
 # ============================================================================
 
+def _table_exists(cur, table: str) -> bool:
+    """Whether a table exists (checked without aborting the transaction)"""
+    if EMBEDDED:
+        cur.execute("SELECT COUNT(*) as count FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+        return cur.fetchone()['count'] > 0
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL as exists", (table,))
+    return cur.fetchone()['exists']
+
+
 def get_champion_stats() -> Dict[str, Dict]:
     """
     Get champion statistics from database
@@ -99,6 +373,7 @@ def get_champion_stats() -> Dict[str, Dict]:
     """
     with get_db_cursor() as cur:
         # Try to get stats from champion_stats table first (if it exists)
+        cur.execute("SAVEPOINT champion_stats_lookup")
         try:
             cur.execute("""
                 SELECT name, games, wins, losses, win_rate, picks, bans
@@ -125,27 +400,43 @@ def get_champion_stats() -> Dict[str, Dict]:
                 logger.info(f"✓ Loaded champion stats for {len(stats)} champions from DB (champion_stats table)")
                 return stats
         except Exception as e:
-            logger.info(f"champion_stats table not found, falling back to match_champions: {e}")
+            # Keep the transaction usable for the fallbacks below
+            cur.execute("ROLLBACK TO SAVEPOINT champion_stats_lookup")
+            logger.info(f"champion_stats table not found, falling back to champion_agg: {e}")
+
+        # Incrementally maintained aggregate (see db_schema.sql)
+        rows = []
+        source = 'champion_agg table'
+        if _table_exists(cur, 'champion_agg'):
+            cur.execute("""
+                SELECT champion_id, games, wins, games - wins as losses
+                FROM champion_agg
+                WHERE games >= 10  -- Min 10 games
+                ORDER BY games DESC
+            """)
+            rows = cur.fetchall()
 
-        # Fallback to match_champions table
-        cur.execute("""
-            SELECT
-                mc.champion_id,
-                COUNT(*) as games,
-                SUM(CASE WHEN m.blue_win AND mc.team = 'blue' THEN 1
-                         WHEN NOT m.blue_win AND mc.team = 'red' THEN 1
-                         ELSE 0 END) as wins,
-                COUNT(*) - SUM(CASE WHEN m.blue_win AND mc.team = 'blue' THEN 1
-                                     WHEN NOT m.blue_win AND mc.team = 'red' THEN 1
-                                     ELSE 0 END) as losses
-            FROM match_champions mc
-            JOIN matches m ON mc.match_id = m.match_id
-            GROUP BY mc.champion_id
-            HAVING COUNT(*) >= 10  -- Min 10 games
-            ORDER BY COUNT(*) DESC
-        """)
+        if not rows:
+            # Fallback to match_champions table (aggregate missing or not backfilled)
+            source = 'match_champions fallback'
+            cur.execute("""
+                SELECT
+                    mc.champion_id,
+                    COUNT(*) as games,
+                    SUM(CASE WHEN m.blue_win AND mc.team = 'blue' THEN 1
+                             WHEN NOT m.blue_win AND mc.team = 'red' THEN 1
+                             ELSE 0 END) as wins,
+                    COUNT(*) - SUM(CASE WHEN m.blue_win AND mc.team = 'blue' THEN 1
+                                         WHEN NOT m.blue_win AND mc.team = 'red' THEN 1
+                                         ELSE 0 END) as losses
+                FROM match_champions mc
+                JOIN matches m ON mc.match_id = m.match_id
+                GROUP BY mc.champion_id
+                HAVING COUNT(*) >= 10  -- Min 10 games
+                ORDER BY COUNT(*) DESC
+            """)
 
-        rows = cur.fetchall()
+            rows = cur.fetchall()
 
         # Format as dict
         stats = {}
@@ -163,23 +454,14 @@ def get_champion_stats() -> Dict[str, Dict]:
                 'roles': {}  # TODO: Implement role detection
             }
 
-        logger.info(f"✓ Loaded champion stats for {len(stats)} champions from DB (match_champions fallback)")
+        logger.info(f"✓ Loaded champion stats for {len(stats)} champions from DB ({source})")
         return stats
 
 
 def get_champion_winrate(champion_id: int) -> float:
     """Get win rate for a specific champion"""
     with get_db_cursor() as cur:
-        cur.execute("""
-            SELECT
-                COUNT(*) as games,
-                SUM(CASE WHEN m.blue_win AND mc.team = 'blue' THEN 1
-                         WHEN NOT m.blue_win AND mc.team = 'red' THEN 1
-                         ELSE 0 END) as wins
-            FROM match_champions mc
-            JOIN matches m ON mc.match_id = m.match_id
-            WHERE mc.champion_id = %s
-        """, (champion_id,))
+        execute_hot(cur, 'hot_champion_winrate', (champion_id,))
 
         row = cur.fetchone()
         if row and row['games'] > 0:
@@ -204,52 +486,184 @@ def get_item_builds() -> Dict[str, Dict]:
     return {}
 
 
-def get_best_teammates() -> Dict[str, List]:
+def get_champion_counters(overlap_seconds: float = 0) -> Dict:
     """
-    Get best teammate synergies from database
+    Full champion and teammate-pair counters with their crawled_at watermark
+
+    Everything is read from one snapshot (REPEATABLE READ), so the counters
+    match the watermark exactly. Seeds the delta refresher
+    (api/services/data_refresher.py).
+
+    Args:
+        overlap_seconds: Also list the matches crawled this long before the watermark
 
     Returns:
-        Dict mapping champion_id to list of synergistic champions:
         {
-            "157": [  # Yasuo
-                {"champion_id": 64, "synergy_score": 0.65, "games": 123},
-                ...
-            ]
+            "champions": {157: (games, wins), ...},
+            "pairs": {(64, 157): (games, wins), ...},  # teammates, lower id first
+            "watermark": datetime or None,
+            "recent": {"EUW1_6543210987": datetime, ...},  # matches in the overlap window
+            "static_stats": False  # True if a champion_stats table is in use
         }
     """
     with get_db_cursor() as cur:
-        # Query champion pairs on same team with high win rate
-        cur.execute("""
-            WITH team_pairs AS (
+        if not EMBEDDED:  # the export is read-only: every read is consistent
+            cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+
+        static_stats = False
+        if _table_exists(cur, 'champion_stats'):
+            cur.execute("SELECT EXISTS (SELECT 1 FROM champion_stats) as populated")
+            static_stats = cur.fetchone()['populated']
+
+        cur.execute("SELECT MAX(crawled_at) as watermark FROM matches")
+        watermark = _timestamp(cur.fetchone()['watermark'])
+
+        rows = []
+        if _table_exists(cur, 'champion_agg'):
+            cur.execute("SELECT champion_id, games, wins FROM champion_agg WHERE games > 0")
+            rows = cur.fetchall()
+        if not rows:
+            cur.execute("""
                 SELECT
-                    mc1.champion_id as champ1,
-                    mc2.champion_id as champ2,
-                    mc1.team,
-                    m.blue_win,
-                    COUNT(*) as games
+                    mc.champion_id,
+                    COUNT(*) as games,
+                    COUNT(*) FILTER (WHERE m.blue_win = (mc.team = 'blue')) as wins
+                FROM match_champions mc
+                JOIN matches m ON mc.match_id = m.match_id
+                GROUP BY mc.champion_id
+            """)
+            rows = cur.fetchall()
+        champions = {row['champion_id']: (row['games'], row['wins']) for row in rows}
+
+        rows = []
+        if _table_exists(cur, 'champion_pair_agg'):
+            cur.execute("""
+                SELECT champion_lo, champion_hi, games, wins
+                FROM champion_pair_agg
+                WHERE same_team AND games > 0
+            """)
+            rows = cur.fetchall()
+        if not rows:
+            cur.execute("""
+                SELECT
+                    mc1.champion_id as champion_lo,
+                    mc2.champion_id as champion_hi,
+                    COUNT(*) as games,
+                    COUNT(*) FILTER (WHERE m.blue_win = (mc1.team = 'blue')) as wins
                 FROM match_champions mc1
                 JOIN match_champions mc2
                     ON mc1.match_id = mc2.match_id
                     AND mc1.team = mc2.team
                     AND mc1.champion_id < mc2.champion_id
                 JOIN matches m ON mc1.match_id = m.match_id
-                GROUP BY mc1.champion_id, mc2.champion_id, mc1.team, m.blue_win
-                HAVING COUNT(*) >= 5  -- Min 5 games together
-            )
+                GROUP BY 1, 2
+            """)
+            rows = cur.fetchall()
+        pairs = {(row['champion_lo'], row['champion_hi']): (row['games'], row['wins']) for row in rows}
+
+        recent = {}
+        if watermark is not None:
+            cur.execute("""
+                SELECT match_id, crawled_at
+                FROM matches
+                WHERE crawled_at > %s
+            """, (watermark - timedelta(seconds=overlap_seconds),))
+            recent = {row['match_id']: row['crawled_at'] for row in cur.fetchall()}
+
+    return {
+        'champions': champions,
+        'pairs': pairs,
+        'watermark': watermark,
+        'recent': recent,
+        'static_stats': static_stats
+    }
+
+
+def get_match_champions_since(since) -> List[Dict]:
+    """
+    Champion picks of the matches crawled after `since` (None = all), oldest first
+
+    One row per pick: match_id, blue_win, crawled_at, team, champion_id.
+    Matches whose picks are not inserted yet are not returned.
+    """
+    with get_db_cursor() as cur:
+        cur.execute("""
+            SELECT m.match_id, m.blue_win, m.crawled_at, mc.team, mc.champion_id
+            FROM matches m
+            JOIN match_champions mc ON mc.match_id = m.match_id
+            WHERE %s IS NULL OR m.crawled_at > %s
+            ORDER BY m.crawled_at, m.match_id
+        """, (since, since))
+        return [dict(row) for row in cur.fetchall()]
+
+
+# Full self-join of match_champions (databases without champion_pair_agg)
+_TEAM_PAIRS_FROM_MATCHES = """
+        WITH team_pairs AS (
             SELECT
-                champ1,
-                champ2,
-                SUM(games) as total_games,
-                SUM(CASE WHEN (blue_win AND team = 'blue') OR (NOT blue_win AND team = 'red')
-                    THEN games ELSE 0 END)::FLOAT / SUM(games) as win_rate
-            FROM team_pairs
-            GROUP BY champ1, champ2
-            HAVING SUM(games) >= 10
-            ORDER BY win_rate DESC
-            LIMIT 1000  -- Top 1000 synergies
-        """)
+                mc1.champion_id as champ1,
+                mc2.champion_id as champ2,
+                mc1.team,
+                m.blue_win,
+                COUNT(*) as games
+            FROM match_champions mc1
+            JOIN match_champions mc2
+                ON mc1.match_id = mc2.match_id
+                AND mc1.team = mc2.team
+                AND mc1.champion_id < mc2.champion_id
+            JOIN matches m ON mc1.match_id = m.match_id
+            GROUP BY mc1.champion_id, mc2.champion_id, mc1.team, m.blue_win
+            HAVING COUNT(*) >= 5  -- Min 5 games together
+        )
+        SELECT
+            champ1,
+            champ2,
+            SUM(games) as total_games,
+            CAST(SUM(CASE WHEN (blue_win AND team = 'blue') OR (NOT blue_win AND team = 'red')
+                THEN games ELSE 0 END) AS FLOAT) / SUM(games) as win_rate
+        FROM team_pairs
+        GROUP BY champ1, champ2
+        HAVING SUM(games) >= 10
+        ORDER BY win_rate DESC
+        LIMIT 1000  -- Top 1000 synergies
+"""
+
+
+def get_best_teammates() -> Dict[str, List]:
+    """
+    Get best teammate synergies from database
+
+    Returns:
+        Dict mapping champion_id to list of synergistic champions:
+        {
+            "157": [  # Yasuo
+                {"champion_id": 64, "synergy_score": 0.65, "games": 123},
+                ...
+            ]
+        }
+    """
+    with get_db_cursor() as cur:
+        if _table_exists(cur, 'champion_pair_agg'):
+            # Incrementally maintained aggregate (see db_schema.sql)
+            cur.execute("""
+                SELECT
+                    champion_lo as champ1,
+                    champion_hi as champ2,
+                    games as total_games,
+                    CAST(wins AS FLOAT) / games as win_rate
+                FROM champion_pair_agg
+                WHERE same_team AND games >= 10
+                ORDER BY win_rate DESC
+                LIMIT 1000  -- Top 1000 synergies
+            """)
+            rows = cur.fetchall()
+        else:
+            rows = []
 
-        rows = cur.fetchall()
+        if not rows:
+            # Query champion pairs on same team with high win rate
+            cur.execute(_TEAM_PAIRS_FROM_MATCHES)
+            rows = cur.fetchall()
 
         # Build synergy dict
         synergies = {}
@@ -277,6 +691,7 @@ def get_best_teammates() -> Dict[str, List]:
         return synergies
 
 
+
 # ============================================================================
 # MODEL PERFORMANCE QUERIES
 # ============================================================================
@@ -296,11 +711,11 @@ def get_model_performance(model_name: str) -> Optional[Dict]:
     """
     with get_db_cursor() as cur:
         # Get total match count from database
-        cur.execute("SELECT COUNT(*) as count FROM matches")
+        execute_hot(cur, 'hot_match_count')
         match_count = cur.fetchone()['count']
 
         # Get total snapshot count
-        cur.execute("SELECT COUNT(*) as count FROM match_snapshots")
+        execute_hot(cur, 'hot_snapshot_count')
         snapshot_count = cur.fetchone()['count']
 
         # Return database-derived metrics
@@ -309,46 +724,151 @@ def get_model_performance(model_name: str) -> Optional[Dict]:
             'matches_count': match_count,
             'snapshot_count': snapshot_count,
             'timestamp': '2025-12-30',  # TODO: Get from model metadata
-            'data_source': 'PostgreSQL (Supabase)'
+            'data_source': 'SQLite (embedded export)' if EMBEDDED else 'PostgreSQL (Supabase)'
         }
 
 
 def get_database_stats() -> Dict:
     """
-    Get comprehensive database statistics
+    Get comprehensive database statistics (exact counts)
+
+    The row counts scan their tables: serve them through
+    api/services/db_stats.py instead of once per request.
 
     Returns:
         Dict with matches, champions, snapshots, and size info
     """
     with get_db_cursor() as cur:
         # Get match count
-        cur.execute("SELECT COUNT(*) as count FROM matches")
+        execute_hot(cur, 'hot_match_count')
         match_count = cur.fetchone()['count']
 
         # Get unique champion count
-        cur.execute("SELECT COUNT(DISTINCT champion_id) as count FROM match_champions")
-        champion_count = cur.fetchone()['count']
+        champion_count = _champion_count(cur)
 
         # Get snapshot count
-        cur.execute("SELECT COUNT(*) as count FROM match_snapshots")
+        execute_hot(cur, 'hot_snapshot_count')
         snapshot_count = cur.fetchone()['count']
 
         # Get database size (PostgreSQL specific query)
         try:
-            cur.execute("SELECT pg_database_size(current_database()) as size")
-            db_size_bytes = cur.fetchone()['size']
-            db_size_mb = round(db_size_bytes / (1024 * 1024), 2)
+            db_size_bytes = _database_size(cur)
         except Exception as e:
             logger.warning(f"Could not get database size: {e}")
-            db_size_mb = 0
+            db_size_bytes = 0
 
-        return {
-            'matches': match_count,
-            'champions': champion_count,
-            'snapshots': snapshot_count,
-            'size': f"{db_size_mb} MB",
-            'connection': 'healthy'
-        }
+        return _format_database_stats(match_count, champion_count, snapshot_count, db_size_bytes)
+
+
+def get_database_stats_estimate() -> Dict:
+    """
+    Database statistics from planner estimates (cost independent of table sizes)
+
+    Row counts are pg_class.reltuples (kept current by autovacuum/ANALYZE).
+    Tables never analyzed yet (reltuples < 0) are new and small, so they
+    are counted exactly. Bounded by DB_STATS_TIMEOUT_MS.
+
+    Returns:
+        Same format as get_database_stats()
+    """
+    if EMBEDDED:
+        return get_database_stats()  # local file: exact counts are cheap
+
+    with get_db_cursor() as cur:
+        cur.execute("SET LOCAL statement_timeout = %s", (int(settings.DB_STATS_TIMEOUT_MS),))
+        cur.execute("""
+            SELECT relname, reltuples
+            FROM pg_class
+            WHERE relkind = 'r'
+              AND relnamespace = 'public'::regnamespace
+              AND relname IN ('matches', 'match_champions', 'match_snapshots')
+        """)
+        estimates = {row['relname']: row['reltuples'] for row in cur.fetchall()}
+
+        counts = {}
+        for table, exact_query in (('matches', 'hot_match_count'), ('match_snapshots', 'hot_snapshot_count')):
+            if estimates.get(table, -1) >= 0:
+                counts[table] = int(estimates[table])
+            else:
+                execute_hot(cur, exact_query)
+                counts[table] = cur.fetchone()['count']
+
+        champion_count = _champion_count(cur, estimates.get('match_champions', -1))
+
+        db_size_bytes = _database_size(cur)
+
+    return _format_database_stats(counts['matches'], champion_count, counts['match_snapshots'], db_size_bytes)
+
+
+def _database_size(cur) -> int:
+    """Database size in bytes (the export file's size when embedded)"""
+    if EMBEDDED:
+        return get_embedded_db().size_bytes()
+    execute_hot(cur, 'hot_database_size')
+    return cur.fetchone()['size']
+
+
+def _champion_count(cur, picks_estimate: Optional[float] = None) -> int:
+    """
+    Distinct champions in match_champions
+
+    Read from the champion_agg table when it is populated (maintained, one
+    row per champion). Otherwise exact - or, with picks_estimate given, from
+    the column's n_distinct planner statistic when there is one.
+    """
+    if _table_exists(cur, 'champion_agg'):
+        cur.execute("SELECT COUNT(*) as count FROM champion_agg WHERE games > 0")
+        count = cur.fetchone()['count']
+        if count:
+            return count
+
+    if picks_estimate is not None and picks_estimate >= 0:
+        cur.execute("""
+            SELECT n_distinct FROM pg_stats
+            WHERE schemaname = 'public' AND tablename = 'match_champions' AND attname = 'champion_id'
+        """)
+        row = cur.fetchone()
+        if row and row['n_distinct'] is not None:
+            # Negative n_distinct is a fraction of the row count
+            n_distinct = row['n_distinct']
+            return int(round(n_distinct if n_distinct >= 0 else -n_distinct * picks_estimate))
+
+    execute_hot(cur, 'hot_champion_count')
+    return cur.fetchone()['count']
+
+
+async def get_database_stats_async() -> Dict:
+    """
+    get_database_stats() for async callers
+
+    Uses the async driver when enabled, else the pooled sync path on the
+    io executor.
+    """
+    if not async_driver_enabled():
+        return await run_io(get_database_stats)
+
+    counts = [
+        (await fetch_hot_async(name))[0]['count']
+        for name in ('hot_match_count', 'hot_champion_count', 'hot_snapshot_count')
+    ]
+    try:
+        db_size_bytes = (await fetch_hot_async('hot_database_size'))[0]['size']
+    except Exception as e:
+        logger.warning(f"Could not get database size: {e}")
+        db_size_bytes = 0
+
+    return _format_database_stats(*counts, db_size_bytes)
+
+
+def _format_database_stats(match_count: int, champion_count: int, snapshot_count: int,
+                           db_size_bytes: int) -> Dict:
+    return {
+        'matches': match_count,
+        'champions': champion_count,
+        'snapshots': snapshot_count,
+        'size': f"{round(db_size_bytes / (1024 * 1024), 2)} MB",
+        'connection': 'healthy'
+    }
 
 
 # ============================================================================
@@ -356,28 +876,16 @@ def get_database_stats() -> Dict:
 # ============================================================================
 
 def check_db_health() -> Dict:
-    """Check database connection and get stats"""
+    """Check database connection and get stats (planner estimates - no table scans)"""
     try:
-        with get_db_cursor() as cur:
-            # Get match count
-            cur.execute("SELECT COUNT(*) as count FROM matches")
-            match_count = cur.fetchone()['count']
-
-            # Get champion count
-            cur.execute("SELECT COUNT(DISTINCT champion_id) as count FROM match_champions")
-            champion_count = cur.fetchone()['count']
-
-            # Get snapshot count
-            cur.execute("SELECT COUNT(*) as count FROM match_snapshots")
-            snapshot_count = cur.fetchone()['count']
-
-            return {
-                'status': 'healthy',
-                'matches': match_count,
-                'champions': champion_count,
-                'snapshots': snapshot_count,
-                'connection': 'active'
-            }
+        stats = get_database_stats_estimate()
+        return {
+            'status': 'healthy',
+            'matches': stats['matches'],
+            'champions': stats['champions'],
+            'snapshots': stats['snapshots'],
+            'connection': 'active'
+        }
     except Exception as e:
         logger.error(f"❌ Database health check failed: {e}")
         return {
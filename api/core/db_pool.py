@@ -0,0 +1,293 @@
+"""
+PostgreSQL connection pool
+One shared, instrumented pool instead of a new (TLS) connection per query
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import RealDictCursor
+
+from api.core.logging import logger
+from api.core.metrics import Histogram
+
+POOL_WAIT_MS_BUCKETS = [0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000]
+
+
+class PoolTimeout(RuntimeError):
+    """No connection became available within the pool timeout"""
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection with pool bookkeeping"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.prepared: set = set()  # names PREPAREd on this session
+
+    def execute_prepared(self, cur, name: str, statement: str, params: tuple = ()):
+        """
+        EXECUTE a named statement, PREPAREing it on first use in this session
+
+        Args:
+            cur: Cursor of this connection
+            name: Statement name
+            statement: SQL with $1..$n placeholders
+            params: Parameter values
+        """
+        if name not in self.prepared:
+            cur.execute(f"PREPARE {name} AS {statement}")
+            self.prepared.add(name)
+        if params:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cur.execute(f"EXECUTE {name}")
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections
+
+    - At most max_size connections exist; callers beyond that wait (up to
+      timeout seconds) for one to be returned.
+    - min_size connections are opened eagerly on first use and never
+      recycled for idleness.
+    - Idle connections are reused newest first. Connections idle longer
+      than max_idle or older than max_lifetime are closed instead of
+      reused; ones idle longer than health_check_after are pinged first.
+    - Connections returned after an error are rolled back and lose their
+      prepared statements; broken ones are discarded.
+
+    The pool belongs to the process that created it: after a fork the
+    child starts with an empty pool (connections must not cross fork()).
+    """
+
+    def __init__(self,
+                 dsn: str,
+                 min_size: int = 1,
+                 max_size: int = 10,
+                 timeout: float = 10.0,
+                 max_idle: float = 300.0,
+                 max_lifetime: float = 1800.0,
+                 health_check_after: float = 30.0,
+                 connect: Optional[Callable] = None):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self._connect = connect or self._default_connect
+
+        self._idle: List[PooledConnection] = []
+        self._size = 0  # open connections (idle + checked out)
+        self._cond = threading.Condition()
+        self._pid = os.getpid()
+        self._closed = False
+        self._filled = False  # min_size connections opened
+        self._inherited: List[PooledConnection] = []  # idle connections of the pre-fork parent
+
+        self.wait_ms = Histogram(POOL_WAIT_MS_BUCKETS)
+        self.checkouts = 0
+        self.created = 0
+        self.recycled = 0
+        self.discarded = 0
+        self.failed_health_checks = 0
+        self.timeouts = 0
+
+    def _default_connect(self) -> PooledConnection:
+        return psycopg2.connect(self.dsn, connection_factory=PooledConnection, cursor_factory=RealDictCursor)
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the duration of the block
+
+        Usage:
+            with pool.connection() as conn:
+                with conn.cursor() as cur: ...
+                conn.commit()
+        """
+        conn = self.acquire()
+        failed = False
+        try:
+            yield conn
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(conn, failed=failed)
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection (blocks up to `timeout` seconds)"""
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            with self._cond:
+                self._check_fork()
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(f"No database connection available within {self.timeout}s "
+                                          f"(pool max_size={self.max_size})")
+                    self._cond.wait(remaining)
+                    self._check_fork()
+                conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    self._size += 1  # reserve the slot, connect outside the lock
+                fill = not self._filled
+                self._filled = True
+
+            if conn is None:
+                conn = self._open()
+            elif not self._usable(conn):
+                self._close(conn)
+                continue
+
+            with self._cond:
+                self.checkouts += 1
+            self.wait_ms.observe((time.perf_counter() - started) * 1000)
+            if fill:
+                self._fill_min()
+            return conn
+
+    def release(self, conn: PooledConnection, failed: bool = False):
+        """Return a connection to the pool"""
+        if conn.closed:
+            self._close(conn)
+            return
+
+        if failed or conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+                if failed and conn.prepared:
+                    # Statements PREPAREd in the failed transaction may or may not exist
+                    conn.autocommit = True
+                    with conn.cursor() as cur:
+                        cur.execute("DEALLOCATE ALL")
+                    conn.autocommit = False
+                    conn.prepared.clear()
+            except psycopg2.Error:
+                self._close(conn)
+                return
+
+        conn.last_used = time.monotonic()
+        with self._cond:
+            if not self._closed and os.getpid() == self._pid:
+                self._idle.append(conn)
+                self._cond.notify()
+                return
+        self._close(conn)
+
+    def _open(self) -> PooledConnection:
+        """Connect for a slot already counted in _size"""
+        try:
+            conn = self._connect()
+        except Exception:
+            self._forget()
+            raise
+        with self._cond:
+            self.created += 1
+        return conn
+
+    def _usable(self, conn: PooledConnection) -> bool:
+        """Recycle expired connections, ping ones idle for a while"""
+        now = time.monotonic()
+        if conn.closed:
+            return False
+        if now - conn.created_at > self.max_lifetime:
+            self.recycled += 1
+            return False
+        idle = now - conn.last_used
+        if idle > self.max_idle and self._size > self.min_size:
+            self.recycled += 1
+            return False
+        if idle > self.health_check_after:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error as e:
+                self.failed_health_checks += 1
+                logger.warning(f"⚠️  Dropping dead pooled connection: {e}")
+                return False
+        return True
+
+    def _fill_min(self):
+        """Open up to min_size connections (first checkout in this process)"""
+        for _ in range(self.min_size - 1):
+            with self._cond:
+                if self._size >= self.max_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception as e:
+                logger.warning(f"⚠️  Could not pre-open pooled connection: {e}")
+                return
+            self.release(conn)
+
+    def _close(self, conn: PooledConnection):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self.discarded += 1
+        self._forget()
+
+    def _forget(self):
+        """Free a connection slot"""
+        with self._cond:
+            self._size = max(self._size - 1, 0)
+            self._cond.notify()
+
+    def _check_fork(self):
+        """Called with the lock held: start empty in a forked child"""
+        if os.getpid() != self._pid:
+            # The parent owns these sockets: keep the objects referenced so
+            # they are never closed (closing would end the parent's session)
+            self._inherited.extend(self._idle)
+            self._idle = []
+            self._size = 0
+            self._filled = False
+            self._pid = os.getpid()
+
+    def close(self):
+        """Close idle connections; checked-out ones are closed when released"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._closed = True
+        for conn in idle:
+            self._close(conn)
+
+    def get_stats(self) -> Dict:
+        """Pool metrics for health/monitoring endpoints"""
+        with self._cond:
+            size, idle = self._size, len(self._idle)
+        return {
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'size': size,
+            'idle': idle,
+            'in_use': size - idle,
+            'checkouts': self.checkouts,
+            'created': self.created,
+            'recycled': self.recycled,
+            'discarded': self.discarded,
+            'failed_health_checks': self.failed_health_checks,
+            'timeouts': self.timeouts,
+            'wait_ms': self.wait_ms.snapshot()
+        }
@@ -0,0 +1,323 @@
+"""
+Embedded Database
+Read-only SQLite export of the serving data, as a zero-network read backend
+
+The exporter snapshots matches, match_champions, match_snapshots and the
+aggregate tables (champion_agg, champion_pair_agg, champion_stats - each
+if present) from PostgreSQL into one SQLite file that ships with the
+deployment. With DB_BACKEND=sqlite, the query functions of
+api/core/database.py run against that file instead of Supabase: no
+connection setup, no network round-trips, and a fully offline setup for
+development.
+
+The file is opened read-only (one connection per thread), so any number
+of workers can share it. Refresh it by exporting again - the new file is
+written beside the old one and renamed over it.
+
+Usage:
+    python -m api.core.embedded_db export [--output PATH]
+    python -m api.core.embedded_db info [PATH]
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from api.core.logging import logger
+
+# Bump when the table layout changes (older files are rejected)
+FORMAT_VERSION = 1
+EXPORT_BATCH_ROWS = 10000
+
+# Table -> SQLite DDL (types mirror db_schema.sql; BOOLEAN / TIMESTAMP columns are converted back on read)
+TABLES = {
+    'matches': """
+        CREATE TABLE matches (
+            match_id TEXT PRIMARY KEY,
+            game_duration REAL NOT NULL,
+            blue_win BOOLEAN NOT NULL,
+            patch_version TEXT,
+            queue_id INTEGER,
+            crawled_at TIMESTAMP,
+            created_at TIMESTAMP
+        )
+    """,
+    'match_champions': """
+        CREATE TABLE match_champions (
+            id INTEGER PRIMARY KEY,
+            match_id TEXT NOT NULL,
+            team TEXT NOT NULL,
+            champion_id INTEGER NOT NULL,
+            position INTEGER NOT NULL
+        )
+    """,
+    'match_snapshots': """
+        CREATE TABLE match_snapshots (
+            id INTEGER PRIMARY KEY,
+            match_id TEXT NOT NULL,
+            snapshot_time INTEGER NOT NULL,
+            blue_gold INTEGER NOT NULL, red_gold INTEGER NOT NULL, gold_diff INTEGER NOT NULL,
+            blue_xp INTEGER NOT NULL, red_xp INTEGER NOT NULL, xp_diff INTEGER NOT NULL,
+            blue_level INTEGER NOT NULL, red_level INTEGER NOT NULL,
+            blue_cs INTEGER NOT NULL, red_cs INTEGER NOT NULL,
+            blue_dragons INTEGER, red_dragons INTEGER,
+            blue_barons INTEGER, red_barons INTEGER,
+            blue_towers INTEGER, red_towers INTEGER,
+            blue_kills INTEGER, red_kills INTEGER, kill_diff INTEGER NOT NULL
+        )
+    """,
+    'champion_agg': """
+        CREATE TABLE champion_agg (
+            champion_id INTEGER PRIMARY KEY,
+            games INTEGER NOT NULL,
+            wins INTEGER NOT NULL
+        )
+    """,
+    'champion_pair_agg': """
+        CREATE TABLE champion_pair_agg (
+            champion_lo INTEGER NOT NULL,
+            champion_hi INTEGER NOT NULL,
+            same_team BOOLEAN NOT NULL,
+            games INTEGER NOT NULL,
+            wins INTEGER NOT NULL,
+            PRIMARY KEY (champion_lo, champion_hi, same_team)
+        )
+    """,
+    'champion_stats': """
+        CREATE TABLE champion_stats (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL,
+            games INTEGER NOT NULL,
+            wins INTEGER NOT NULL,
+            losses INTEGER NOT NULL,
+            win_rate REAL NOT NULL,
+            picks INTEGER NOT NULL,
+            bans INTEGER NOT NULL,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+    """,
+}
+# Copied even when empty; the others only if they exist in PostgreSQL
+REQUIRED_TABLES = ('matches', 'match_champions', 'match_snapshots')
+
+# Indexes the read queries rely on (created after the bulk load)
+INDEXES = (
+    "CREATE INDEX idx_matches_crawled_at ON matches(crawled_at)",
+    "CREATE INDEX idx_champions_match_id ON match_champions(match_id)",
+    "CREATE INDEX idx_champions_champion_id ON match_champions(champion_id)",
+    "CREATE INDEX idx_snapshots_match_id ON match_snapshots(match_id)",
+    "CREATE INDEX idx_champion_agg_games ON champion_agg(games DESC)",
+    "CREATE INDEX idx_champion_pair_agg_games ON champion_pair_agg(same_team, games DESC)",
+)
+
+# Timestamps are stored as ISO 8601 text (sorts chronologically); booleans as 0/1
+sqlite3.register_adapter(datetime, lambda value: value.isoformat())
+sqlite3.register_converter('TIMESTAMP', lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter('BOOLEAN', lambda value: value not in (b'0', b''))
+
+
+class EmbeddedCursor:
+    """
+    psycopg2-style cursor over a SQLite connection
+
+    Accepts %s placeholders and returns rows as dicts, like the
+    RealDictCursor used on the PostgreSQL path, so query functions can
+    run unchanged on portable SQL.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.connection = conn
+        self._cursor = conn.cursor()
+
+    def execute(self, query: str, params=None):
+        self._cursor.execute(query.replace('%s', '?'), tuple(params or ()))
+        return self
+
+    def fetchone(self) -> Optional[Dict]:
+        row = self._cursor.fetchone()
+        return dict(row) if row is not None else None
+
+    def fetchall(self) -> List[Dict]:
+        return [dict(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class EmbeddedDatabase:
+    """Read-only SQLite export (one connection per thread)"""
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise RuntimeError(
+                f"Embedded database not found at {path} - export one with "
+                f"`python -m api.core.embedded_db export`"
+            )
+        self.path = path
+        self._local = threading.local()
+        self.meta = self._read_meta()
+        if int(self.meta.get('format_version', 0)) != FORMAT_VERSION:
+            raise RuntimeError(f"Embedded database {path} has format {self.meta.get('format_version')}, "
+                               f"expected {FORMAT_VERSION} - export it again")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(
+                f"file:{os.path.abspath(self.path)}?mode=ro",
+                uri=True,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @contextmanager
+    def cursor(self):
+        """Cursor for the duration of the block (its transaction is closed on exit)"""
+        conn = self._connection()
+        cur = EmbeddedCursor(conn)
+        try:
+            yield cur
+        finally:
+            cur.close()
+            conn.rollback()
+
+    def _read_meta(self) -> Dict[str, str]:
+        conn = self._connection()
+        try:
+            return {row['key']: row['value'] for row in conn.execute("SELECT key, value FROM export_meta")}
+        except sqlite3.DatabaseError as e:
+            raise RuntimeError(f"Not an embedded database export: {self.path} ({e})")
+
+    def size_bytes(self) -> int:
+        return os.path.getsize(self.path)
+
+
+# ============================================================================
+# EXPORT (PostgreSQL -> SQLite)
+# ============================================================================
+
+def export(output: str) -> Dict[str, int]:
+    """
+    Copy the serving tables from PostgreSQL into a new SQLite file
+
+    All tables are read in one REPEATABLE READ snapshot, so they are
+    consistent with each other and with the recorded watermark.
+
+    Returns:
+        Row count per exported table
+    """
+    from api.core.database import get_pool
+
+    started = time.perf_counter()
+    tmp_path = f"{output}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    counts = {}
+    target = sqlite3.connect(tmp_path)
+    try:
+        target.execute("PRAGMA journal_mode=OFF")
+        target.execute("PRAGMA synchronous=OFF")
+        target.execute("CREATE TABLE export_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+        with get_pool().connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+                cur.execute("SELECT COUNT(*) as count, MAX(crawled_at) as max_crawled_at FROM matches")
+                watermark = cur.fetchone()
+                for table in TABLES:
+                    if table not in REQUIRED_TABLES:
+                        cur.execute("SELECT to_regclass(%s) IS NOT NULL as exists", (table,))
+                        if not cur.fetchone()['exists']:
+                            logger.info(f"  {table}: not in the database, skipped")
+                            continue
+                    target.execute(TABLES[table])
+                    counts[table] = _copy_table(conn, table, target)
+                    logger.info(f"  {table}: {counts[table]} rows")
+            conn.rollback()
+
+        for statement in INDEXES:
+            table = statement.split(' ON ')[1].split('(')[0]
+            if table in counts:
+                target.execute(statement)
+        target.execute("ANALYZE")
+
+        meta = {
+            'format_version': str(FORMAT_VERSION),
+            'exported_at': datetime.now().isoformat(),
+            'watermark_matches': str(int(watermark['count'])),
+            'watermark_max_crawled_at': (watermark['max_crawled_at'].isoformat()
+                                         if watermark['max_crawled_at'] else ''),
+        }
+        target.executemany("INSERT INTO export_meta (key, value) VALUES (?, ?)", meta.items())
+        target.commit()
+        target.execute("VACUUM")
+    except Exception:
+        target.close()
+        os.remove(tmp_path)
+        raise
+    target.close()
+
+    os.replace(tmp_path, output)
+    logger.info(f"✓ Embedded database written to {output} "
+                f"({os.path.getsize(output) / 1e6:.1f} MB, {time.perf_counter() - started:.1f}s)")
+    return counts
+
+
+def _copy_table(conn, table: str, target: sqlite3.Connection) -> int:
+    """Stream one table through a server-side cursor"""
+    columns = [row[1] for row in target.execute(f"PRAGMA table_info({table})")]
+    insert = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    copied = 0
+    with conn.cursor(name=f"export_{table}") as cur:
+        cur.itersize = EXPORT_BATCH_ROWS
+        cur.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        while True:
+            rows = cur.fetchmany(EXPORT_BATCH_ROWS)
+            if not rows:
+                break
+            target.executemany(insert, ([row[column] for column in columns] for row in rows))
+            copied += len(rows)
+    return copied
+
+
+def info(path: str):
+    """Print an export's metadata and table sizes"""
+    db = EmbeddedDatabase(path)
+    print(f"{path}: format {db.meta['format_version']}, {db.size_bytes() / 1e6:.1f} MB")
+    print(f"  exported:  {db.meta['exported_at']}")
+    print(f"  watermark: {db.meta['watermark_matches']} matches, "
+          f"latest crawled {db.meta['watermark_max_crawled_at'] or '-'}")
+    with db.cursor() as cur:
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name <> 'export_meta' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+        for table in [row['name'] for row in cur.fetchall()]:
+            cur.execute(f"SELECT COUNT(*) as count FROM {table}")
+            print(f"  {table}: {cur.fetchone()['count']} rows")
+
+
+if __name__ == "__main__":
+    import argparse
+    from api.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Export or inspect the embedded (SQLite) read database")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export_parser = subparsers.add_parser('export', help="Copy the serving tables from PostgreSQL")
+    export_parser.add_argument('--output', default=settings.EMBEDDED_DB_PATH)
+    info_parser = subparsers.add_parser('info', help="Show an export's metadata and row counts")
+    info_parser.add_argument('path', nargs='?', default=settings.EMBEDDED_DB_PATH)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        export(args.output)
+    else:
+        info(args.path)
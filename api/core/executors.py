@@ -0,0 +1,138 @@
+"""
+Bounded executors for blocking work
+Keeps CPU-bound inference and blocking I/O (psycopg2, requests) off the event loop
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from api.core.config import settings
+from api.core.logging import logger
+
+
+class ExecutorSaturated(HTTPException):
+    """Raised when a workload pool's queue is full (maps to 503)"""
+
+    def __init__(self, pool_name: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Server busy ({pool_name} queue full). Please retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a hard limit on queued work
+
+    At most max_workers jobs run at once and at most max_queue more wait.
+    Anything beyond that is rejected immediately with ExecutorSaturated
+    instead of piling up behind a slow query or timeout.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._active = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) on the pool and await its result
+
+        The slot is held until the pool job itself finishes (or is cancelled
+        before it starts), not until the caller stops waiting: a cancelled
+        await does not stop a job that is already running.
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(self.name)
+            self._in_flight += 1
+
+        try:
+            future = self._pool.submit(self._call, fn, args, kwargs)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Optional[Future]):
+        """Free the job's slot once the pool is done with it"""
+        with self._lock:
+            self._in_flight -= 1
+            if future is not None and not future.cancelled():
+                self.completed += 1
+
+    def _call(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        """Worker-side wrapper that tracks active jobs"""
+        with self._lock:
+            self._active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def get_stats(self) -> Dict:
+        """Pool utilization and queue depth"""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'active': self._active,
+                'queued': max(self._in_flight - self._active, 0),
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# One pool per workload class
+cpu_executor = BoundedExecutor(
+    "cpu",
+    max_workers=settings.CPU_EXECUTOR_WORKERS,
+    max_queue=settings.CPU_EXECUTOR_MAX_QUEUE
+)
+io_executor = BoundedExecutor(
+    "io",
+    max_workers=settings.IO_EXECUTOR_WORKERS,
+    max_queue=settings.IO_EXECUTOR_MAX_QUEUE
+)
+
+
+async def run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    """Run CPU-bound work (model inference, build heuristics) on the cpu pool"""
+    return await cpu_executor.run(fn, *args, **kwargs)
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    """Run blocking I/O (database queries, live client HTTP calls) on the io pool"""
+    return await io_executor.run(fn, *args, **kwargs)
+
+
+def get_executor_stats() -> Dict:
+    """Queue depth and utilization for every workload pool"""
+    return {
+        'cpu': cpu_executor.get_stats(),
+        'io': io_executor.get_stats()
+    }
+
+
+def shutdown_executors():
+    """Stop all pools (called on app shutdown)"""
+    for executor in (cpu_executor, io_executor):
+        executor.shutdown()
+    logger.info("✓ Executors shut down")
@@ -0,0 +1,73 @@
+"""
+Lightweight in-process metrics
+Histograms and counters exposed through the health endpoints
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Sequence
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus-style cumulative upper bounds)
+
+    Thread-safe; observe() is O(log buckets).
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot = +Inf
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one value"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            if value > self._max:
+                self._max = value
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile (upper bound of the bucket containing it)"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            maximum = self._max
+
+        if total == 0:
+            return 0.0
+
+        rank = q * total
+        running = 0
+        for index, count in enumerate(counts):
+            running += count
+            if running >= rank:
+                return self.buckets[index] if index < len(self.buckets) else maximum
+        return maximum
+
+    def snapshot(self) -> Dict:
+        """Get histogram state as a JSON-serializable dict"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            value_sum = self._sum
+            maximum = self._max
+
+        buckets = {f"le_{bound:g}": count for bound, count in zip(self.buckets, counts)}
+        buckets["le_inf"] = counts[-1]
+
+        return {
+            'count': total,
+            'mean': round(value_sum / total, 4) if total else 0.0,
+            'max': round(maximum, 4),
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': buckets
+        }
@@ -11,6 +11,7 @@ Architecture: Vercel Single Project
 - Database: Vercel Postgres
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,11 +20,19 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from api.core.config import settings
+from api.core.database import close_async_pool, close_pool, get_pool_stats
+from api.core.executors import get_executor_stats, shutdown_executors
 from api.core.logging import logger
+from api.services.data_refresher import data_refresher
+from api.services.db_stats import db_stats
+from api.services.live_sessions import live_sessions
+from api.services.live_stream import live_poller
 from api.services.ml_engine import ml_engine
+from api.services.model_reloader import model_reloader
+from api.services.response_cache import response_cache
 
 # Import all routers
-from api.routers import predictions, champions, items, live_game, stats
+from api.routers import predictions, champions, items, live_game, stats, draft, admin
 
 
 # ============================================================================
@@ -33,18 +42,36 @@ from api.routers import predictions, champions, items, live_game, stats
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Load ML models on startup, cleanup on shutdown"""
-    logger.info("🚀 Vercel Serverless: Loading ML models...")
-    try:
-        await ml_engine.load_all_models()
-        logger.info("✓ ML models loaded successfully")
-    except Exception as e:
-        logger.error(f"❌ Failed to load ML models: {e}")
-        # Continue anyway - app will work with limited functionality
+    if settings.MODEL_LOADING == "eager":
+        logger.info("🚀 Vercel Serverless: Loading ML models...")
+        try:
+            await ml_engine.load_all_models()
+            logger.info("✓ ML models loaded successfully")
+        except Exception as e:
+            logger.error(f"❌ Failed to load ML models: {e}")
+            # Continue anyway - app will work with limited functionality
+    else:
+        logger.info("🚀 Vercel Serverless: Lazy model loading (components load on first use)")
+
+    data_refresher.start()
+    model_reloader.start()
+    live_sessions.start()
 
     yield  # App is running
 
-    # Cleanup on shutdown (if needed)
+    # Cleanup on shutdown
     logger.info("👋 Shutting down...")
+    await data_refresher.stop()
+    await model_reloader.stop()
+    await live_poller.stop()
+    await live_sessions.stop()
+    if ml_engine.riot_live_client is not None:
+        await ml_engine.riot_live_client.aclose()
+        if ml_engine.riot_live_client.recorder is not None:
+            ml_engine.riot_live_client.recorder.close()
+    await close_async_pool()
+    close_pool()
+    shutdown_executors()
 
 
 # Create FastAPI app (Vercel will use this)
@@ -74,6 +101,15 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def warm_up_after_first_response(request, call_next):
+    """Lazy mode: start loading all remaining models once the first response is ready"""
+    response = await call_next(request)
+    if settings.MODEL_LOADING != "eager" and settings.MODEL_WARMUP and not ml_engine._warm_up_started:
+        asyncio.create_task(ml_engine.warm_up())
+    return response
+
+
 # ============================================================================
 # INCLUDE ROUTERS
 # ============================================================================
@@ -93,6 +129,12 @@ app.include_router(live_game.router)
 # Stats endpoints
 app.include_router(stats.router)
 
+# Draft endpoints
+app.include_router(draft.router)
+
+# Admin endpoints
+app.include_router(admin.router)
+
 
 # ============================================================================
 # ROOT ENDPOINTS
@@ -109,18 +151,26 @@ async def root():
         "endpoints": {
             "docs": "/api/docs",
             "champion_matchup": "/api/predict-champion-matchup",
+            "champion_matchup_batch": "/api/predict-champion-matchup/batch",
             "game_state": "/api/predict-game-state",
             "game_state_v2": "/api/predict-game-state-v2 (NEW: 79.28% accuracy)",
+            "game_state_v2_batch": "/api/predict-game-state-v2/batch",
             "champion_stats": "/api/champion-stats",
+            "champion_stats_by_role": "/api/champion-stats/roles/{role}",
             "champion_search": "/api/champions/search?query=yasuo",
             "champion_details": "/api/champions/{champion_name}",
             "champion_list": "/api/champions/list",
             "item_recommendations": "/api/item-recommendations",
             "intelligent_items": "/api/item-recommendations-intelligent",
+            "draft_best_picks": "/api/draft/best-picks",
+            "draft_ban_suggestions": "/api/draft/ban-suggestions",
+            "reload_models": "/api/admin/reload-models (X-INTERNAL-API-KEY)",
             "model_stats": "/api/stats/model",
             "live_game_status": "/api/live/status",
             "live_game_data": "/api/live/game-data",
-            "live_prediction": "/api/live/predict"
+            "live_prediction": "/api/live/predict",
+            "live_stream": "/api/live/stream (server-sent events)",
+            "live_sessions": "/api/live/sessions/{session_id} (PUT snapshot / PATCH diff from an agent, GET prediction)"
         }
     }
 
@@ -134,6 +184,15 @@ async def health_check():
         "status": "healthy",
         "deployment": "Vercel Serverless",
         "models_loaded": health_status,
+        "inference": ml_engine.get_inference_stats(),
+        "response_cache": response_cache.get_stats(),
+        "executors": get_executor_stats(),
+        "database_pool": get_pool_stats(),
+        "database_stats": db_stats.get_stats(),
+        "data_refresh": data_refresher.get_stats(),
+        "model_reload": model_reloader.get_stats(),
+        "live_stream": live_poller.get_stats(),
+        "live_sessions": live_sessions.get_stats(),
         "game_state_predictor_info": (
             ml_engine.game_state_predictor.get_model_info()
             if ml_engine.game_state_predictor and ml_engine.game_state_predictor.is_loaded
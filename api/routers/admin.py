@@ -0,0 +1,54 @@
+"""
+Admin API endpoints
+Handles operational actions (model hot reload)
+"""
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+
+from api.schemas.admin import ModelReloadRequest, ModelReloadResponse
+from api.services.model_reloader import model_reloader, ReloadError
+from api.core.config import settings
+from api.core.logging import logger
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+async def require_internal_api_key(request: Request):
+    """
+    Require X-INTERNAL-API-KEY in every environment (unlike verify_api_key)
+    """
+    if not settings.INTERNAL_API_KEY:
+        raise HTTPException(status_code=503, detail="Admin endpoints disabled (INTERNAL_API_KEY not set)")
+
+    api_key = request.headers.get("X-INTERNAL-API-KEY", "")
+    if not hmac.compare_digest(api_key.encode(), settings.INTERNAL_API_KEY.encode()):
+        logger.warning(f"Unauthorized admin access attempt from {request.client.host}")
+        raise HTTPException(status_code=401, detail="Invalid or missing API key")
+
+
+@router.post("/reload-models", response_model=ModelReloadResponse)
+async def reload_models(request: Request, body: ModelReloadRequest = None):
+    """
+    Reload model artifacts from disk without restarting
+
+    Each model is loaded, warmed and validated on a fixture set beside the
+    live one, then swapped in atomically; on failure the current model
+    keeps serving. Only this worker is reloaded - with several workers,
+    rely on the model file watcher (MODEL_RELOAD_POLL_SECONDS).
+    """
+    await require_internal_api_key(request)
+
+    try:
+        results = await model_reloader.reload(body.components if body else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
+    except ReloadError as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed, current models still serving: {str(e)}")
+
+    return ModelReloadResponse(
+        results=results,
+        versions={result['component']: model_reloader.engine.component_versions.get(result['component'], '')
+                  for result in results}
+    )
@@ -3,17 +3,20 @@ Champion API endpoints
 Handles champion stats, search, and details
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 from api.schemas.champion import ChampionStatsResponse
 from api.services.ml_engine import ml_engine
+from api.services.response_cache import response_cache
 from api.core.logging import logger
 
 router = APIRouter(prefix="/api", tags=["champions"])
 
 
-@router.get("/champion-stats", response_model=ChampionStatsResponse)
+@router.get("/champion-stats", response_model=ChampionStatsResponse, dependencies=[Depends(ml_engine.requires('champion_stats', 'champion_index'))])
+@response_cache.cached(ttl=300, depends_on=('champion_stats', 'champion_index'))
 async def get_champion_stats(
+    request: Request,
     min_games: int = 1,
     sort_by: str = "win_rate",
     limit: int = 50
@@ -30,32 +33,9 @@ async def get_champion_stats(
         raise HTTPException(status_code=503, detail="Champion stats not loaded")
 
     try:
-        # Filter and format
-        champions_list = []
-        for name, stats in ml_engine.champion_stats.items():
-            if stats['games'] >= min_games:
-                champions_list.append({
-                    'name': name,
-                    'games': stats['games'],
-                    'wins': stats['wins'],
-                    'losses': stats['losses'],
-                    'win_rate': stats['win_rate'],
-                    'roles': stats.get('roles', {})
-                })
-
-        # Sort
-        if sort_by == "win_rate":
-            champions_list.sort(key=lambda x: x['win_rate'], reverse=True)
-        elif sort_by == "games":
-            champions_list.sort(key=lambda x: x['games'], reverse=True)
-        elif sort_by == "wins":
-            champions_list.sort(key=lambda x: x['wins'], reverse=True)
-
-        # Limit
-        champions_list = champions_list[:limit]
-
+        # Sort orders are precomputed per data load (ChampionStatsIndex)
         return ChampionStatsResponse(
-            champions=champions_list,
+            champions=ml_engine.champion_index.page(min_games=min_games, sort_by=sort_by, limit=limit),
             total_champions=len(ml_engine.champion_stats)
         )
 
@@ -67,19 +47,51 @@ async def get_champion_stats(
         )
 
 
-@router.get("/champions/list")
-async def get_champions_list():
+@router.get("/champion-stats/roles/{role}", response_model=ChampionStatsResponse, dependencies=[Depends(ml_engine.requires('champion_stats', 'champion_index'))])
+@response_cache.cached(ttl=300, depends_on=('champion_stats', 'champion_index'))
+async def get_champion_stats_by_role(
+    request: Request,
+    role: str,
+    min_games: int = 1,
+    sort_by: str = "win_rate",
+    limit: int = 50
+):
+    """
+    Get champion statistics for one role (e.g. TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY)
+
+    Same query parameters as /api/champion-stats. Roles come from the
+    champion stats' `roles` field.
+    """
+    if not ml_engine.champion_stats:
+        raise HTTPException(status_code=503, detail="Champion stats not loaded")
+
+    index = ml_engine.champion_index
+    try:
+        champions = index.page(min_games=min_games, sort_by=sort_by, limit=limit, role=role)
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No champions with role '{role}'. Available roles: {index.available_roles or 'None (role data not populated)'}"
+        )
+
+    return ChampionStatsResponse(champions=champions, total_champions=len(ml_engine.champion_stats))
+
+
+@router.get("/champions/list", dependencies=[Depends(ml_engine.requires('champion_stats', 'champion_registry'))])
+@response_cache.cached(ttl=300, depends_on=('champion_stats', 'champion_registry'))
+async def get_champions_list(request: Request):
     """Get list of all available champions"""
     if not ml_engine.champion_stats:
         raise HTTPException(status_code=503, detail="Champion stats not loaded")
 
+    registry = ml_engine.champion_registry
     return {
-        "champions": sorted(list(ml_engine.champion_stats.keys())),
+        "champions": sorted(registry.canonical(name) or name for name in ml_engine.champion_stats),
         "total": len(ml_engine.champion_stats)
     }
 
 
-@router.get("/champions/search")
+@router.get("/champions/search", dependencies=[Depends(ml_engine.requires('item_recommender'))])
 async def search_champions(
     query: str,
     limit: int = 10,
@@ -117,8 +129,9 @@ async def search_champions(
         )
 
 
-@router.get("/champions/{champion_name}")
-async def get_champion_details(champion_name: str):
+@router.get("/champions/{champion_name}", dependencies=[Depends(ml_engine.requires('item_recommender', 'best_teammates', 'champion_registry'))])
+@response_cache.cached(ttl=300, depends_on=('champion_stats', 'item_recommender', 'best_teammates', 'champion_registry'))
+async def get_champion_details(request: Request, champion_name: str):
     """
     Get detailed information about a specific champion
 
@@ -132,21 +145,28 @@ async def get_champion_details(champion_name: str):
         raise HTTPException(status_code=503, detail="Item Recommender not loaded")
 
     try:
-        # Fuzzy match the champion name
-        matches = ml_engine.item_recommender.fuzzy_find_champion(champion_name, threshold=0.6)
-
-        if not matches:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Champion '{champion_name}' not found"
-            )
-
-        # Use best match
-        matched_champion = matches[0][0]
-        match_quality = matches[0][1]
+        registry = ml_engine.champion_registry
+        matched_champion = registry.canonical(champion_name)
+
+        if matched_champion is not None:
+            # Known name, id or alias
+            match_quality = 1.0
+        else:
+            # Fuzzy match the champion name (typos)
+            matches = ml_engine.item_recommender.fuzzy_find_champion(champion_name, threshold=0.6)
+
+            if not matches:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Champion '{champion_name}' not found"
+                )
+
+            # Use best match
+            matched_champion = matches[0][0]
+            match_quality = matches[0][1]
 
         # Get champion stats
-        stats = ml_engine.champion_stats.get(matched_champion, {}) if ml_engine.champion_stats else {}
+        stats = registry.get(ml_engine.champion_stats, matched_champion, {})
 
         # Get item builds
         item_builds_data = ml_engine.item_recommender.get_item_builds(
@@ -155,7 +175,7 @@ async def get_champion_details(champion_name: str):
         )
 
         # Get best teammates
-        teammates = ml_engine.best_teammates.get(matched_champion, []) if ml_engine.best_teammates else []
+        teammates = registry.get(ml_engine.best_teammates, matched_champion, [])
 
         return {
             "champion": matched_champion,
@@ -0,0 +1,115 @@
+"""
+Draft API endpoints
+Handles pick and ban suggestions for partial drafts
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from api.schemas.draft import (
+    BestPicksRequest, BestPicksResponse,
+    BanSuggestionsRequest, BanSuggestionsResponse
+)
+from api.routers.predictions import verify_api_key
+from api.services.ml_engine import ml_engine
+from api.core.executors import run_cpu
+from api.core.config import settings
+from api.core.logging import logger
+
+router = APIRouter(prefix="/api", tags=["draft"])
+limiter = Limiter(key_func=get_remote_address)
+
+
+@router.post("/draft/best-picks", response_model=BestPicksResponse, dependencies=[Depends(ml_engine.requires('champion_predictor'))])
+@limiter.limit("30/minute")
+async def best_picks(request: Request, body: BestPicksRequest):
+    """
+    Suggest the best next pick for one team of a partial draft
+
+    Every champion the matchup model knows (minus picks and bans) is
+    scored as the team's next pick in a single batched model call.
+
+    Returns:
+    - The team's current win probability
+    - Top-k picks with win probability and gain over the current draft
+    """
+    await verify_api_key(request)
+
+    if not ml_engine.champion_predictor:
+        raise HTTPException(status_code=503, detail="Champion Predictor not loaded")
+
+    try:
+        result = await run_cpu(
+            ml_engine.champion_predictor.best_picks,
+            blue_champions=body.blue_champions,
+            red_champions=body.red_champions,
+            team=body.team,
+            bans=body.bans,
+            top_k=body.top_k
+        )
+        return BestPicksResponse(**result)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid draft: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error suggesting picks: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to suggest picks. Please try again later."
+        )
+
+
+@router.post("/draft/ban-suggestions", response_model=BanSuggestionsResponse, dependencies=[Depends(ml_engine.requires('champion_predictor'))])
+@limiter.limit("30/minute")
+async def ban_suggestions(request: Request, body: BanSuggestionsRequest):
+    """
+    Suggest bans: the opponent picks that hurt a partial draft most
+
+    The opponent's next picks and the replies of both teams are expanded
+    with a beam search (one batched model call per ply) and backed up with
+    minimax. Width and depth default to DRAFT_BEAM_WIDTH / DRAFT_SEARCH_DEPTH
+    and cannot exceed them; deeper plies are skipped once the search would
+    exceed DRAFT_SEARCH_BUDGET_MS ("truncated" in the response).
+
+    Returns:
+    - The team's current win probability
+    - Top-k bans with the win probability left if the opponent picks them
+    """
+    await verify_api_key(request)
+
+    if not ml_engine.champion_predictor:
+        raise HTTPException(status_code=503, detail="Champion Predictor not loaded")
+
+    beam_width = min(body.beam_width or settings.DRAFT_BEAM_WIDTH, settings.DRAFT_BEAM_WIDTH)
+    depth = min(body.depth or settings.DRAFT_SEARCH_DEPTH, settings.DRAFT_SEARCH_DEPTH)
+
+    try:
+        result = await run_cpu(
+            ml_engine.champion_predictor.ban_suggestions,
+            blue_champions=body.blue_champions,
+            red_champions=body.red_champions,
+            team=body.team,
+            bans=body.bans,
+            top_k=body.top_k,
+            beam_width=beam_width,
+            depth=depth,
+            time_budget_ms=settings.DRAFT_SEARCH_BUDGET_MS,
+            max_rows=settings.DRAFT_SEARCH_MAX_ROWS
+        )
+        return BanSuggestionsResponse(**result)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid draft: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error suggesting bans: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to suggest bans. Please try again later."
+        )
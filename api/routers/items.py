@@ -3,12 +3,13 @@ Item Recommendation API endpoints
 Handles item recommendations and dynamic builds
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 import sys
 from pathlib import Path
 
 from api.schemas.item import ItemRecommendationRequest, ItemRecommendationResponse, DynamicBuildRequest
 from api.services.ml_engine import ml_engine
+from api.core.executors import run_cpu
 from api.core.logging import logger
 
 # Import for dynamic build
@@ -18,7 +19,7 @@ from dynamic_build_generator import Champion, GameState
 router = APIRouter(prefix="/api", tags=["items"])
 
 
-@router.post("/item-recommendations", response_model=ItemRecommendationResponse)
+@router.post("/item-recommendations", response_model=ItemRecommendationResponse, dependencies=[Depends(ml_engine.requires('item_builds', 'champion_registry'))])
 async def get_item_recommendations(request: ItemRecommendationRequest):
     """
     Get item recommendations for a champion
@@ -32,12 +33,11 @@ async def get_item_recommendations(request: ItemRecommendationRequest):
 
     try:
         champion = request.champion
+        champion_items = ml_engine.champion_registry.get(ml_engine.item_builds, champion)
 
-        if champion not in ml_engine.item_builds:
+        if champion_items is None:
             raise HTTPException(status_code=404, detail=f"Champion '{champion}' not found")
 
-        champion_items = ml_engine.item_builds[champion]
-
         # Handle both formats: dict with 'popular_items'/'builds' keys, or list directly
         if isinstance(champion_items, dict):
             # Dict format - extract popular_items and builds
@@ -110,7 +110,7 @@ async def get_item_recommendations(request: ItemRecommendationRequest):
         )
 
 
-@router.post("/item-recommendations-intelligent")
+@router.post("/item-recommendations-intelligent", dependencies=[Depends(ml_engine.requires('item_recommender'))])
 async def get_intelligent_item_recommendations(request: ItemRecommendationRequest):
     """
     Get intelligent item recommendations with heuristics
@@ -130,7 +130,8 @@ async def get_intelligent_item_recommendations(request: ItemRecommendationReques
         raise HTTPException(status_code=503, detail="Item Recommender not loaded")
 
     try:
-        result = ml_engine.item_recommender.recommend_items_for_matchup(
+        result = await run_cpu(
+            ml_engine.item_recommender.recommend_items_for_matchup,
             champion=request.champion,
             enemy_team=request.enemy_team,
             top_n=request.top_n
@@ -150,7 +151,7 @@ async def get_intelligent_item_recommendations(request: ItemRecommendationReques
         )
 
 
-@router.post("/draft/dynamic-build")
+@router.post("/draft/dynamic-build", dependencies=[Depends(ml_engine.requires('build_generator'))])
 async def generate_dynamic_build(request: DynamicBuildRequest):
     """
     Generate personalized item build path
@@ -193,7 +194,8 @@ async def generate_dynamic_build(request: DynamicBuildRequest):
         game_state = game_state_map.get(request.game_state, GameState.EVEN)
 
         # Generate build path
-        build_path = ml_engine.build_generator.generate_build_path(
+        build_path = await run_cpu(
+            ml_engine.build_generator.generate_build_path,
             user_champion=user_champ,
             ally_team=ally_team,
             enemy_team=enemy_team,
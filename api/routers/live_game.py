@@ -3,16 +3,28 @@ Live Game API endpoints
 Handles live game tracking and predictions
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Optional
+import asyncio
+import json
+from typing import Dict
 
+from fastapi import APIRouter, Depends, HTTPException, Path, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from api.routers.predictions import verify_api_key
+from api.services.live_sessions import SessionConflict, SessionStoreFull, live_sessions
+from api.services.live_stream import build_live_prediction, live_client_call, live_poller
 from api.services.ml_engine import ml_engine
+from api.core.config import settings
 from api.core.logging import logger
 
 router = APIRouter(prefix="/api/live", tags=["live_game"])
 
+# Chosen by the agent, e.g. a UUID per game
+SESSION_ID_PATTERN = r"^[A-Za-z0-9_-]{8,64}$"
+
 
-@router.get("/status")
+@router.get("/status", dependencies=[Depends(ml_engine.requires('riot_live_client'))])
 async def get_live_game_status():
     """
     Check if a live game is running
@@ -25,13 +37,15 @@ async def get_live_game_status():
         raise HTTPException(status_code=503, detail="Riot Live Client not initialized")
 
     try:
-        is_running = ml_engine.riot_live_client.is_game_running()
+        is_running = await live_client_call(ml_engine.riot_live_client, 'is_game_running')
 
         return {
             "is_running": is_running,
             "message": "Game is running" if is_running else "No game detected",
             "instructions": "Start a game to enable live tracking" if not is_running else None
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error checking game status: {e}", exc_info=True)
         raise HTTPException(
@@ -40,7 +54,7 @@ async def get_live_game_status():
         )
 
 
-@router.get("/game-data")
+@router.get("/game-data", dependencies=[Depends(ml_engine.requires('riot_live_client'))])
 async def get_live_game_data():
     """
     Get current live game data
@@ -54,14 +68,14 @@ async def get_live_game_data():
 
     try:
         # Check if game is running
-        if not ml_engine.riot_live_client.is_game_running():
+        if not await live_client_call(ml_engine.riot_live_client, 'is_game_running'):
             raise HTTPException(
                 status_code=404,
                 detail="No game is currently running. Start a game to use this endpoint."
             )
 
         # Get all game data
-        all_data = ml_engine.riot_live_client.get_all_game_data()
+        all_data = await live_client_call(ml_engine.riot_live_client, 'get_all_game_data')
         if not all_data:
             raise HTTPException(status_code=500, detail="Failed to fetch game data")
 
@@ -86,7 +100,7 @@ async def get_live_game_data():
         )
 
 
-@router.get("/predict")
+@router.get("/predict", dependencies=[Depends(ml_engine.requires('riot_live_client', 'champion_predictor', 'win_predictor'))])
 async def get_live_win_prediction():
     """
     Get live win prediction for current game
@@ -105,126 +119,177 @@ async def get_live_win_prediction():
     if not ml_engine.win_predictor or not ml_engine.champion_predictor:
         raise HTTPException(status_code=503, detail="Prediction models not loaded")
 
+    # While /api/live/stream is open, its poller already has the prediction
+    latest = live_poller.latest_prediction()
+    if latest is not None:
+        return latest
+
     try:
         # Check if game is running
-        if not ml_engine.riot_live_client.is_game_running():
+        if not await live_client_call(ml_engine.riot_live_client, 'is_game_running'):
             raise HTTPException(
                 status_code=404,
                 detail="No game is currently running. Start a game to get live predictions."
             )
 
         # Get formatted prediction data
-        pred_data = ml_engine.riot_live_client.get_live_prediction_data()
+        pred_data = await live_client_call(ml_engine.riot_live_client, 'get_live_prediction_data')
         if not pred_data:
             raise HTTPException(status_code=500, detail="Failed to fetch live game data")
 
-        # Champion matchup prediction
-        champion_prediction = ml_engine.champion_predictor.predict(
-            blue_champions=pred_data['blue_champions'],
-            red_champions=pred_data['red_champions']
+        return await build_live_prediction(ml_engine, pred_data)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating live prediction: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to generate live prediction. Please try again later."
         )
 
-        # Game state prediction (if game has progressed enough)
-        game_state_prediction = None
-        game_duration = pred_data['game_duration']
-
-        if game_duration >= 10:  # At least 10 minutes
-            try:
-                game_state_prediction = ml_engine.win_predictor.predict_win_probability(
-                    game_duration=game_duration,
-                    blue_kills=pred_data['blue_kills'],
-                    blue_deaths=pred_data['blue_deaths'],
-                    blue_assists=pred_data['blue_assists'],
-                    blue_gold=pred_data['blue_gold'],
-                    blue_towers=pred_data['blue_towers'],
-                    blue_dragons=pred_data['blue_dragons'],
-                    blue_barons=pred_data['blue_barons'],
-                    blue_vision_score=pred_data['blue_vision_score'],
-                    red_kills=pred_data['red_kills'],
-                    red_deaths=pred_data['red_deaths'],
-                    red_assists=pred_data['red_assists'],
-                    red_gold=pred_data['red_gold'],
-                    red_towers=pred_data['red_towers'],
-                    red_dragons=pred_data['red_dragons'],
-                    red_barons=pred_data['red_barons'],
-                    red_vision_score=pred_data['red_vision_score']
-                )
-            except Exception as e:
-                logger.warning(f"Game state prediction failed: {e}")
 
-        return {
-            "game_time": game_duration,
-            "game_time_formatted": f"{game_duration}:00",
-            "blue_team": {
-                "champions": pred_data['blue_champions'],
-                "kills": pred_data['blue_kills'],
-                "deaths": pred_data['blue_deaths'],
-                "gold": pred_data['blue_gold'],
-                "towers": pred_data['blue_towers']
-            },
-            "red_team": {
-                "champions": pred_data['red_champions'],
-                "kills": pred_data['red_kills'],
-                "deaths": pred_data['red_deaths'],
-                "gold": pred_data['red_gold'],
-                "towers": pred_data['red_towers']
-            },
-            "predictions": {
-                "champion_matchup": {
-                    "blue_win_probability": champion_prediction['blue_win_probability'],
-                    "red_win_probability": champion_prediction['red_win_probability'],
-                    "confidence": champion_prediction['confidence']
-                },
-                "game_state": game_state_prediction if game_state_prediction else {
-                    "message": "Game too early for state prediction (need 10+ minutes)",
-                    "blue_win_probability": None,
-                    "red_win_probability": None
-                }
-            },
-            "recommendation": _generate_live_recommendation(
-                pred_data,
-                champion_prediction,
-                game_state_prediction
-            )
-        }
+@router.get("/stream", dependencies=[Depends(ml_engine.requires('riot_live_client', 'champion_predictor', 'win_predictor'))])
+async def stream_live_predictions():
+    """
+    Server-sent event stream of live game updates
+
+    All open streams share one background poller of the game client, so
+    extra browser tabs add no client polling or prediction work.
+
+    Events:
+    - status: {"is_running": bool, "message": str} - when a game starts or ends
+    - active_player: Live client activeplayer data - when it changes
+    - prediction: Same payload as /api/live/predict - when the game state changes
+    - error: {"detail": str} - a poll or prediction failed (the stream continues)
+
+    The latest status / active_player / prediction is sent on connect; a
+    comment line is sent every LIVE_STREAM_HEARTBEAT_SECONDS while idle.
+    """
+    if not ml_engine.riot_live_client:
+        raise HTTPException(status_code=503, detail="Riot Live Client not initialized")
+
+    if not ml_engine.win_predictor or not ml_engine.champion_predictor:
+        raise HTTPException(status_code=503, detail="Prediction models not loaded")
+
+    async def events():
+        async with live_poller.subscribe() as queue:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.LIVE_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                data = json.dumps(jsonable_encoder(event['data']), separators=(',', ':'))
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ============================================================================
+# PUSHED SESSIONS (remote agents, many games per worker)
+# ============================================================================
+
+async def _read_payload(request: Request) -> Dict:
+    # Parsed directly: payloads are large and schemaless, pydantic validation would dominate
+    try:
+        return json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
+
 
+async def _push(session_id: str, payload: Dict, full: bool) -> Dict:
+    try:
+        return await live_sessions.push(session_id, payload, full)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
+    except SessionConflict as e:
+        raise HTTPException(status_code=409, detail=f"{e} - send a full snapshot (PUT)")
+    except SessionStoreFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating live prediction: {e}", exc_info=True)
+        logger.error(f"Error applying live session push: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail="Failed to generate live prediction. Please try again later."
+            detail="Failed to apply live game data. Please try again later."
         )
 
 
-def _generate_live_recommendation(pred_data: Dict, champion_pred: Dict, state_pred: Optional[Dict]) -> str:
-    """Generate recommendation based on live game state"""
+@router.put("/sessions/{session_id}", dependencies=[Depends(ml_engine.requires('champion_predictor', 'win_predictor'))])
+async def push_live_snapshot(request: Request, session_id: str = Path(..., pattern=SESSION_ID_PATTERN)):
+    """
+    Start or resynchronize a pushed live session
+
+    Body: a full Live Client allgamedata payload plus "seq", the agent's
+    push sequence number. A different lineup or an earlier game time than
+    the stored session starts the session over.
+
+    Returns the session's game time and current win probabilities;
+    prediction_updated tells whether the game state was re-predicted.
+    """
+    await verify_api_key(request)
+    return await _push(session_id, await _read_payload(request), full=True)
+
 
-    blue_champ_prob = champion_pred['blue_win_probability']
-    game_duration = pred_data['game_duration']
+@router.patch("/sessions/{session_id}", dependencies=[Depends(ml_engine.requires('champion_predictor', 'win_predictor'))])
+async def push_live_diff(request: Request, session_id: str = Path(..., pattern=SESSION_ID_PATTERN)):
+    """
+    Update a pushed live session with the changes since the last push
+
+    Body (see live_session.snapshot_diff):
+    - seq: this push's sequence number
+    - base_seq: seq of the push the diff was computed against
+    - gameData.gameTime: current game time
+    - allPlayers: changed players only ({"summonerName", changed "scores" /
+      "currentGold" / "level"})
+    - events.Events: new events only
+
+    409 if the session or a summoner is unknown (expired, other worker,
+    restart), or the session's last push is not base_seq (a push went to
+    another worker): the agent should send a full snapshot (PUT).
+    """
+    await verify_api_key(request)
+    return await _push(session_id, await _read_payload(request), full=False)
+
+
+@router.get("/sessions/{session_id}", dependencies=[Depends(ml_engine.requires('champion_predictor', 'win_predictor'))])
+async def get_live_session_prediction(request: Request, session_id: str = Path(..., pattern=SESSION_ID_PATTERN)):
+    """
+    Live prediction of a pushed session (same payload as /api/live/predict)
+    """
+    await verify_api_key(request)
+
+    try:
+        prediction = await live_sessions.get(session_id)
+    except Exception as e:
+        logger.error(f"Error generating live session prediction: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to generate live prediction. Please try again later."
+        )
+    if prediction is None:
+        raise HTTPException(status_code=404, detail=f"Unknown live session {session_id}")
+    return prediction
 
-    # Early game (< 15 min)
-    if game_duration < 15:
-        if blue_champ_prob > 0.55:
-            return "Strong early comp! Push your advantage and secure objectives."
-        elif blue_champ_prob < 0.45:
-            return "Play safe early game. Focus on farming and scaling."
-        else:
-            return "Even matchup. Focus on vision control and objective setup."
 
-    # Mid/Late game (15+ min) - use state prediction if available
-    if state_pred:
-        blue_state_prob = state_pred.get('blue_win_probability', 0.5)
+@router.delete("/sessions/{session_id}")
+async def end_live_session(request: Request, session_id: str = Path(..., pattern=SESSION_ID_PATTERN)):
+    """End a pushed session (game over); idle sessions also expire on their own"""
+    await verify_api_key(request)
 
-        gold_diff = pred_data['blue_gold'] - pred_data['red_gold']
-        tower_diff = pred_data['blue_towers'] - pred_data['red_towers']
+    if not live_sessions.end(session_id):
+        raise HTTPException(status_code=404, detail=f"Unknown live session {session_id}")
+    return {"session_id": session_id, "ended": True}
 
-        if blue_state_prob > 0.65:
-            return f"You're ahead! (Gold: +{gold_diff:,}) Keep pressure and don't throw."
-        elif blue_state_prob < 0.35:
-            return f"Behind (Gold: {gold_diff:,}). Secure vision, catch enemies, stall for scaling."
-        else:
-            return "Close game! Next teamfight is critical. Ward objectives."
 
-    return "Monitor your progress and adjust strategy based on objectives."
+@router.get("/sessions")
+async def get_live_sessions_stats(request: Request):
+    """Active pushed sessions, push / prediction counters and push latency"""
+    await verify_api_key(request)
+    return live_sessions.get_stats()
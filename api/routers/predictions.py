@@ -3,17 +3,21 @@ Prediction API endpoints
 Handles champion matchup and game state predictions
 """
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from api.schemas.prediction import (
     ChampionMatchupRequest,
+    ChampionMatchupBatchRequest,
     GameStateRequest,
     GameStateV2Request,
-    PredictionResponse
+    GameStateV2BatchRequest,
+    PredictionResponse,
+    BatchPredictionResponse
 )
 from api.services.ml_engine import ml_engine
+from api.core.executors import run_cpu
 from api.core.logging import logger
 from api.core.config import settings
 
@@ -43,7 +47,7 @@ async def verify_api_key(request: Request):
     return True
 
 
-@router.post("/predict-champion-matchup", response_model=PredictionResponse, dependencies=[])
+@router.post("/predict-champion-matchup", response_model=PredictionResponse, dependencies=[Depends(ml_engine.requires('champion_predictor'))])
 @limiter.limit("10/minute")
 async def predict_champion_matchup(request: Request, body: ChampionMatchupRequest):
     """
@@ -54,6 +58,11 @@ async def predict_champion_matchup(request: Request, body: ChampionMatchupReques
     - Prediction text
     - Confidence level
     - Champion win-rate details
+
+    With mode="monte_carlo", open slots of a partial draft are filled with
+    sampled completions (weighted by pick count) and the probability is the
+    mean over all samples; details.marginalization holds the sample count,
+    seed and confidence intervals.
     """
     # Verify API key
     await verify_api_key(request)
@@ -62,24 +71,43 @@ async def predict_champion_matchup(request: Request, body: ChampionMatchupReques
         raise HTTPException(status_code=503, detail="Champion Predictor not loaded")
 
     try:
-        result = ml_engine.champion_predictor.predict(
-            blue_champions=body.blue_champions,
-            red_champions=body.red_champions
-        )
+        if body.mode == "monte_carlo":
+            samples = body.samples or settings.CHAMPION_MC_SAMPLES
+            if samples > settings.CHAMPION_MC_MAX_SAMPLES:
+                raise ValueError(f"samples must be at most {settings.CHAMPION_MC_MAX_SAMPLES}")
+
+            result = await run_cpu(
+                ml_engine.champion_predictor.predict_marginalized,
+                body.blue_champions,
+                body.red_champions,
+                samples=samples,
+                seed=body.seed
+            )
+        else:
+            result = await ml_engine.predict_champion_matchup(
+                blue_champions=body.blue_champions,
+                red_champions=body.red_champions
+            )
+
+        details = {
+            'blue_avg_winrate': result['blue_avg_winrate'],
+            'red_avg_winrate': result['red_avg_winrate'],
+            'model': 'champion_matchup',
+            'accuracy': '61.6%'
+        }
+        if 'marginalization' in result:
+            details['marginalization'] = result['marginalization']
 
         return PredictionResponse(
             blue_win_probability=result['blue_win_probability'],
             red_win_probability=result['red_win_probability'],
             prediction=result['prediction'],
             confidence=result['confidence'],
-            details={
-                'blue_avg_winrate': result['blue_avg_winrate'],
-                'red_avg_winrate': result['red_avg_winrate'],
-                'model': 'champion_matchup',
-                'accuracy': '61.6%'
-            }
+            details=details
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         # User input errors (e.g., unknown champion)
         logger.warning(f"Invalid input for champion matchup prediction: {e}")
@@ -92,7 +120,67 @@ async def predict_champion_matchup(request: Request, body: ChampionMatchupReques
         )
 
 
-@router.post("/predict-game-state", response_model=PredictionResponse, dependencies=[])
+@router.post("/predict-champion-matchup/batch", response_model=BatchPredictionResponse, dependencies=[Depends(ml_engine.requires('champion_predictor'))])
+@limiter.limit("10/minute")
+async def predict_champion_matchup_batch(request: Request, body: ChampionMatchupBatchRequest):
+    """
+    Predict win probabilities for many champion matchups at once
+
+    All matchups are scored with a single vectorized model call.
+
+    Returns:
+    - One prediction per matchup (same format as /predict-champion-matchup), in request order
+    """
+    # Verify API key
+    await verify_api_key(request)
+
+    if not ml_engine.champion_predictor:
+        raise HTTPException(status_code=503, detail="Champion Predictor not loaded")
+
+    if any(matchup.mode != "padded" for matchup in body.matchups):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid request: mode 'monte_carlo' is only supported by /api/predict-champion-matchup"
+        )
+
+    try:
+        results = await run_cpu(ml_engine.champion_predictor.predict_batch, [
+            (matchup.blue_champions, matchup.red_champions)
+            for matchup in body.matchups
+        ])
+
+        predictions = [
+            PredictionResponse(
+                blue_win_probability=result['blue_win_probability'],
+                red_win_probability=result['red_win_probability'],
+                prediction=result['prediction'],
+                confidence=result['confidence'],
+                details={
+                    'blue_avg_winrate': result['blue_avg_winrate'],
+                    'red_avg_winrate': result['red_avg_winrate'],
+                    'model': 'champion_matchup',
+                    'accuracy': '61.6%'
+                }
+            )
+            for result in results
+        ]
+
+        return BatchPredictionResponse(predictions=predictions, count=len(predictions))
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid input for batch champion matchup prediction: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error in batch champion matchup prediction: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error during prediction. Please try again later."
+        )
+
+
+@router.post("/predict-game-state", response_model=PredictionResponse, dependencies=[Depends(ml_engine.requires('win_predictor'))])
 @limiter.limit("10/minute")
 async def predict_game_state(http_request: Request, request: GameStateRequest):
     """
@@ -143,7 +231,7 @@ async def predict_game_state(http_request: Request, request: GameStateRequest):
         }
 
         # Predict
-        blue_prob = ml_engine.win_predictor.predict_single(game_state)
+        blue_prob = await run_cpu(ml_engine.win_predictor.predict_single, game_state)
         red_prob = 1 - blue_prob
 
         # Generate prediction text
@@ -179,6 +267,8 @@ async def predict_game_state(http_request: Request, request: GameStateRequest):
             }
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         # User input errors
         logger.warning(f"Invalid input for game state prediction: {e}")
@@ -191,9 +281,9 @@ async def predict_game_state(http_request: Request, request: GameStateRequest):
         )
 
 
-@router.post("/predict-game-state-v2", response_model=PredictionResponse, dependencies=[])
+@router.post("/predict-game-state-v2", response_model=PredictionResponse, dependencies=[Depends(ml_engine.requires('game_state_predictor'))])
 @limiter.limit("10/minute")
-async def predict_game_state_v2(http_request: Request, request: GameStateV2Request):
+async def predict_game_state_v2(request: Request, body: GameStateV2Request):
     """
     🆕 NEW: Predict win probability using the advanced Game State Predictor
 
@@ -215,30 +305,13 @@ async def predict_game_state_v2(http_request: Request, request: GameStateV2Reque
     - Game state analysis
     """
     # Verify API key
-    await verify_api_key(http_request)
+    await verify_api_key(request)
 
     if not ml_engine.game_state_predictor or not ml_engine.game_state_predictor.is_loaded:
         raise HTTPException(status_code=503, detail="Game State Predictor not loaded")
 
     try:
-        result = ml_engine.game_state_predictor.predict(
-            blue_gold=request.blue_gold,
-            red_gold=request.red_gold,
-            blue_xp=request.blue_xp,
-            red_xp=request.red_xp,
-            blue_level=request.blue_level,
-            red_level=request.red_level,
-            blue_cs=request.blue_cs,
-            red_cs=request.red_cs,
-            blue_kills=request.blue_kills,
-            red_kills=request.red_kills,
-            blue_dragons=request.blue_dragons,
-            red_dragons=request.red_dragons,
-            blue_barons=request.blue_barons,
-            red_barons=request.red_barons,
-            blue_towers=request.blue_towers,
-            red_towers=request.red_towers
-        )
+        result = await ml_engine.predict_game_state(body.model_dump())
 
         return PredictionResponse(
             blue_win_probability=result['blue_win_probability'],
@@ -248,6 +321,8 @@ async def predict_game_state_v2(http_request: Request, request: GameStateV2Reque
             details=result['details']
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.warning(f"Invalid input for game state v2 prediction: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
@@ -257,3 +332,51 @@ async def predict_game_state_v2(http_request: Request, request: GameStateV2Reque
             status_code=500,
             detail="Internal server error during prediction. Please try again later."
         )
+
+
+@router.post("/predict-game-state-v2/batch", response_model=BatchPredictionResponse, dependencies=[Depends(ml_engine.requires('game_state_predictor'))])
+@limiter.limit("10/minute")
+async def predict_game_state_v2_batch(request: Request, body: GameStateV2BatchRequest):
+    """
+    Predict win probabilities for many game states at once
+
+    All game states are scored with a single vectorized model call.
+
+    Returns:
+    - One prediction per game state (same format as /predict-game-state-v2), in request order
+    """
+    # Verify API key
+    await verify_api_key(request)
+
+    if not ml_engine.game_state_predictor or not ml_engine.game_state_predictor.is_loaded:
+        raise HTTPException(status_code=503, detail="Game State Predictor not loaded")
+
+    try:
+        results = await run_cpu(ml_engine.game_state_predictor.predict_batch, [
+            state.model_dump() for state in body.game_states
+        ])
+
+        predictions = [
+            PredictionResponse(
+                blue_win_probability=result['blue_win_probability'],
+                red_win_probability=result['red_win_probability'],
+                prediction=result['prediction'],
+                confidence=result['confidence'],
+                details=result['details']
+            )
+            for result in results
+        ]
+
+        return BatchPredictionResponse(predictions=predictions, count=len(predictions))
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid input for batch game state v2 prediction: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error in batch game state v2 prediction: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error during prediction. Please try again later."
+        )
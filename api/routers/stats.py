@@ -3,26 +3,32 @@ Stats API endpoints
 Handles model performance and system statistics
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
 from api.services.ml_engine import ml_engine
+from api.core.executors import run_io
 from api.core.logging import logger
-from api.core.database import get_database_stats, get_model_performance
+from api.core.database import get_model_performance
+from api.services.db_stats import db_stats as db_stats_provider
 
 router = APIRouter(prefix="/api", tags=["stats"])
 
 
-@router.get("/stats")
+@router.get("/stats", dependencies=[Depends(ml_engine.requires('game_state_predictor', 'champion_predictor'))])
 async def get_stats():
     """
     Get comprehensive system statistics (used by Stats page)
 
-    Returns database stats, model performance, and system info
+    Returns database stats, model performance, and system info. Not in the
+    response cache: db_stats_provider already caches the counts, and its
+    age/staleness fields (and background refresh) must be per request.
     """
     try:
-        # Get database stats from PostgreSQL
+        # Get database stats from PostgreSQL (cached, refreshed in the background)
         try:
-            db_stats = get_database_stats()
+            db_stats = await db_stats_provider.get()
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"❌ Failed to get database stats: {e}")
             raise HTTPException(
@@ -86,13 +92,15 @@ async def get_stats():
         )
 
 
-@router.get("/stats/model")
+@router.get("/stats/model", dependencies=[Depends(ml_engine.requires('champion_stats', 'item_builds', 'best_teammates', 'game_state_predictor'))])
 async def get_model_stats():
     """Get model performance statistics (legacy endpoint)"""
     try:
         # Get database stats for match count
         try:
-            db_perf = get_model_performance('champion_matchup')
+            db_perf = await run_io(get_model_performance, 'champion_matchup')
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"❌ Failed to get model performance from database: {e}")
             raise HTTPException(
@@ -0,0 +1,26 @@
+"""
+Pydantic schemas for admin endpoints
+"""
+
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+
+
+class ModelReloadRequest(BaseModel):
+    """Model components to reload (all of them if omitted)"""
+    components: Optional[List[Literal["champion_predictor", "win_predictor", "game_state_predictor"]]] = Field(
+        None, max_items=3, example=["game_state_predictor"]
+    )
+
+
+class ModelReloadResult(BaseModel):
+    component: str
+    status: str
+    seconds: float
+    checks: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ModelReloadResponse(BaseModel):
+    results: List[ModelReloadResult]
+    versions: Dict[str, str]
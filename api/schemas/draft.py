@@ -0,0 +1,58 @@
+"""
+Pydantic schemas for draft assistance endpoints
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class BestPicksRequest(BaseModel):
+    """Partial draft and the team whose next pick should be suggested"""
+    blue_champions: List[str] = Field(default_factory=list, max_items=5, example=["Lux", "Braum"])
+    red_champions: List[str] = Field(default_factory=list, max_items=5, example=["Zed", "Leona"])
+    team: Literal["blue", "red"] = Field("blue", example="blue")
+    bans: List[str] = Field(default_factory=list, max_items=10, example=["Yasuo", "Yone"])
+    top_k: int = Field(10, ge=1, le=50, example=10)
+
+
+class PickSuggestion(BaseModel):
+    champion: str
+    win_probability: float
+    win_probability_gain: float
+    win_rate: float
+
+
+class BestPicksResponse(BaseModel):
+    team: str
+    current_win_probability: float
+    candidates_scored: int
+    picks: List[PickSuggestion]
+
+
+class BanSuggestionsRequest(BaseModel):
+    """Partial draft and the team whose opponent's picks should be banned"""
+    blue_champions: List[str] = Field(default_factory=list, max_items=5, example=["Lux", "Braum"])
+    red_champions: List[str] = Field(default_factory=list, max_items=5, example=["Zed"])
+    team: Literal["blue", "red"] = Field("blue", example="blue")
+    bans: List[str] = Field(default_factory=list, max_items=10, example=["Yasuo"])
+    top_k: int = Field(5, ge=1, le=20, example=5)
+    beam_width: Optional[int] = Field(None, ge=1, le=10, example=4)
+    depth: Optional[int] = Field(None, ge=1, le=6, example=3)
+
+
+class BanSuggestion(BaseModel):
+    champion: str
+    win_probability_if_picked: float
+    immediate_win_probability: float
+    threat: float
+
+
+class BanSuggestionsResponse(BaseModel):
+    team: str
+    current_win_probability: float
+    depth_searched: int
+    beam_width: int
+    nodes_scored: int
+    truncated: bool
+    elapsed_ms: float
+    bans: List[BanSuggestion]
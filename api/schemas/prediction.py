@@ -3,12 +3,16 @@ Pydantic schemas for prediction endpoints
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 
 
 class ChampionMatchupRequest(BaseModel):
     blue_champions: List[str] = Field(..., min_items=1, max_items=5, example=["MissFortune", "Lux", "Braum", "Renekton", "Fizz"])
     red_champions: List[str] = Field(..., min_items=1, max_items=5, example=["Caitlyn", "Morgana", "Leona", "Darius", "Zed"])
+    # "padded": open slots as empty (id 0); "monte_carlo": average over sampled completions
+    mode: Literal["padded", "monte_carlo"] = Field("padded", example="padded")
+    samples: Optional[int] = Field(None, ge=1, example=1000)
+    seed: Optional[int] = Field(0, example=0)
 
 
 class GameStateRequest(BaseModel):
@@ -57,3 +61,18 @@ class PredictionResponse(BaseModel):
     prediction: str
     confidence: str
     details: Optional[Dict] = None
+
+
+class ChampionMatchupBatchRequest(BaseModel):
+    """Batch of champion matchups scored with a single model call"""
+    matchups: List[ChampionMatchupRequest] = Field(..., min_items=1, max_items=5000)
+
+
+class GameStateV2BatchRequest(BaseModel):
+    """Batch of game states scored with a single model call"""
+    game_states: List[GameStateV2Request] = Field(..., min_items=1, max_items=5000)
+
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[PredictionResponse]
+    count: int
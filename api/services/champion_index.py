@@ -0,0 +1,116 @@
+"""
+Champion stats index
+Columnar champion table with sort orders precomputed once per data load
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from champion_registry import ChampionRegistry
+
+SORT_FIELDS = ('win_rate', 'games', 'wins')
+
+
+class ChampionStatsIndex:
+    """
+    Champion stats as columns plus one descending permutation per sort field
+
+    A page is a slice of a permutation, so no request scans the table:
+    - min_games is a binary search in the games order, giving how many
+      champions qualify. Sorted by games (or with nobody filtered out, the
+      common min_games=1 case) the page is a slice. In the other orders
+      the first limit + (filtered out) rows hold the page; when fewer
+      champions qualify than that, they are taken from the games order and
+      put in the requested order by their precomputed positions instead.
+    - Each role gets the same permutations restricted to its champions.
+
+    Ties keep champion_stats order (stable sorts), as the old per-request
+    list.sort() did; an unknown sort field keeps champion_stats order.
+    """
+
+    def __init__(self, champion_stats: Dict[str, Dict], registry: Optional[ChampionRegistry] = None):
+        names = list(champion_stats)
+        stats = [champion_stats[name] for name in names]
+
+        # Response rows, built once
+        self.records: List[Dict] = [
+            {
+                'name': (registry.canonical(name) if registry else None) or name,
+                'games': entry['games'],
+                'wins': entry['wins'],
+                'losses': entry['losses'],
+                'win_rate': entry['win_rate'],
+                'roles': entry.get('roles', {})
+            }
+            for name, entry in zip(names, stats)
+        ]
+        self.total = len(self.records)
+
+        self.columns: Dict[str, np.ndarray] = {
+            field: np.array([record[field] for record in self.records], dtype=np.float64)
+            for field in SORT_FIELDS
+        }
+        self._fewest_games = self.columns['games'].min() if self.total else 0.0
+
+        self.orders = self._orders(np.arange(self.total, dtype=np.intp))
+
+        # Role -> the same permutations restricted to that role
+        self.roles: Dict[str, Dict[str, np.ndarray]] = {}
+        role_members: Dict[str, List[int]] = {}
+        for row, record in enumerate(self.records):
+            for role in (record['roles'] or {}):
+                role_members.setdefault(self._role_key(role), []).append(row)
+        for role, members in role_members.items():
+            member_mask = np.zeros(self.total, dtype=bool)
+            member_mask[members] = True
+            self.roles[role] = self._orders(np.flatnonzero(member_mask))
+
+    def _orders(self, rows: np.ndarray) -> Dict:
+        """Descending permutation per sort field (plus source order) and each row's position in it"""
+        orders = {None: rows}
+        for field in SORT_FIELDS:
+            orders[field] = rows[np.argsort(-self.columns[field][rows], kind='stable')]
+        for field in (None,) + SORT_FIELDS:
+            position = np.zeros(self.total, dtype=np.intp)
+            position[orders[field]] = np.arange(len(rows))
+            orders['_position', field] = position
+        # Negated games along the games order (ascending - binary-searchable)
+        orders['_neg_games'] = -self.columns['games'][orders['games']]
+        return orders
+
+    @staticmethod
+    def _role_key(role: str) -> str:
+        return str(role).strip().upper()
+
+    @property
+    def available_roles(self) -> List[str]:
+        return sorted(self.roles)
+
+    def page(self, min_games: int = 1, sort_by: str = 'win_rate', limit: int = 50,
+             role: Optional[str] = None) -> List[Dict]:
+        """
+        Champions with at least min_games games, best first by sort_by
+
+        Raises:
+            KeyError: If role is given but no champion has it
+        """
+        orders = self.orders if role is None else self.roles[self._role_key(role)]
+        field = sort_by if sort_by in SORT_FIELDS else None
+        order = orders[field]
+
+        if self._fewest_games < min_games:  # someone is filtered out
+            # Descending by games: the qualifying champions are a prefix of that order
+            qualifying = int(np.searchsorted(orders['_neg_games'], -min_games, side='right'))
+            excluded = len(order) - qualifying
+            if field == 'games':
+                order = order[:qualifying]
+            elif limit + excluded <= qualifying:
+                # At most `excluded` of these rows fail, so the page is among them
+                head = order[:max(limit, 0) + excluded]
+                order = head[self.columns['games'][head] >= min_games]
+            else:
+                rows = orders['games'][:qualifying]
+                order = rows[np.argsort(orders['_position', field][rows])]
+
+        return [self.records[row] for row in order[:limit]]
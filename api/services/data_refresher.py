@@ -0,0 +1,354 @@
+"""
+Champion data refresher
+Keeps in-memory champion stats and teammate synergies current with new matches
+"""
+
+import asyncio
+import copy
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from api.core.config import settings
+from api.core.executors import run_io
+from api.core.logging import logger
+from api.core.metrics import Histogram
+from api.services.champion_index import ChampionStatsIndex
+from api.services.ml_engine import ml_engine
+
+from intelligent_item_recommender import IntelligentItemRecommender
+
+MIN_CHAMPION_GAMES = 10     # as get_champion_stats()
+MIN_TEAMMATE_GAMES = 10     # as get_best_teammates()
+TEAMMATES_PER_CHAMPION = 10
+REFRESH_MS_BUCKETS = [1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 60000]
+
+
+class ChampionDataRefresher:
+    """
+    Background delta refresh of champion_stats and best_teammates
+
+    The first run seeds full counters (games/wins per champion and per
+    teammate pair) and a crawled_at watermark from one database snapshot,
+    read from champion_agg / champion_pair_agg where available. Later runs
+    fetch only the picks of matches crawled after the watermark and add
+    them to the counters - O(new rows).
+
+    Results are published copy-on-write: new dicts share the entries of
+    untouched champions, touched champions get new entries, and the dict
+    is swapped in with one reference assignment (MLEngine.swap_components),
+    so readers never see a half-updated dict. Components derived from the
+    stats (champion_index, champion_predictor, item_recommender,
+    build_generator) are new instances built beside the live ones - live
+    objects are never modified - and swapped the same way; a champion the
+    shared registry does not know gets a new registry.
+
+    Seeding publishes only the champions whose loaded entries disagree with
+    the counters - nothing if the data was loaded at the same database
+    state - so workers keep the data inherited from the pre-fork master or
+    restored from the snapshot, and its content versions. Teammate lists
+    that the startup query's global cut shortened are filled in once their
+    champions play new matches.
+
+    crawled_at is taken when a loader's transaction starts, so a slow
+    loader can commit matches older than the watermark: each run re-reads
+    the last DATA_REFRESH_OVERLAP_SECONDS and skips matches already applied.
+
+    A populated champion_stats table (curated stats, not derived from
+    matches) is left alone; only teammate synergies are refreshed then.
+    Refreshed synergies keep the top 10 per champion without the startup
+    query's global top-1000 cut.
+    """
+
+    def __init__(self, engine, interval: float, overlap: float):
+        self.engine = engine
+        self.interval = interval
+        self.overlap = timedelta(seconds=overlap)
+
+        # Counters: champion_id -> [games, wins]; champion_id -> teammate -> [games, wins]
+        # (a pair's counter is one list shared by both directions)
+        self._champions: Dict[int, List[int]] = {}
+        self._teammates: Dict[int, Dict[int, List[int]]] = {}
+        self._static_stats = False
+        self.seeded = False
+        self.watermark = None
+        self._recent: Dict[str, object] = {}  # match_id -> crawled_at (overlap window)
+
+        self._task: Optional[asyncio.Task] = None
+        self._last_success_started: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.matches_applied = 0
+        self.last_applied = 0
+        self.last_error: Optional[str] = None
+        self.duration_ms = Histogram(REFRESH_MS_BUCKETS)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the refresh loop (no-op if disabled, no database is configured or reads use the static export)"""
+        from api.core.database import EMBEDDED, SUPABASE_URL
+
+        if self.interval <= 0 or not SUPABASE_URL or EMBEDDED or self._task is not None:
+            return
+        self._task = asyncio.ensure_future(self._run())
+        logger.info(f"✓ Champion data refresher started (every {self.interval:g}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await run_io(self.refresh)
+            except Exception as e:
+                # refresh() records the failure; keep the loop alive
+                logger.warning(f"⚠️  Champion data refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def refresh(self) -> int:
+        """
+        Seed (first call) or apply new matches, then publish (blocking)
+
+        Returns:
+            Number of matches applied
+        """
+        started_at, started = time.time(), time.perf_counter()
+        try:
+            applied = self._apply_new_matches() if self.seeded else self._seed()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+
+        self.duration_ms.observe((time.perf_counter() - started) * 1000)
+        self.refreshes += 1
+        self.last_applied = applied
+        self.matches_applied += applied
+        self.last_error = None
+        self._last_success_started = started_at
+        return applied
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    def _seed(self) -> int:
+        from api.core.database import get_champion_counters
+
+        data = get_champion_counters(self.overlap.total_seconds())
+        self._champions = {champion_id: list(counts) for champion_id, counts in data['champions'].items()}
+        self._teammates = {}
+        for (a, b), counts in data['pairs'].items():
+            counter = list(counts)
+            self._teammates.setdefault(a, {})[b] = counter
+            self._teammates.setdefault(b, {})[a] = counter
+        self._static_stats = data['static_stats']
+        self.watermark = data['watermark']
+        self._recent = data['recent']
+        self.seeded = True
+
+        champions, teammates = self._stale_champions()
+        if champions or teammates:
+            self._publish(champions, teammates)
+        logger.info(f"✓ Champion data refresher seeded ({len(self._champions)} champions, "
+                    f"watermark {self.watermark}, {len(champions | teammates)} champions republished)")
+        return 0
+
+    def _stale_champions(self) -> Tuple[Set[int], Set[int]]:
+        """Champions whose loaded stats / teammate entries do not match the counters"""
+        engine = self.engine
+        champions: Set[int] = set()
+        if not self._static_stats and engine.champion_stats is not None:
+            loaded = engine.champion_stats
+            ids = set(self._champions) | {int(key) for key in loaded if str(key).isdigit()}
+            champions = {champion_id for champion_id in ids
+                         if self._stats_entry(champion_id) != loaded.get(str(champion_id))}
+
+        teammates: Set[int] = set()
+        if engine.best_teammates is not None and not engine.best_teammates:
+            teammates = set(self._teammates)  # nothing loaded (the startup query failed)
+        for key, synergies in (engine.best_teammates or {}).items():
+            if not str(key).isdigit():
+                continue
+            counters = self._teammates.get(int(key), {})
+            for synergy in synergies:
+                games, wins = counters.get(synergy['champion_id'], (0, 0))
+                if games != synergy['games'] or not games or round(wins / games, 4) != synergy['synergy_score']:
+                    teammates.add(int(key))
+                    break
+        return champions, teammates
+
+    def _apply_new_matches(self) -> int:
+        from api.core.database import get_match_champions_since
+
+        since = self.watermark - self.overlap if self.watermark is not None else None
+        matches: Dict[str, Dict] = {}
+        for row in get_match_champions_since(since):
+            if row['match_id'] in self._recent:
+                continue
+            match = matches.setdefault(row['match_id'], {
+                'blue_win': row['blue_win'], 'crawled_at': row['crawled_at'], 'picks': []
+            })
+            match['picks'].append((row['team'], row['champion_id']))
+
+        touched: Set[int] = set()
+        for match_id, match in matches.items():
+            self._add_match(match['blue_win'], match['picks'], touched)
+            self._recent[match_id] = match['crawled_at']
+            if self.watermark is None or match['crawled_at'] > self.watermark:
+                self.watermark = match['crawled_at']
+
+        if self.watermark is not None:
+            cutoff = self.watermark - self.overlap
+            self._recent = {match_id: at for match_id, at in self._recent.items() if at > cutoff}
+
+        if touched:
+            self._publish(touched, touched)
+            logger.info(f"✓ Champion data refreshed ({len(matches)} new matches, {len(touched)} champions)")
+        return len(matches)
+
+    def _add_match(self, blue_win: bool, picks: List, touched: Set[int]):
+        """Count one match's picks and teammate pairs"""
+        for team, champion_id in picks:
+            won = int(blue_win == (team == 'blue'))
+            counter = self._champions.setdefault(champion_id, [0, 0])
+            counter[0] += 1
+            counter[1] += won
+            touched.add(champion_id)
+
+        for i, (team, a) in enumerate(picks):
+            won = int(blue_win == (team == 'blue'))
+            for other_team, b in picks[i + 1:]:
+                if other_team != team or a == b:
+                    continue
+                counter = self._teammates.setdefault(a, {}).get(b)
+                if counter is None:
+                    counter = [0, 0]
+                    self._teammates[a][b] = counter
+                    self._teammates.setdefault(b, {})[a] = counter
+                counter[0] += 1
+                counter[1] += won
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def _stats_entry(self, champion_id: int) -> Optional[Dict]:
+        games, wins = self._champions.get(champion_id, (0, 0))
+        if games < MIN_CHAMPION_GAMES:
+            return None
+        return {
+            'games': games,
+            'wins': wins,
+            'losses': games - wins,
+            'win_rate': round(wins / games, 4),
+            'roles': {}
+        }
+
+    def _teammates_entry(self, champion_id: int) -> Optional[List[Dict]]:
+        synergies = [
+            {
+                'champion_id': teammate,
+                'synergy_score': round(wins / games, 4),
+                'games': games
+            }
+            for teammate, (games, wins) in self._teammates.get(champion_id, {}).items()
+            if games >= MIN_TEAMMATE_GAMES
+        ]
+        synergies.sort(key=lambda x: x['synergy_score'], reverse=True)
+        return synergies[:TEAMMATES_PER_CHAMPION] or None
+
+    @staticmethod
+    def _patched(current: Optional[Dict], champions: Iterable[int], entry_fn) -> Dict:
+        """Copy of `current` with the given champions' entries replaced (or dropped)"""
+        result = dict(current or {})
+        for champion_id in champions:
+            entry = entry_fn(champion_id)
+            if entry is None:
+                result.pop(str(champion_id), None)
+            else:
+                result[str(champion_id)] = entry
+        return result
+
+    def _publish(self, champions: Set[int], teammates: Set[int]):
+        """Swap in champion_stats / best_teammates with these champions' entries replaced, and what derives from them"""
+        engine = self.engine
+        replacements = {}
+
+        if teammates and engine.best_teammates is not None:
+            replacements['best_teammates'] = self._patched(engine.best_teammates, teammates, self._teammates_entry)
+        if champions and not self._static_stats and engine.champion_stats is not None:
+            replacements['champion_stats'] = self._patched(engine.champion_stats, champions, self._stats_entry)
+        if not replacements:
+            return
+
+        stats = replacements.get('champion_stats', engine.champion_stats)
+        registry = engine.champion_registry
+        published = [key for name, keys in (('champion_stats', champions), ('best_teammates', teammates))
+                     if name in replacements for key in map(str, keys) if key in replacements[name]]
+        if registry is not None and any(registry.resolve(key) is None for key in published):
+            # New champion: the shared registry is never modified, build one that knows it
+            registry = engine.build_registry(champion_stats=stats, best_teammates=replacements.get('best_teammates'))
+            replacements['champion_registry'] = registry
+
+        if 'champion_stats' in replacements or 'champion_registry' in replacements:
+            if engine.champion_index is not None:
+                replacements['champion_index'] = ChampionStatsIndex(stats, registry)
+            if engine.champion_predictor is not None:
+                # Shallow copy: shares the compiled model, gets new stats arrays
+                predictor = copy.copy(engine.champion_predictor)
+                predictor.champion_stats = stats
+                predictor.attach_registry(registry)
+                replacements['champion_predictor'] = predictor
+            recommender = engine.item_recommender
+            if recommender is not None:
+                # New instance: its champion lookup tables derive from the stats
+                replacements['item_recommender'] = IntelligentItemRecommender(
+                    data_dir=str(recommender.data_dir),
+                    champion_stats=stats,
+                    item_builds=recommender.item_builds,
+                    registry=registry
+                )
+            if engine.build_generator is not None:
+                # Shallow copy: shares the item database, reads the new stats and registry
+                generator = copy.copy(engine.build_generator)
+                generator.champion_stats = stats
+                generator.attach_registry(registry)
+                replacements['build_generator'] = generator
+
+        engine.swap_components(**replacements)
+
+    def get_stats(self) -> Dict:
+        """Refresh metrics for health/monitoring endpoints"""
+        return {
+            'enabled': self._task is not None,
+            'interval_seconds': self.interval,
+            'seeded': self.seeded,
+            'watermark': self.watermark.isoformat() if self.watermark is not None else None,
+            # Upper bound on how far in-memory data trails the database
+            'lag_seconds': (round(time.time() - self._last_success_started, 1)
+                            if self._last_success_started is not None else None),
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'matches_applied': self.matches_applied,
+            'last_applied': self.last_applied,
+            'last_error': self.last_error,
+            'duration_ms': self.duration_ms.snapshot()
+        }
+
+
+# Global refresher instance (started by the app lifespan)
+data_refresher = ChampionDataRefresher(
+    ml_engine,
+    interval=settings.DATA_REFRESH_INTERVAL_SECONDS,
+    overlap=settings.DATA_REFRESH_OVERLAP_SECONDS
+)
@@ -0,0 +1,133 @@
+"""
+Database statistics provider
+Stale-while-revalidate row counts for /api/stats and health checks
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+from api.core.config import settings
+from api.core.executors import run_io
+from api.core.logging import logger
+
+RETRY_SECONDS = 30  # after a failed refresh (capped by the TTL)
+
+
+class DatabaseStatsProvider:
+    """
+    Database statistics that never wait on a table scan
+
+    - The first call fetches planner estimates (pg_class.reltuples, the
+      maintained champion_agg table): one cheap query, whose cost does not
+      grow with the data.
+    - Exact counts are recomputed in the background whenever the last
+      ones are older than DB_STATS_TTL_SECONDS; until they arrive, the
+      previous value (estimate or exact) is served.
+    - If the database is slow or down, the last good value keeps being
+      served, marked stale, with its age; only if there never was one does
+      get() raise.
+
+    Every result carries 'source' ('estimate' or 'exact'), 'age_seconds'
+    and 'stale'.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Optional[Dict] = None
+        self._source: Optional[str] = None
+        self._fetched_at = 0.0       # when the served value was read
+        self._attempted_at = 0.0     # last exact refresh attempt
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._estimate_lock = asyncio.Lock()
+
+        self.exact_refreshes = 0
+        self.estimates = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    async def get(self) -> Dict:
+        """
+        Latest statistics (starts a background refresh when they are due)
+
+        Raises:
+            Exception: If the database never answered yet
+        """
+        if self._value is None:
+            async with self._estimate_lock:
+                if self._value is None:
+                    await self._fetch_estimate()
+
+        self._revalidate_if_due()
+        return self._result()
+
+    async def _fetch_estimate(self):
+        from api.core.database import get_database_stats_estimate
+
+        try:
+            value = await run_io(get_database_stats_estimate)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+        self.estimates += 1
+        self._store(value, 'estimate')
+
+    def _revalidate_if_due(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return  # single flight
+        now = time.time()
+        if self._source == 'exact' and now - self._fetched_at < self.ttl:
+            return
+        if self.last_error is not None and now - self._attempted_at < min(RETRY_SECONDS, self.ttl):
+            return  # back off after a failure
+        self._attempted_at = now
+        self._refresh_task = asyncio.ensure_future(self._refresh_exact())
+
+    async def _refresh_exact(self):
+        from api.core.database import get_database_stats_async
+
+        started = time.perf_counter()
+        try:
+            value = await get_database_stats_async()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            logger.warning(f"⚠️  Database stats refresh failed, serving last value: {e}")
+            return
+        self.exact_refreshes += 1
+        self._store(value, 'exact')
+        logger.info(f"✓ Database stats refreshed ({time.perf_counter() - started:.2f}s)")
+
+    def _store(self, value: Dict, source: str):
+        self._value = value
+        self._source = source
+        self._fetched_at = time.time()
+        self.last_error = None
+
+    def _result(self) -> Dict:
+        age = time.time() - self._fetched_at
+        stale = self.last_error is not None or age > self.ttl
+        return {
+            **self._value,
+            'connection': 'degraded' if self.last_error is not None else self._value.get('connection', 'healthy'),
+            'source': self._source,
+            'age_seconds': round(age, 1),
+            'stale': stale
+        }
+
+    def get_stats(self) -> Dict:
+        """Provider metrics for health/monitoring endpoints"""
+        return {
+            'ttl_seconds': self.ttl,
+            'source': self._source,
+            'age_seconds': round(time.time() - self._fetched_at, 1) if self._value is not None else None,
+            'estimates': self.estimates,
+            'exact_refreshes': self.exact_refreshes,
+            'failures': self.failures,
+            'last_error': self.last_error
+        }
+
+
+# Global provider instance
+db_stats = DatabaseStatsProvider(ttl=settings.DB_STATS_TTL_SECONDS)
@@ -0,0 +1,495 @@
+"""
+Engine Snapshot
+Single-file bundle of MLEngine's initialized state for fast cold starts
+
+A snapshot holds everything the DB-backed loaders and model pickles would
+produce - champion stats, teammate synergy, item builds, champion encoders
+and the model arrays - so a fresh instance can start from one file read
+instead of several PostgreSQL queries and joblib loads.
+
+File layout (little-endian):
+    prefix   magic (8s) | format version (u32) | header length (u32) | sha256 (32s)
+    header   JSON: created_at, DB watermark, section table, model descriptions,
+             signatures of the model artifacts the models were loaded from
+    payload  JSON data section, then raw NumPy arrays (each 64-byte aligned)
+
+The sha256 covers everything after the prefix. Array sections are read
+straight out of a read-only mmap (np.frombuffer, no copy), so compiled
+forests share pages with the OS file cache.
+
+A model whose artifact (.pkl) changed since the snapshot was built - mtime
+and size differ, and so does the content hash - is not restored: it is
+loaded from the new file instead (a retrained model is never shadowed by
+the snapshot).
+
+Usage:
+    python -m api.services.engine_snapshot build [--output PATH]
+    python -m api.services.engine_snapshot info [PATH]
+"""
+
+import hashlib
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from api.core.logging import logger
+
+from compiled_forest import CompiledForest, check_parity, is_compilable
+from champion_registry import ChampionRegistry
+from champion_matchup_predictor import ChampionMatchupPredictor
+from win_prediction_model import WinPredictionModel
+from game_state_predictor import GameStatePredictor
+
+MAGIC = b'LOLENGSN'
+# Bump when the layout or the meaning of a section changes (old files are ignored)
+FORMAT_VERSION = 2
+PREFIX = struct.Struct('<8sII32s')
+ALIGNMENT = 64
+
+# MLEngine attributes stored in the snapshot
+DATA_COMPONENTS = ('champion_stats', 'item_builds', 'best_teammates')
+MODEL_COMPONENTS = ('champion_predictor', 'win_predictor', 'game_state_predictor')
+# Rebuilt from the data and the champion model's encoder on restore (cheap, not stored separately)
+DERIVED_COMPONENTS = ('champion_encoder', 'champion_registry')
+COMPONENTS = DATA_COMPONENTS + DERIVED_COMPONENTS + MODEL_COMPONENTS
+
+# CompiledForest arrays stored as raw sections
+FOREST_ARRAYS = ('feature', 'threshold', 'left', 'leaf_value', 'roots')
+
+
+class SnapshotError(Exception):
+    """Snapshot file is missing, corrupt or from an incompatible version"""
+    pass
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _json_default(value: Any):
+    """JSON encoder for DB/NumPy values (Decimal counts, timestamps, numpy scalars)"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def _export_model(name: str, model, compiled: Optional[CompiledForest], arrays: Dict[str, np.ndarray]) -> Dict:
+    """
+    Describe one model for the header, adding its arrays to `arrays`
+
+    Tree ensembles are stored as compiled forest arrays (parity-checked
+    here if the predictor did not compile them itself); anything else is
+    stored as a pickle blob.
+    """
+    if compiled is None and is_compilable(model):
+        try:
+            compiled = CompiledForest.from_sklearn(model)
+            check_parity(compiled, model)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"  {name}: not storing compiled forest ({e})")
+            compiled = None
+
+    if compiled is not None:
+        for field in FOREST_ARRAYS:
+            arrays[f'{name}.{field}'] = getattr(compiled, field)
+        return {
+            'kind': 'compiled_forest',
+            'max_depth': compiled.max_depth,
+            'n_features': compiled.n_features,
+            'classes': np.asarray(compiled.classes_).tolist()
+        }
+
+    arrays[f'{name}.pickle'] = np.frombuffer(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8)
+    return {'kind': 'pickle', 'model_type': type(model).__name__}
+
+
+def _export_predictor(name: str, predictor, arrays: Dict[str, np.ndarray]) -> Dict:
+    """Header entry for one predictor (model + the attributes its loader sets)"""
+    entry = {
+        'model': _export_model(name, predictor.model, getattr(predictor, 'compiled_model', None), arrays)
+    }
+
+    if name == 'champion_predictor':
+        # Encoders as pairs: JSON object keys would turn integer ids into strings
+        entry['champion_to_id'] = list(predictor.champion_to_id.items())
+        entry['id_to_champion'] = list(predictor.id_to_champion.items())
+    elif name == 'win_predictor':
+        entry['model_type'] = predictor.model_type
+    elif name == 'game_state_predictor':
+        entry['feature_names'] = list(predictor.feature_names)
+        entry['snapshot_time'] = predictor.snapshot_time
+        entry['metadata'] = predictor.metadata
+
+    return entry
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _export_artifacts(engine, name: str) -> Optional[list]:
+    """
+    Header entry for the artifact files a model was loaded from
+
+    One {path, mtime_ns, size, sha256} per MODEL_PATHS file (None if it
+    was missing). The hash is only taken if the file is still the one that
+    was loaded; None means no artifact signature is known.
+    """
+    loaded = engine.model_signatures.get(name)
+    if loaded is None:
+        return None
+    unchanged = engine.artifact_signature(name) == loaded
+    return [
+        None if signature is None else {
+            'path': path,
+            'mtime_ns': signature[0],
+            'size': signature[1],
+            'sha256': _file_sha256(path) if unchanged else None
+        }
+        for path, signature in zip(engine.MODEL_PATHS[name], loaded)
+    ]
+
+
+def write_snapshot(engine, path: str, watermark: Optional[Dict] = None) -> Dict:
+    """
+    Write the engine's loaded state to a snapshot file
+
+    The file is written next to the target and renamed into place, so
+    readers never see a partial snapshot.
+
+    Args:
+        engine: MLEngine with its components loaded
+        path: Output file
+        watermark: DB watermark the data was read at (see get_data_watermark)
+
+    Returns:
+        The snapshot header
+    """
+    data = {name: getattr(engine, name) for name in DATA_COMPONENTS if getattr(engine, name) is not None}
+
+    arrays: Dict[str, np.ndarray] = {}
+    models = {}
+    for name in MODEL_COMPONENTS:
+        predictor = getattr(engine, name)
+        if predictor is not None:
+            models[name] = _export_predictor(name, predictor, arrays)
+
+    data_blob = json.dumps(data, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+    # Section offsets are relative to the start of the payload
+    sections = {}
+    offset = _align(len(data_blob))
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        sections[name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        offset = _align(offset + array.nbytes)
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'watermark': watermark,
+        'components': sorted(list(data) + list(models)),
+        'data': {'offset': 0, 'length': len(data_blob)},
+        'arrays': sections,
+        'models': json.loads(json.dumps(models, default=_json_default)),
+        'artifacts': {name: _export_artifacts(engine, name) for name in models}
+    }
+    header_blob = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    payload_start = _align(PREFIX.size + len(header_blob))
+
+    body = io.BytesIO()
+    body.write(header_blob)
+    body.write(b'\0' * (payload_start - PREFIX.size - len(header_blob)))
+    body.write(data_blob)
+    for name, array in arrays.items():
+        body.write(b'\0' * (payload_start + sections[name]['offset'] - PREFIX.size - body.tell()))
+        body.write(array.tobytes())
+
+    body_bytes = body.getbuffer()
+    digest = hashlib.sha256(body_bytes).digest()
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(header_blob), digest))
+        f.write(body_bytes)
+    os.replace(tmp_path, path)
+
+    logger.info(f"✓ Engine snapshot written to {path} ({(PREFIX.size + len(body_bytes)) / 1e6:.1f} MB, "
+                f"components: {', '.join(header['components'])})")
+    return header
+
+
+# ============================================================================
+# LOAD
+# ============================================================================
+
+class EngineSnapshot:
+    """
+    Read-only view of a snapshot file
+
+    Array sections are zero-copy views into the file's mmap; the mapping
+    stays alive for as long as any of those arrays does.
+    """
+
+    def __init__(self, path: str, verify: bool = True):
+        self.path = str(path)
+
+        try:
+            with open(path, 'rb') as f:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot open snapshot {path}: {e}")
+
+        self.size = len(self._buffer)
+        if self.size < PREFIX.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+
+        magic, version, header_length, digest = PREFIX.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not an engine snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot format {version} (expected {FORMAT_VERSION})")
+
+        if verify and hashlib.sha256(memoryview(self._buffer)[PREFIX.size:]).digest() != digest:
+            raise SnapshotError(f"Snapshot {path} failed its checksum")
+
+        try:
+            self.header = json.loads(self._buffer[PREFIX.size:PREFIX.size + header_length])
+        except ValueError as e:
+            raise SnapshotError(f"Snapshot {path} has an unreadable header: {e}")
+
+        self.checksum = digest.hex()
+        self._payload_start = _align(PREFIX.size + header_length)
+
+    @property
+    def watermark(self) -> Optional[Dict]:
+        return self.header.get('watermark')
+
+    @property
+    def components(self) -> list:
+        return self.header.get('components', [])
+
+    def data(self) -> Dict:
+        """Decode the JSON data section (champion stats, item builds, teammates)"""
+        section = self.header['data']
+        start = self._payload_start + section['offset']
+        return json.loads(self._buffer[start:start + section['length']])
+
+    def array(self, name: str) -> np.ndarray:
+        """Zero-copy view of one array section"""
+        section = self.header['arrays'][name]
+        dtype = np.dtype(section['dtype'])
+        count = int(np.prod(section['shape'], dtype=np.int64))
+        array = np.frombuffer(self._buffer, dtype=dtype, count=count,
+                              offset=self._payload_start + section['offset'])
+        return array.reshape(section['shape'])
+
+    def _model(self, name: str):
+        """Rebuild one model; returns (model, compiled forest or None)"""
+        entry = self.header['models'][name]['model']
+
+        if entry['kind'] == 'compiled_forest':
+            compiled = CompiledForest(
+                **{field: self.array(f'{name}.{field}') for field in FOREST_ARRAYS},
+                max_depth=entry['max_depth'],
+                n_features=entry['n_features'],
+                classes=np.asarray(entry['classes'])
+            )
+            # The compiled forest also serves large batches (no sklearn object in the snapshot)
+            return compiled, compiled
+
+        return pickle.loads(self.array(f'{name}.pickle').tobytes()), None
+
+    def _current_artifacts(self, engine, name: str) -> Optional[tuple]:
+        """
+        Signature of a model's artifacts if they are still the ones it was built from
+
+        Returns None if any file changed. A file with a new mtime but the
+        same size and content (touched, copied by a deploy) still counts as
+        unchanged.
+        """
+        recorded = (self.header.get('artifacts') or {}).get(name)
+        paths = engine.MODEL_PATHS[name]
+        if recorded is None or len(recorded) != len(paths):
+            return None
+
+        current = engine.artifact_signature(name)
+        for path, now, then in zip(paths, current, recorded):
+            if now is None or then is None:
+                if now is not then:
+                    return None
+            elif now != (then['mtime_ns'], then['size']):
+                if now[1] != then['size'] or then['sha256'] is None or _file_sha256(path) != then['sha256']:
+                    return None
+        return current
+
+    def restore_into(self, engine) -> list:
+        """
+        Set the snapshot's components on an MLEngine
+
+        Returns:
+            Names of the restored components (models whose artifacts changed
+            since the snapshot was built are skipped)
+        """
+        restored = []
+        data = self.data()
+        for name in DATA_COMPONENTS:
+            if name in data:
+                setattr(engine, name, data[name])
+                restored.append(name)
+
+        models = {}
+        for name, entry in self.header['models'].items():
+            signature = self._current_artifacts(engine, name)
+            if signature is None:
+                logger.warning(f"⚠️  {name} artifact changed since the snapshot was built - "
+                               f"loading it from {engine.MODEL_PATHS[name][0]}")
+                continue
+            engine.model_signatures[name] = signature
+            models[name] = entry
+            restored.append(name)
+
+        if 'champion_predictor' in models:
+            # Encoder first: the registry is built with it and never modified afterwards
+            entry = models['champion_predictor']
+            engine.champion_encoder = dict(entry['champion_to_id'])
+            engine.champion_registry = ChampionRegistry.from_sources(
+                *(getattr(engine, name) for name in DATA_COMPONENTS), encoder=engine.champion_encoder
+            )
+
+            predictor = ChampionMatchupPredictor()
+            predictor.model, predictor.compiled_model = self._model('champion_predictor')
+            predictor.champion_to_id = engine.champion_encoder
+            predictor.id_to_champion = dict(entry['id_to_champion'])
+            predictor.champion_stats = engine.champion_stats or {}
+            predictor.attach_registry(engine.champion_registry)
+            engine.champion_predictor = predictor
+
+        if 'win_predictor' in models:
+            predictor = WinPredictionModel()
+            predictor.model, predictor.compiled_model = self._model('win_predictor')
+            predictor.model_type = models['win_predictor']['model_type']
+            engine.win_predictor = predictor
+
+        if 'game_state_predictor' in models:
+            entry = models['game_state_predictor']
+            predictor = GameStatePredictor()
+            predictor.model, predictor.compiled_model = self._model('game_state_predictor')
+            predictor.feature_names = entry['feature_names']
+            predictor.snapshot_time = entry['snapshot_time']
+            predictor.metadata = entry['metadata']
+            predictor.is_loaded = True
+            engine.game_state_predictor = predictor
+
+        if 'champion_predictor' in models:
+            restored.extend(DERIVED_COMPONENTS)
+        return restored
+
+
+def is_stale(snapshot_watermark: Optional[Dict], current_watermark: Optional[Dict]) -> Optional[bool]:
+    """
+    Compare a snapshot's DB watermark against the live one
+
+    Returns:
+        True/False, or None if either watermark is unknown
+    """
+    if not snapshot_watermark or not current_watermark:
+        return None
+    return snapshot_watermark != current_watermark
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def build(output: str) -> Dict:
+    """Load every component from the DB and model files, then snapshot it"""
+    import asyncio
+    from api.core.config import settings
+    from api.services.ml_engine import MLEngine
+
+    # Build from the real sources, never from an existing snapshot
+    settings.ENGINE_SNAPSHOT = False
+
+    # Read before loading: the loaders query on their own connections, so a
+    # watermark taken afterwards could cover matches ingested mid-load that
+    # the snapshot does not contain. Taken first, such matches make the
+    # snapshot look stale instead.
+    watermark = None
+    try:
+        from api.core.database import get_data_watermark
+        watermark = get_data_watermark()
+    except Exception as e:
+        logger.warning(f"⚠️  DB watermark unavailable, snapshot staleness cannot be checked: {e}")
+
+    engine = MLEngine()
+    asyncio.run(engine.load_all_models())
+    if not engine.champion_stats:
+        logger.warning("⚠️  Champion stats are empty - is the database reachable?")
+
+    return write_snapshot(engine, output, watermark=watermark)
+
+
+def info(path: str):
+    """Verify a snapshot and print its header and load time"""
+    from api.services.ml_engine import MLEngine
+
+    started = time.perf_counter()
+    snapshot = EngineSnapshot(path)
+    restored = snapshot.restore_into(MLEngine())
+    elapsed = time.perf_counter() - started
+
+    header = snapshot.header
+    print(f"{path}: format {header['format_version']}, {snapshot.size / 1e6:.1f} MB, sha256 {snapshot.checksum[:16]}…")
+    print(f"  created:    {header['created_at']}")
+    print(f"  watermark:  {header['watermark']}")
+    print(f"  components: {', '.join(snapshot.components)}")
+    for name, entry in header['models'].items():
+        state = 'restored' if name in restored else 'artifact changed, not restored'
+        print(f"  {name}: {entry['model']['kind']} ({state})")
+    print(f"  verified + restored in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    import argparse
+    from api.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Build or inspect an MLEngine snapshot")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Load all components and write a snapshot")
+    build_parser.add_argument('--output', default=settings.ENGINE_SNAPSHOT_PATH)
+    info_parser = subparsers.add_parser('info', help="Verify a snapshot and show its contents")
+    info_parser.add_argument('path', nargs='?', default=settings.ENGINE_SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build(args.output)
+    else:
+        info(args.path)
@@ -0,0 +1,168 @@
+"""
+Micro-batching inference dispatcher
+Merges concurrent single-row predictions into one batched model call
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, List, Optional
+
+from api.core.executors import BoundedExecutor, ExecutorSaturated
+from api.core.logging import logger
+from api.core.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+QUEUE_WAIT_MS_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250]
+
+
+class MicroBatcher:
+    """
+    Collects requests for one model and scores them together
+
+    The first request opens a batching window. Everything that arrives
+    within window_ms (or until max_batch_size requests are queued) is passed
+    to batch_fn as one list, and each result is handed back to the request
+    that submitted it.
+
+    If a batch call raises, the items are retried one by one (single_fn if
+    given) so a single bad input only fails its own request.
+
+    Model calls run on the given executor (inline if None), so the event
+    loop keeps accepting requests - and filling the next batch - meanwhile.
+    """
+
+    def __init__(self,
+                 name: str,
+                 batch_fn: Callable[[List[Any]], List[Any]],
+                 single_fn: Optional[Callable[[Any], Any]] = None,
+                 window_ms: float = 2.0,
+                 max_batch_size: int = 64,
+                 executor: Optional[BoundedExecutor] = None):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.single_fn = single_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_MS_BUCKETS)
+        self.batches = 0
+        self.errors = 0
+
+        self._queue: List[tuple] = []  # (item, future, enqueued_at)
+        self._pending: Optional[asyncio.Event] = None  # queue is non-empty
+        self._full: Optional[asyncio.Event] = None     # queue reached max_batch_size
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+
+        future = loop.create_future()
+        self._queue.append((item, future, time.perf_counter()))
+        self._pending.set()
+        if len(self._queue) >= self.max_batch_size:
+            self._full.set()
+
+        return await future
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop):
+        """Start the worker task on the current event loop (lazily)"""
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._pending = asyncio.Event()
+            self._full = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        """Worker loop: wait for a first item, hold the window open, flush"""
+        while True:
+            if not self._queue:
+                self._pending.clear()
+                await self._pending.wait()
+
+            # Batching window (cut short once max_batch_size is reached)
+            if len(self._queue) < self.max_batch_size and self.window > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.window)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch: List[tuple]):
+        """Score one batch and resolve its futures"""
+        started = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            self.queue_wait_ms.observe((started - enqueued_at) * 1000)
+        self.batch_sizes.observe(len(batch))
+        self.batches += 1
+
+        items = [item for item, _, _ in batch]
+        try:
+            results = list(await self._call(self.batch_fn, items))
+        except ExecutorSaturated as e:
+            # Retrying item by item would only hit the same full queue
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except Exception as e:
+            logger.warning(f"Batch call for {self.name} failed ({len(items)} items), retrying individually: {e}")
+            await self._flush_individually(batch)
+            return
+
+        if len(results) != len(batch):
+            # Rows cannot be matched to requests; fail them all rather than guess
+            self.errors += len(batch)
+            error = RuntimeError(f"Batch call for {self.name} returned {len(results)} results for {len(batch)} items")
+            logger.warning(str(error))
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _flush_individually(self, batch: List[tuple]):
+        """Fallback: score items one at a time so errors stay per-request"""
+        for item, future, _ in batch:
+            if future.done():
+                continue
+            try:
+                if self.single_fn is not None:
+                    result = await self._call(self.single_fn, item)
+                else:
+                    result = (await self._call(self.batch_fn, [item]))[0]
+            except Exception as e:
+                self.errors += 1
+                if not future.done():  # the caller may have been cancelled meanwhile
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(result)
+
+    async def _call(self, fn: Callable, arg: Any) -> Any:
+        """Run a model call on the executor (or inline without one)"""
+        if self.executor is None:
+            return fn(arg)
+        return await self.executor.run(fn, arg)
+
+    def get_stats(self) -> dict:
+        """Batching metrics for health/monitoring endpoints"""
+        return {
+            'window_ms': self.window * 1000,
+            'max_batch_size': self.max_batch_size,
+            'queued': len(self._queue),
+            'batches': self.batches,
+            'errors': self.errors,
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_wait_ms': self.queue_wait_ms.snapshot()
+        }
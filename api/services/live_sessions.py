@@ -0,0 +1,462 @@
+"""
+Live session store
+Compact state and incremental predictions for games pushed by remote agents
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.core.config import settings
+from api.core.logging import logger
+from api.core.metrics import Histogram
+from api.services.live_stream import STATE_PREDICTION_MIN_MINUTES, format_live_prediction
+from api.services.ml_engine import ml_engine
+from riot_live_client import OBJECTIVE_EVENTS
+
+MAX_PLAYERS = 10
+# Per-player columns, filled from allPlayers entries
+KILLS, DEATHS, ASSISTS, GOLD, LEVEL, VISION = range(6)
+SCORE_COLUMNS = (('kills', KILLS), ('deaths', DEATHS), ('assists', ASSISTS), ('wardScore', VISION))
+OBJECTIVES = tuple(dict.fromkeys(OBJECTIVE_EVENTS.values()))
+OBJECTIVE_INDEX = {event: OBJECTIVES.index(stat) for event, stat in OBJECTIVE_EVENTS.items()}
+TEAMS = ('ORDER', 'CHAOS')  # blue, red
+PUSH_MS_BUCKETS = [0.1, 0.5, 1, 2, 5, 10, 50, 100, 500]
+
+
+class SessionConflict(Exception):
+    """The push does not fit the stored session state (the agent should send a full snapshot)"""
+
+
+class SessionStoreFull(Exception):
+    """No free session slot"""
+
+
+def _sequence_number(payload: Dict, key: str) -> int:
+    value = payload.get(key)
+    if type(value) is not int or value < 0:
+        raise ValueError(f"{key} must be a non-negative integer")
+    return value
+
+
+class LiveSessionStore:
+    """
+    Live games pushed by agents, many per worker
+
+    RiotLiveClient can only poll the client on the API's own machine; here
+    an agent on each player's machine pushes its allgamedata instead:
+    - a full snapshot (PUT) starts or resynchronizes a session,
+    - diffs (PATCH, see live_session.snapshot_diff) carry only changed
+      player fields and new events.
+    Every push carries the agent's push sequence number (`seq`), a diff
+    also the number of the push it was computed against (`base_seq`). A
+    diff is only applied on top of exactly that push - if the session
+    holds any other (say the previous push went to another worker), the
+    diff is a conflict.
+
+    Sessions live in slots of preallocated arrays (per-player scores,
+    objective counters, event cursor, game time, last push); besides
+    these a slot keeps the lineup names and its last two prediction
+    results - no payloads. A push is parsed into copies of its slot's rows
+    first and only written back once all of it is valid, so a malformed
+    push changes nothing; all state changes happen on the event loop
+    between awaits, so no locks.
+
+    Predictions are incremental: the champion matchup once per lineup, the
+    game state only when the team totals changed since the last one, through
+    the engine's micro-batching dispatcher so concurrent sessions share
+    model calls. Sessions without a push for LIVE_SESSION_IDLE_SECONDS are
+    expired. State is per worker - agents must reach the same worker, and
+    re-send a full snapshot after a 409.
+    """
+
+    def __init__(self, engine, capacity: int, idle_seconds: float):
+        self.engine = engine
+        self.capacity = capacity
+        self.idle_seconds = idle_seconds
+
+        # Slot arrays (row order of a lineup: blue players first)
+        self.players = np.zeros((capacity, MAX_PLAYERS, 6), dtype=np.float32)
+        self.player_count = np.zeros(capacity, dtype=np.int8)
+        self.blue_count = np.zeros(capacity, dtype=np.int8)
+        self.objectives = np.zeros((capacity, len(TEAMS), len(OBJECTIVES)), dtype=np.int16)
+        self.event_cursor = np.full(capacity, -1, dtype=np.int32)
+        self.game_time = np.zeros(capacity, dtype=np.float32)
+        self.push_seq = np.zeros(capacity, dtype=np.int64)  # seq of the last applied push
+        self.last_push = np.zeros(capacity, dtype=np.float64)
+        self.in_use = np.zeros(capacity, dtype=bool)
+        self.generation = np.zeros(capacity, dtype=np.int64)  # bumped on reset, guards in-flight predictions
+        self.predicted_totals = np.full((capacity, len(TEAMS), 9), np.nan, dtype=np.float32)
+
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        self._session_ids: List[Optional[str]] = [None] * capacity
+        self._summoners: List[Tuple[str, ...]] = [()] * capacity
+        self._champions: List[Tuple[str, ...]] = [()] * capacity
+        self._champion_prediction: List[Optional[Dict]] = [None] * capacity
+        self._state_prediction: List[Optional[Dict]] = [None] * capacity
+
+        self._task: Optional[asyncio.Task] = None
+        self.full_pushes = 0
+        self.diff_pushes = 0
+        self.state_predictions = 0
+        self.unchanged = 0
+        self.conflicts = 0
+        self.rejected = 0
+        self.expired = 0
+        self.errors = 0
+        self.push_ms = Histogram(PUSH_MS_BUCKETS)
+
+    # ------------------------------------------------------------------
+    # Pushes
+    # ------------------------------------------------------------------
+
+    async def push(self, session_id: str, payload: Dict, full: bool) -> Dict:
+        """
+        Apply a full snapshot or a diff and update the predictions
+
+        Raises:
+            ValueError: Malformed payload
+            SessionConflict: Diff for an unknown session / lineup, against another base push,
+                or older than the session
+            SessionStoreFull: New session while every slot is in use
+        """
+        started = time.perf_counter()
+        if not isinstance(payload, dict):
+            raise ValueError("payload must be a JSON object")
+        try:
+            slot = self._apply_snapshot(session_id, payload) if full else self._apply_diff(session_id, payload)
+        except SessionConflict:
+            self.conflicts += 1
+            raise
+        except (TypeError, AttributeError) as e:
+            raise ValueError(f"malformed payload ({e})")
+
+        updated = await self._predict(slot)
+        self.push_ms.observe((time.perf_counter() - started) * 1000)
+
+        state = self._state_prediction[slot]
+        champion = self._champion_prediction[slot]
+        return {
+            'session_id': session_id,
+            'game_time': float(self.game_time[slot]),
+            'prediction_updated': updated,
+            'champion_matchup_blue_win_probability': champion['blue_win_probability'] if champion else None,
+            'game_state_blue_win_probability': state['blue_win_probability'] if state else None
+        }
+
+    def _apply_snapshot(self, session_id: str, payload: Dict) -> int:
+        players = [p for p in payload.get('allPlayers') or [] if p.get('team') in TEAMS]
+        if not players:
+            raise ValueError("allPlayers has no ORDER / CHAOS players")
+        if len(players) > MAX_PLAYERS:
+            raise ValueError(f"more than {MAX_PLAYERS} players")
+        players.sort(key=lambda p: TEAMS.index(p['team']))  # stable: blue first, client order kept
+        summoners = tuple(str(p.get('summonerName', '')) for p in players)
+        if len(set(summoners)) != len(summoners):
+            raise ValueError("summonerName must be unique")
+        game_time = float((payload.get('gameData') or {}).get('gameTime', 0))
+        seq = _sequence_number(payload, 'seq')
+
+        slot = self._slots.get(session_id)
+        # A new lineup or an earlier game time is the next game on the same session
+        new_game = slot is None or summoners != self._summoners[slot] or game_time < self.game_time[slot]
+        if new_game:
+            blue_count = sum(1 for p in players if p['team'] == TEAMS[0])
+            values = np.zeros(self.players.shape[1:], dtype=self.players.dtype)
+            objectives = np.zeros(self.objectives.shape[1:], dtype=self.objectives.dtype)
+            cursor = -1
+        else:
+            blue_count = int(self.blue_count[slot])
+            values, objectives = self.players[slot].copy(), self.objectives[slot].copy()
+            cursor = int(self.event_cursor[slot])
+        for row, player in enumerate(players):
+            self._parse_player(values[row], player)
+        cursor = self._count_events(objectives, cursor, summoners, blue_count,
+                                    (payload.get('events') or {}).get('Events') or [])
+
+        if slot is None:
+            slot = self._allocate(session_id)
+        elif new_game:
+            self._reset(slot)
+        if new_game:
+            self._summoners[slot] = summoners
+            self._champions[slot] = tuple(str(p.get('championName', '')) for p in players)
+            self.player_count[slot] = len(players)
+            self.blue_count[slot] = blue_count
+        self._commit(slot, values, objectives, cursor, game_time, seq)
+        self.full_pushes += 1
+        return slot
+
+    def _apply_diff(self, session_id: str, payload: Dict) -> int:
+        slot = self._slots.get(session_id)
+        if slot is None:
+            raise SessionConflict(f"Unknown live session {session_id}")
+        seq = _sequence_number(payload, 'seq')
+        base_seq = _sequence_number(payload, 'base_seq')
+        if base_seq != self.push_seq[slot]:
+            raise SessionConflict(f"Diff is based on push {base_seq}, session {session_id} is at push "
+                                  f"{int(self.push_seq[slot])}")
+        game_time = float((payload.get('gameData') or {}).get('gameTime', self.game_time[slot]))
+        if game_time < self.game_time[slot]:
+            raise SessionConflict("Diff is older than the session state")
+
+        summoners = self._summoners[slot]
+        values, objectives = self.players[slot].copy(), self.objectives[slot].copy()
+        for player in payload.get('allPlayers') or []:
+            try:
+                row = summoners.index(player.get('summonerName'))
+            except ValueError:
+                raise SessionConflict(f"Unknown summoner {player.get('summonerName')!r} in session {session_id}")
+            self._parse_player(values[row], player)
+        cursor = self._count_events(objectives, int(self.event_cursor[slot]), summoners,
+                                    int(self.blue_count[slot]),
+                                    (payload.get('events') or {}).get('Events') or [])
+
+        self._commit(slot, values, objectives, cursor, game_time, seq)
+        self.diff_pushes += 1
+        return slot
+
+    def _commit(self, slot: int, values: np.ndarray, objectives: np.ndarray, cursor: int,
+                game_time: float, seq: int):
+        """Write a fully parsed push into its slot"""
+        self.players[slot] = values
+        self.objectives[slot] = objectives
+        self.event_cursor[slot] = cursor
+        self.game_time[slot] = game_time
+        self.push_seq[slot] = seq
+        self.last_push[slot] = time.monotonic()
+
+    @staticmethod
+    def _parse_player(values: np.ndarray, player: Dict):
+        """Update one player row (a copy, see _commit) from an allPlayers entry"""
+        scores = player.get('scores') or {}
+        for key, column in SCORE_COLUMNS:
+            if key in scores:
+                values[column] = float(scores[key])
+        if 'currentGold' in player:
+            values[GOLD] = float(player['currentGold'])
+        if 'level' in player:
+            values[LEVEL] = float(player['level'])
+
+    @staticmethod
+    def _count_events(objectives: np.ndarray, cursor: int, summoners: Tuple[str, ...], blue_count: int,
+                      events: List[Dict]) -> int:
+        """
+        Count objectives of events after the cursor into objectives (a copy, see
+        _commit) as RiotLiveClient._process_events does; returns the new cursor
+        """
+        start = len(events)
+        while start > 0 and events[start - 1].get('EventID', start - 1) > cursor:
+            start -= 1
+        if start == len(events):
+            return cursor
+
+        for event in events[start:]:
+            objective = OBJECTIVE_INDEX.get(event.get('EventName', ''))
+            if objective is not None and event.get('KillerName') in summoners:
+                team = 0 if summoners.index(event['KillerName']) < blue_count else 1
+                objectives[team, objective] += 1
+        return max(cursor, int(events[-1].get('EventID', len(events) - 1)))
+
+    # ------------------------------------------------------------------
+    # Predictions
+    # ------------------------------------------------------------------
+
+    def _team_totals(self, slot: int) -> np.ndarray:
+        """Per team: kills, deaths, assists, gold, level, vision, then towers, dragons, barons"""
+        count, blue = int(self.player_count[slot]), int(self.blue_count[slot])
+        players = self.players[slot]
+        totals = np.empty((len(TEAMS), 9), dtype=np.float32)
+        totals[0, :6] = players[:blue].sum(axis=0)
+        totals[1, :6] = players[blue:count].sum(axis=0)
+        totals[:, 6:] = self.objectives[slot, :, :3]  # towers, dragons, barons (OBJECTIVES order)
+        return totals
+
+    def _pred_data(self, slot: int, totals: np.ndarray) -> Dict:
+        """Game state in the format of RiotLiveClient.format_for_prediction()"""
+        blue_count = int(self.blue_count[slot])
+        champions = self._champions[slot]
+        pred_data = {
+            'game_duration': int(self.game_time[slot] / 60),
+            'blue_champions': list(champions[:blue_count]),
+            'red_champions': list(champions[blue_count:])
+        }
+        for team, prefix in enumerate(('blue', 'red')):
+            kills, deaths, assists, gold, _, vision, towers, dragons, barons = totals[team].tolist()
+            pred_data.update({
+                f'{prefix}_kills': int(kills),
+                f'{prefix}_deaths': int(deaths),
+                f'{prefix}_assists': int(assists),
+                f'{prefix}_gold': round(gold, 1),
+                f'{prefix}_towers': int(towers),
+                f'{prefix}_dragons': int(dragons),
+                f'{prefix}_barons': int(barons),
+                f'{prefix}_vision_score': round(vision, 2)
+            })
+        return pred_data
+
+    async def _predict(self, slot: int) -> bool:
+        """Bring the slot's predictions up to date; True if the game state was predicted"""
+        generation = self.generation[slot]
+        totals = self._team_totals(slot)
+        pred_data = self._pred_data(slot, totals)
+
+        if self._champion_prediction[slot] is None:
+            try:
+                champion = await self.engine.predict_champion_matchup(
+                    blue_champions=pred_data['blue_champions'],
+                    red_champions=pred_data['red_champions']
+                )
+            except Exception as e:
+                # Retried with the next push; the game state prediction does not depend on it
+                self.errors += 1
+                logger.warning(f"⚠️  Live session champion prediction failed: {e}")
+                champion = None
+            if self.generation[slot] != generation:
+                return False
+            self._champion_prediction[slot] = champion
+
+        if pred_data['game_duration'] < STATE_PREDICTION_MIN_MINUTES:
+            return False
+        # Level is not a model input; the minute is
+        totals[:, 4] = pred_data['game_duration']
+        if np.array_equal(totals, self.predicted_totals[slot]):
+            self.unchanged += 1
+            return False
+
+        try:
+            state = await self.engine.predict_win(pred_data)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"⚠️  Live session game state prediction failed: {e}")
+            return False
+        if self.generation[slot] != generation:
+            return False
+        self._state_prediction[slot] = state
+        self.predicted_totals[slot] = totals
+        self.state_predictions += 1
+        return True
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        """Current prediction payload of a session (same shape as /api/live/predict), None if unknown"""
+        slot = self._slots.get(session_id)
+        if slot is None:
+            return None
+        await self._predict(slot)
+        if self._session_ids[slot] != session_id:
+            return None  # ended meanwhile
+        if self._champion_prediction[slot] is None:
+            raise RuntimeError("Champion matchup prediction unavailable")
+        prediction = format_live_prediction(
+            self._pred_data(slot, self._team_totals(slot)),
+            self._champion_prediction[slot],
+            self._state_prediction[slot]
+        )
+        prediction['session_id'] = session_id
+        prediction['idle_seconds'] = round(time.monotonic() - float(self.last_push[slot]), 1)
+        return prediction
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    def _allocate(self, session_id: str) -> int:
+        if not self._free:
+            self.expire()
+        if not self._free:
+            self.rejected += 1
+            raise SessionStoreFull(f"All {self.capacity} live session slots are in use")
+        slot = self._free.pop()
+        self._slots[session_id] = slot
+        self._session_ids[slot] = session_id
+        self.in_use[slot] = True
+        self._reset(slot)
+        return slot
+
+    def _reset(self, slot: int):
+        self.generation[slot] += 1
+        self.players[slot] = 0
+        self.player_count[slot] = 0
+        self.blue_count[slot] = 0
+        self.objectives[slot] = 0
+        self.event_cursor[slot] = -1
+        self.game_time[slot] = 0
+        self.push_seq[slot] = 0
+        self.predicted_totals[slot] = np.nan
+        self._summoners[slot] = ()
+        self._champions[slot] = ()
+        self._champion_prediction[slot] = None
+        self._state_prediction[slot] = None
+
+    def end(self, session_id: str) -> bool:
+        """Drop a session; False if it was unknown"""
+        slot = self._slots.pop(session_id, None)
+        if slot is None:
+            return False
+        self._reset(slot)
+        self._session_ids[slot] = None
+        self.in_use[slot] = False
+        self._free.append(slot)
+        return True
+
+    def expire(self) -> int:
+        """Drop sessions idle for longer than idle_seconds"""
+        idle = np.flatnonzero(self.in_use & (self.last_push < time.monotonic() - self.idle_seconds))
+        for slot in idle.tolist():
+            self.end(self._session_ids[slot])
+        self.expired += len(idle)
+        return len(idle)
+
+    def start(self):
+        """Start the idle session sweeper"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._sweep())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(max(min(self.idle_seconds / 2, 30), 1))
+            expired = self.expire()
+            if expired:
+                logger.info(f"✓ Expired {expired} idle live session(s), {len(self._slots)} active")
+
+    def get_stats(self) -> Dict:
+        """Store metrics for health/monitoring endpoints"""
+        state_bytes = sum(array.nbytes for array in (
+            self.players, self.player_count, self.blue_count, self.objectives, self.event_cursor,
+            self.game_time, self.push_seq, self.last_push, self.in_use, self.generation, self.predicted_totals
+        ))
+        return {
+            'active': len(self._slots),
+            'capacity': self.capacity,
+            'idle_seconds': self.idle_seconds,
+            'state_bytes': state_bytes,
+            'full_pushes': self.full_pushes,
+            'diff_pushes': self.diff_pushes,
+            'state_predictions': self.state_predictions,
+            'unchanged_states': self.unchanged,
+            'conflicts': self.conflicts,
+            'rejected': self.rejected,
+            'expired': self.expired,
+            'errors': self.errors,
+            'push_ms': self.push_ms.snapshot()
+        }
+
+
+# Global store instance (idle sessions are swept while the app runs)
+live_sessions = LiveSessionStore(
+    ml_engine,
+    capacity=settings.LIVE_SESSION_CAPACITY,
+    idle_seconds=settings.LIVE_SESSION_IDLE_SECONDS
+)
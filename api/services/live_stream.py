@@ -0,0 +1,339 @@
+"""
+Live game stream
+One shared poller of the local game client, fanned out to every subscriber
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Set
+
+from fastapi import HTTPException
+
+from api.core.config import settings
+from api.core.executors import run_io
+from api.core.logging import logger
+from api.core.metrics import Histogram
+from api.services.ml_engine import ml_engine
+
+PREDICTION_MS_BUCKETS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+# Replayed to new subscribers so they do not wait for the next change
+LATEST_EVENTS = ('status', 'active_player', 'prediction')
+# Game state predictions start once the game has progressed enough
+STATE_PREDICTION_MIN_MINUTES = 10
+
+
+class LiveGamePoller:
+    """
+    Background poller of the Riot live client, shared by all stream subscribers
+
+    The live client serves the one game running on this machine, so one
+    poller per process is one poller per game session. It runs while at
+    least one subscriber is connected and stops with the last one.
+
+    Two loops at separate rates:
+    - activeplayer (cheap, every LIVE_PLAYER_POLL_SECONDS): detects whether
+      a game is running and publishes the active player's state
+    - allgamedata (heavy, every LIVE_DATA_POLL_SECONDS, only while a game
+      is running): rebuilds the prediction input, and runs the predictors
+      only if that input changed since the last prediction
+
+    Events ('status', 'active_player', 'prediction', 'error') go to a
+    bounded queue per subscriber; a subscriber that falls behind loses its
+    oldest events rather than slowing the poller down. New subscribers
+    first receive the latest event of each kind.
+    """
+
+    def __init__(self, engine, data_interval: float, player_interval: float, queue_size: int = 16):
+        self.engine = engine
+        self.data_interval = data_interval
+        self.player_interval = player_interval
+        self.queue_size = queue_size
+
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._latest: Dict[str, Dict] = {}
+        self._running: Optional[bool] = None  # game running (None = not polled yet)
+        self._last_state: Optional[Dict] = None  # prediction input of the last prediction
+        self._sequence = 0
+
+        self.player_polls = 0
+        self.data_polls = 0
+        self.predictions = 0
+        self.unchanged = 0
+        self.dropped = 0
+        self.errors = 0
+        self.prediction_ms = Histogram(PREDICTION_MS_BUCKETS)
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def subscribe(self):
+        """
+        Receive events for the duration of the block
+
+        Usage:
+            async with live_poller.subscribe() as queue:
+                event = await queue.get()
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        for name in LATEST_EVENTS:
+            if name in self._latest:
+                queue.put_nowait(self._latest[name])
+        self._subscribers.add(queue)
+        self._start()
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+            if not self._subscribers:
+                await self.stop()
+
+    def _publish(self, name: str, data: Dict):
+        self._sequence += 1
+        event = {'id': self._sequence, 'event': name, 'data': data}
+        if name in LATEST_EVENTS:
+            self._latest[name] = event
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()  # drop the oldest event
+                self.dropped += 1
+            queue.put_nowait(event)
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def _start(self):
+        if not self._tasks:
+            self._tasks = [
+                asyncio.ensure_future(self._poll_player()),
+                asyncio.ensure_future(self._poll_game_data())
+            ]
+            logger.info(f"✓ Live game poller started (activeplayer every {self.player_interval:g}s, "
+                        f"allgamedata every {self.data_interval:g}s)")
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if tasks and not self._tasks:
+            # The next session starts from scratch
+            self._latest = {}
+            self._running = None
+            self._last_state = None
+            logger.info("✓ Live game poller stopped (no subscribers)")
+
+    async def _poll_player(self):
+        client = self.engine.riot_live_client
+        while True:
+            try:
+                active_player = await live_client_call(client, 'get_active_player')
+                # Spectated games have no active player
+                running = active_player is not None or await live_client_call(client, 'is_game_running')
+                self.player_polls += 1
+
+                if running != self._running:
+                    self._running = running
+                    if not running:
+                        self._last_state = None
+                    self._publish('status', {
+                        'is_running': running,
+                        'message': "Game is running" if running else "No game detected"
+                    })
+                if active_player is not None and active_player != self._latest.get('active_player', {}).get('data'):
+                    self._publish('active_player', active_player)
+            except Exception as e:
+                self._error(f"Live client poll failed: {e}")
+            await asyncio.sleep(self.player_interval)
+
+    async def _poll_game_data(self):
+        client = self.engine.riot_live_client
+        while True:
+            if not self._running:
+                # Wait for the activeplayer loop to see a game
+                await asyncio.sleep(min(self.player_interval, self.data_interval))
+                continue
+            try:
+                all_data = await live_client_call(client, 'get_all_game_data')
+                self.data_polls += 1
+                if all_data:
+                    await self._update(client.format_for_prediction(client.extract_team_data(all_data)))
+            except Exception as e:
+                self._error(f"Live prediction failed: {e}")
+            await asyncio.sleep(self.data_interval)
+
+    async def _update(self, pred_data: Dict):
+        """Predict and publish, unless the prediction input is unchanged"""
+        if pred_data == self._last_state:
+            self.unchanged += 1
+            return
+
+        started = time.perf_counter()
+        prediction = await build_live_prediction(self.engine, pred_data)
+        self.prediction_ms.observe((time.perf_counter() - started) * 1000)
+        self.predictions += 1
+        self._last_state = pred_data
+        self._publish('prediction', prediction)
+
+    def latest_prediction(self) -> Optional[Dict]:
+        """Current prediction while the poller runs and a game is in progress (else None)"""
+        if not self._tasks or not self._running or 'prediction' not in self._latest:
+            return None
+        return self._latest['prediction']['data']
+
+    def _error(self, message: str):
+        self.errors += 1
+        logger.warning(f"⚠️  {message}")
+        self._publish('error', {'detail': message})
+
+    def get_stats(self) -> Dict:
+        """Poller metrics for health/monitoring endpoints"""
+        recorder = getattr(self.engine.riot_live_client, 'recorder', None)
+        return {
+            'active': bool(self._tasks),
+            'subscribers': len(self._subscribers),
+            'game_running': self._running,
+            'player_poll_seconds': self.player_interval,
+            'data_poll_seconds': self.data_interval,
+            'player_polls': self.player_polls,
+            'data_polls': self.data_polls,
+            'predictions': self.predictions,
+            'unchanged_states': self.unchanged,
+            'dropped_events': self.dropped,
+            'errors': self.errors,
+            'prediction_ms': self.prediction_ms.snapshot(),
+            'recording': recorder.get_stats() if recorder is not None else None
+        }
+
+
+async def live_client_call(client, method: str):
+    """
+    Call a RiotLiveClient getter from async code
+
+    Uses the client's async transport when it has one (no thread held for
+    the request), else the sync method on the io executor.
+    """
+    if client.async_transport:
+        return await getattr(client, f"{method}_async")()
+    return await run_io(getattr(client, method))
+
+
+# ============================================================================
+# PREDICTION PAYLOAD (shared with /api/live/predict and /api/live/sessions)
+# ============================================================================
+
+async def build_live_prediction(engine, pred_data: Dict) -> Dict:
+    """
+    Live prediction response for one game state
+
+    Args:
+        engine: MLEngine with champion_predictor and win_predictor loaded
+        pred_data: Output of RiotLiveClient.format_for_prediction()
+    """
+    # Champion matchup prediction
+    champion_prediction = await engine.predict_champion_matchup(
+        blue_champions=pred_data['blue_champions'],
+        red_champions=pred_data['red_champions']
+    )
+
+    # Game state prediction (if game has progressed enough)
+    game_state_prediction = None
+    game_duration = pred_data['game_duration']
+
+    if game_duration >= STATE_PREDICTION_MIN_MINUTES:
+        try:
+            game_state_prediction = await engine.predict_win(pred_data)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.warning(f"Game state prediction failed: {e}")
+
+    return format_live_prediction(pred_data, champion_prediction, game_state_prediction)
+
+
+def format_live_prediction(pred_data: Dict, champion_prediction: Dict, game_state_prediction: Optional[Dict]) -> Dict:
+    """Response payload of /api/live/predict from a game state and its predictions"""
+    game_duration = pred_data['game_duration']
+    return {
+        "game_time": game_duration,
+        "game_time_formatted": f"{game_duration}:00",
+        "blue_team": {
+            "champions": pred_data['blue_champions'],
+            "kills": pred_data['blue_kills'],
+            "deaths": pred_data['blue_deaths'],
+            "gold": pred_data['blue_gold'],
+            "towers": pred_data['blue_towers']
+        },
+        "red_team": {
+            "champions": pred_data['red_champions'],
+            "kills": pred_data['red_kills'],
+            "deaths": pred_data['red_deaths'],
+            "gold": pred_data['red_gold'],
+            "towers": pred_data['red_towers']
+        },
+        "predictions": {
+            "champion_matchup": {
+                "blue_win_probability": champion_prediction['blue_win_probability'],
+                "red_win_probability": champion_prediction['red_win_probability'],
+                "confidence": champion_prediction['confidence']
+            },
+            "game_state": game_state_prediction if game_state_prediction else {
+                "message": "Game too early for state prediction (need 10+ minutes)",
+                "blue_win_probability": None,
+                "red_win_probability": None
+            }
+        },
+        "recommendation": _generate_live_recommendation(
+            pred_data,
+            champion_prediction,
+            game_state_prediction
+        )
+    }
+
+
+def _generate_live_recommendation(pred_data: Dict, champion_pred: Dict, state_pred: Optional[Dict]) -> str:
+    """Generate recommendation based on live game state"""
+
+    blue_champ_prob = champion_pred['blue_win_probability']
+    game_duration = pred_data['game_duration']
+
+    # Early game (< 15 min)
+    if game_duration < 15:
+        if blue_champ_prob > 0.55:
+            return "Strong early comp! Push your advantage and secure objectives."
+        elif blue_champ_prob < 0.45:
+            return "Play safe early game. Focus on farming and scaling."
+        else:
+            return "Even matchup. Focus on vision control and objective setup."
+
+    # Mid/Late game (15+ min) - use state prediction if available
+    if state_pred:
+        blue_state_prob = state_pred.get('blue_win_probability', 0.5)
+
+        gold_diff = pred_data['blue_gold'] - pred_data['red_gold']
+        tower_diff = pred_data['blue_towers'] - pred_data['red_towers']
+
+        if blue_state_prob > 0.65:
+            return f"You're ahead! (Gold: +{gold_diff:,}) Keep pressure and don't throw."
+        elif blue_state_prob < 0.35:
+            return f"Behind (Gold: {gold_diff:,}). Secure vision, catch enemies, stall for scaling."
+        else:
+            return "Close game! Next teamfight is critical. Ward objectives."
+
+    return "Monitor your progress and adjust strategy based on objectives."
+
+
+# Global poller instance (started by the first /api/live/stream subscriber)
+live_poller = LiveGamePoller(
+    ml_engine,
+    data_interval=settings.LIVE_DATA_POLL_SECONDS,
+    player_interval=settings.LIVE_PLAYER_POLL_SECONDS
+)
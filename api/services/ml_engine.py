@@ -3,21 +3,33 @@ ML Model Loading Service
 Handles loading and caching of all ML models and data
 """
 
+import asyncio
+import hashlib
 import json
+import os
+import time
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 
+from api.core.config import settings
+from api.core.executors import cpu_executor, run_cpu, run_io
 from api.core.logging import logger
+from api.services import engine_snapshot
+from api.services.champion_index import ChampionStatsIndex
+from api.services.inference_batcher import MicroBatcher
+from api.services.prediction_cache import PredictionCache, matchup_key, game_state_key
 
 # Import model classes from parent directory
 import sys
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
+from champion_registry import ChampionRegistry
 from champion_matchup_predictor import ChampionMatchupPredictor
 from win_prediction_model import WinPredictionModel
 from game_state_predictor import GameStatePredictor
 from intelligent_item_recommender import IntelligentItemRecommender
 from riot_live_client import RiotLiveClient
+from live_session import SessionRecorder
 from dynamic_build_generator import DynamicBuildGenerator
 
 
@@ -37,17 +49,296 @@ class MLEngine:
         self.champion_stats: Optional[Dict] = None
         self.item_builds: Optional[Dict] = None
         self.best_teammates: Optional[Dict] = None
+        self.champion_encoder: Optional[Dict[str, int]] = None  # champion model encoder (name -> Riot id)
+        self.champion_registry: Optional[ChampionRegistry] = None
+        self.champion_index: Optional[ChampionStatsIndex] = None
+
+        # Champion model read for its encoder (with its artifact signature), attached by the
+        # champion_predictor loader
+        self._champion_model: Optional[Tuple[Tuple, ChampionMatchupPredictor]] = None
+        # Model component -> signature of the artifacts the serving instance was built from
+        self.model_signatures: Dict[str, Tuple] = {}
 
         # Services
         self.item_recommender: Optional[IntelligentItemRecommender] = None
         self.riot_live_client: Optional[RiotLiveClient] = None
         self.build_generator: Optional[DynamicBuildGenerator] = None
 
+        # Lazy loading state (component name -> once-only load task / timing)
+        self._load_tasks: Dict[str, asyncio.Task] = {}
+        self._warm_up_started = False
+        self.load_timings: Dict[str, Dict] = {}
+        # Component name -> token derived from its content (response cache keys, see _component_version)
+        self.component_versions: Dict[str, str] = {}
+        self._content_hashes: Dict[str, Tuple[object, str]] = {}  # data component -> (object, hash)
+
+        # Snapshot the data/models were restored from (None = loaded from sources)
+        self.engine_snapshot: Optional[Dict] = None
+
+        # Inference dispatchers (one queue per model)
+        self.champion_batcher = MicroBatcher(
+            'champion_matchup',
+            batch_fn=lambda matchups: self.champion_predictor.predict_batch(matchups),
+            single_fn=lambda matchup: self.champion_predictor.predict(*matchup),
+            window_ms=settings.INFERENCE_BATCH_WINDOW_MS,
+            max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+            executor=cpu_executor
+        )
+        self.game_state_batcher = MicroBatcher(
+            'game_state',
+            batch_fn=lambda states: self.game_state_predictor.predict_batch(states),
+            single_fn=lambda state: self.game_state_predictor.predict(**state),
+            window_ms=settings.INFERENCE_BATCH_WINDOW_MS,
+            max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+            executor=cpu_executor
+        )
+        self.win_batcher = MicroBatcher(
+            'win',
+            batch_fn=lambda states: self.win_predictor.predict_batch(states),
+            single_fn=lambda state: self.win_predictor.predict(state),
+            window_ms=settings.INFERENCE_BATCH_WINDOW_MS,
+            max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+            executor=cpu_executor
+        )
+
+        # Prediction caches in front of the dispatchers
+        self.champion_cache = PredictionCache('champion_matchup', settings.PREDICTION_CACHE_SIZE)
+        self.game_state_cache = PredictionCache('game_state', settings.PREDICTION_CACHE_SIZE)
+
+    # Model component -> artifact files, in load preference order (watched for hot reload)
+    MODEL_PATHS: Dict[str, Tuple[str, ...]] = {
+        'champion_predictor': ('./models/champion_predictor.pkl',),
+        'win_predictor': ('./models/win_predictor_rf.pkl', './models/win_predictor_lr.pkl'),
+        'game_state_predictor': ('./models/game_state_predictor.pkl',),
+    }
+
+    # Component name -> components it needs loaded first
+    COMPONENT_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+        'champion_stats': (),
+        'item_builds': (),
+        'best_teammates': (),
+        'champion_encoder': (),
+        'champion_registry': ('champion_stats', 'item_builds', 'best_teammates', 'champion_encoder'),
+        'champion_index': ('champion_stats', 'champion_registry'),
+        'champion_predictor': ('champion_stats', 'champion_registry'),
+        'win_predictor': (),
+        'game_state_predictor': (),
+        'item_recommender': ('champion_stats', 'item_builds', 'champion_registry'),
+        'riot_live_client': (),
+        'build_generator': ('champion_stats', 'item_builds', 'champion_registry'),
+    }
+
     async def load_all_models(self):
-        """Load all ML models and data on startup"""
+        """Load all ML models and data (independent components in parallel)"""
         logger.info("🚀 Loading models...")
+        started = time.perf_counter()
+
+        await self.ensure_loaded(*self.COMPONENT_DEPENDENCIES)
+
+        logger.info(f"🎉 All models loaded in {time.perf_counter() - started:.2f}s")
+
+    async def ensure_loaded(self, *components: str):
+        """
+        Load components on first use
+
+        Each component is loaded at most once: concurrent callers await the
+        same load task. Dependencies are loaded first; independent
+        components load in parallel on the io executor.
+        """
+        await asyncio.gather(*(self._load_task(name) for name in components))
+
+    def _load_task(self, name: str) -> asyncio.Task:
+        """Get (or start) the once-only load task for a component"""
+        task = self._load_tasks.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._load_component(name))
+            self._load_tasks[name] = task
+        return task
+
+    async def _load_component(self, name: str):
+        """Wait for dependencies, then run the component's blocking loader"""
+        if getattr(self, name) is not None:
+            return  # Already loaded by preload() before the worker was forked
+
+        if name in engine_snapshot.COMPONENTS and self._snapshot_enabled():
+            await self._load_task('engine_snapshot')
+            if getattr(self, name) is not None:
+                self._mark_restored(name)
+                return
+
+        await self.ensure_loaded(*self.COMPONENT_DEPENDENCIES.get(name, ()))
+        await run_io(self._run_loader, name)
+
+        if name == 'engine_snapshot' and self.engine_snapshot is not None:
+            # Off the request path: a stale snapshot is still served, just flagged
+            asyncio.ensure_future(run_io(self._update_snapshot_staleness))
+
+    def _run_loader(self, name: str):
+        """Run one component's blocking loader and record its timing"""
+        loader = getattr(self, f'_load_{name}')
+        self.load_timings[name] = {'status': 'loading'}
+        started = time.perf_counter()
+        try:
+            loader()
+            status = 'loaded' if getattr(self, name) is not None else 'failed'
+        except Exception as e:
+            # Loaders log their own failures; this only guards unexpected errors
+            logger.error(f"❌ Failed to load {name}: {e}")
+            status = 'failed'
+
+        self.load_timings[name] = {
+            'status': status,
+            'seconds': round(time.perf_counter() - started, 4)
+        }
+        if status == 'loaded':
+            self.component_versions[name] = self._component_version(name)
+
+    def swap_components(self, **components):
+        """
+        Publish replacement components built off to the side (background refresh)
+
+        Each is swapped in with one attribute assignment, so readers see the
+        old or the new object, never a partly updated one. component_versions
+        are recomputed afterwards: replacements with other content invalidate
+        cached responses, identical content keeps them.
+        """
+        for name, value in components.items():
+            setattr(self, name, value)
+        for name in components:
+            self.component_versions[name] = self._component_version(name)
+
+    def _mark_restored(self, name: str):
+        """Record a component restored from the engine snapshot"""
+        self.load_timings[name] = {'status': 'snapshot', 'seconds': 0.0}
+        self.component_versions[name] = self._component_version(name)
+
+    # Components versioned by their data; models are versioned by their artifact files
+    CONTENT_VERSIONED = ('champion_stats', 'item_builds', 'best_teammates', 'champion_encoder')
+
+    def _component_version(self, name: str) -> str:
+        """
+        Version token of a component's current content
+
+        Derived from the data itself (CONTENT_VERSIONED), the signature of
+        the model files, and the versions of the components it is built from
+        (COMPONENT_DEPENDENCIES) - not from when or where it was loaded. Every
+        worker holding the same data and models computes the same token, so
+        a shared response cache backend serves hits across workers and
+        restarts, whether a component came from the snapshot, the database
+        or a refresh.
+        """
+        digest = hashlib.sha256(name.encode())
+        if name in self.CONTENT_VERSIONED:
+            digest.update(self._content_hash(name).encode())
+        elif name in self.MODEL_PATHS:
+            digest.update(repr(self.model_signatures.get(name)).encode())
+        for dependency in self.COMPONENT_DEPENDENCIES.get(name, ()):
+            digest.update(self._component_version(dependency).encode())
+        return digest.hexdigest()[:16]
+
+    def _content_hash(self, name: str) -> str:
+        """sha256 of a data component's JSON form (cached per published object)"""
+        value = getattr(self, name)
+        cached = self._content_hashes.get(name)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        try:
+            blob = json.dumps(value, sort_keys=True, default=str, separators=(',', ':'))
+        except TypeError:
+            blob = json.dumps(value, default=str, separators=(',', ':'))  # mixed key types
+        content = hashlib.sha256(blob.encode('utf-8')).hexdigest()
+        self._content_hashes[name] = (value, content)
+        return content
+
+    def preload(self):
+        """
+        Load every component synchronously in the calling thread
+
+        For pre-fork servers (see gunicorn.conf.py): called in the master
+        before any event loop or executor thread exists, so forked workers
+        inherit the loaded models and share their pages copy-on-write.
+        """
+        logger.info("🚀 Preloading models...")
+        started = time.perf_counter()
+
+        if self._snapshot_enabled():
+            self._run_loader('engine_snapshot')
+            if self.engine_snapshot is not None:
+                self._update_snapshot_staleness()
+
+        # COMPONENT_DEPENDENCIES is declared in dependency order
+        for name in self.COMPONENT_DEPENDENCIES:
+            if getattr(self, name) is not None:
+                self._mark_restored(name)
+            else:
+                self._run_loader(name)
+
+        logger.info(f"🎉 All models preloaded in {time.perf_counter() - started:.2f}s")
+
+    def _snapshot_enabled(self) -> bool:
+        return settings.ENGINE_SNAPSHOT and Path(settings.ENGINE_SNAPSHOT_PATH).exists()
+
+    def requires(self, *components: str):
+        """
+        FastAPI dependency that loads components before the handler runs
+
+        Usage:
+            @router.get("/...", dependencies=[Depends(ml_engine.requires('champion_stats'))])
+        """
+        async def dependency():
+            await self.ensure_loaded(*components)
+        return dependency
+
+    async def warm_up(self):
+        """Preload every component in the background (lazy mode)"""
+        if self._warm_up_started:
+            return
+        self._warm_up_started = True
+        try:
+            await self.load_all_models()
+        except Exception as e:
+            logger.error(f"❌ Background warm-up failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Component loaders (blocking - run on the io executor)
+    # ------------------------------------------------------------------
+
+    def _load_engine_snapshot(self):
+        """Engine snapshot (DB data + models in one file, no DB access)"""
+        try:
+            snapshot = engine_snapshot.EngineSnapshot(settings.ENGINE_SNAPSHOT_PATH)
+            restored = snapshot.restore_into(self)
+            self.engine_snapshot = {
+                'path': snapshot.path,
+                'created_at': snapshot.header.get('created_at'),
+                'sha256': snapshot.checksum,
+                'watermark': snapshot.watermark,
+                'components': restored,
+                'stale': None
+            }
+            logger.info(f"✓ Engine snapshot loaded from {snapshot.path} ({', '.join(restored)})")
+        except Exception as e:
+            logger.warning(f"⚠️  Engine snapshot unusable, loading from sources: {e}")
+
+    def _update_snapshot_staleness(self):
+        """Compare the snapshot's DB watermark with the live database"""
+        try:
+            from api.core.database import get_data_watermark
+            current = get_data_watermark()
+        except Exception as e:
+            logger.info(f"Snapshot staleness check skipped (DB unavailable): {e}")
+            return
+
+        stale = engine_snapshot.is_stale(self.engine_snapshot['watermark'], current)
+        self.engine_snapshot['stale'] = stale
+        self.engine_snapshot['current_watermark'] = current
+        if stale:
+            logger.warning(f"⚠️  Engine snapshot is stale (built at {self.engine_snapshot['watermark']}, "
+                           f"DB now at {current}) - rebuild it with "
+                           f"`python -m api.services.engine_snapshot build`")
 
-        # Champion Stats (from PostgreSQL) - LOAD FIRST (needed by other models)
+    def _load_champion_stats(self):
+        """Champion Stats (from PostgreSQL) - needed by other models"""
         try:
             from api.core.database import get_champion_stats
             self.champion_stats = get_champion_stats()
@@ -57,37 +348,138 @@ class MLEngine:
             logger.warning("⚠️  App will start but champion stats will be unavailable")
             self.champion_stats = {}  # Empty dict instead of failing
 
-        # Champion Matchup Predictor (needs champion_stats)
+    def _load_champion_encoder(self):
+        """Champion encoder (name -> Riot id) from the champion model artifact"""
+        try:
+            signature = self.artifact_signature('champion_predictor')
+            model = ChampionMatchupPredictor()
+            model.read_model(self.MODEL_PATHS['champion_predictor'][0])
+            self._champion_model = (signature, model)  # attached by _load_champion_predictor, not read twice
+            self.champion_encoder = model.champion_to_id
+            logger.info(f"✓ Champion Encoder loaded ({len(self.champion_encoder)} champions)")
+        except Exception as e:
+            logger.warning(f"⚠️  Champion encoder unavailable, id-keyed data keeps numeric names: {e}")
+            self.champion_encoder = {}
+
+    def _load_champion_registry(self):
+        """Champion Registry (every champion id / name / alias in the loaded data)"""
+        self.champion_registry = self.build_registry()
+        logger.info(f"✓ Champion Registry built ({len(self.champion_registry)} champions)")
+
+    def build_registry(self, champion_stats: Optional[Dict] = None, best_teammates: Optional[Dict] = None,
+                       encoder: Optional[Dict[str, int]] = None) -> ChampionRegistry:
+        """
+        Build a champion registry from the loaded data (not published)
+
+        The encoder links the DB's id-keyed data to champion names. A
+        published registry is never modified: hot reload and the data
+        refresher build a new one when they need other champions.
+        """
+        return ChampionRegistry.from_sources(
+            self.champion_stats if champion_stats is None else champion_stats,
+            self.item_builds,
+            self.best_teammates if best_teammates is None else best_teammates,
+            encoder=self.champion_encoder if encoder is None else encoder
+        )
+
+    def _load_champion_index(self):
+        """Champion Stats Index (columnar stats + precomputed sort orders for /api/champion-stats)"""
+        self.champion_index = ChampionStatsIndex(self.champion_stats or {}, self.champion_registry)
+        logger.info(f"✓ Champion Stats Index built ({self.champion_index.total} champions, "
+                    f"{len(self.champion_index.roles)} roles)")
+
+    def _load_champion_predictor(self):
+        """Champion Matchup Predictor (needs champion_stats and champion_registry)"""
         try:
-            self.champion_predictor = ChampionMatchupPredictor()
-            self.champion_predictor.load_model('./models/champion_predictor.pkl', champion_stats=self.champion_stats)
+            self.champion_predictor = self._build_served_model('champion_predictor')
             logger.info("✓ Champion Predictor loaded")
         except Exception as e:
             logger.error(f"❌ Failed to load Champion Predictor: {e}")
 
-        # Win Prediction Model (try RF, fallback to LR)
+    def _load_win_predictor(self):
+        """Win Prediction Model (try RF, fallback to LR)"""
+        try:
+            self.win_predictor = self._build_served_model('win_predictor')
+        except Exception as e:
+            logger.error(f"❌ Failed to load Win Predictor: {e}")
+
+    def _load_game_state_predictor(self):
+        """Game State Predictor (NEW - 79.28% accuracy with timeline data)"""
         try:
-            self.win_predictor = WinPredictionModel()
+            predictor = self._build_served_model('game_state_predictor')
+            self.game_state_predictor = predictor
+            logger.info(f"✓ Game State Predictor loaded (Accuracy: {predictor.metadata.get('accuracy', 0)*100:.2f}%)")
+        except Exception as e:
+            logger.error(f"❌ Failed to load Game State Predictor: {e}")
+
+    def _build_served_model(self, name: str):
+        """build_model for the loaders, recording the artifact signature it was built from"""
+        if name == 'champion_predictor' and self._champion_model is not None:
+            signature = self._champion_model[0]  # read by _load_champion_encoder
+        else:
+            signature = self.artifact_signature(name)
+        model = self.build_model(name)
+        self.model_signatures[name] = signature
+        return model
+
+    def artifact_signature(self, name: str) -> Tuple:
+        """(mtime_ns, size) of each of a model component's artifact files (None if missing)"""
+        signature = []
+        for path in self.MODEL_PATHS[name]:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def build_model(self, name: str):
+        """
+        Load a fresh instance of a model component from MODEL_PATHS (not published)
+
+        Used by the loaders above and by hot reload (api/services/model_reloader.py).
+
+        Raises:
+            Exception: If the artifact cannot be loaded
+        """
+        paths = self.MODEL_PATHS[name]
+
+        if name == 'champion_predictor':
+            stashed, self._champion_model = self._champion_model, None
+            if stashed is not None:
+                predictor = stashed[1]
+            else:
+                predictor = ChampionMatchupPredictor()
+                predictor.read_model(paths[0])
+            registry = self.champion_registry
+            if registry is None or not registry.covers(predictor.champion_to_id):
+                # Retrained with other champions: the published registry stays as it is
+                registry = self.build_registry(encoder=predictor.champion_to_id)
+            predictor.attach_data(paths[0], champion_stats=self.champion_stats, registry=registry)
+            return predictor
+
+        if name == 'win_predictor':
+            predictor = WinPredictionModel()
             # Try Random Forest first (best accuracy but large file)
             try:
-                self.win_predictor.load_model('./models/win_predictor_rf.pkl')
+                predictor.load_model(paths[0])
                 logger.info("✓ Win Predictor loaded (Random Forest)")
             except:
                 # Fallback to Linear Regression (smaller file, still good)
-                self.win_predictor.load_model('./models/win_predictor_lr.pkl')
+                predictor.load_model(paths[1])
                 logger.info("✓ Win Predictor loaded (Linear Regression - fallback)")
-        except Exception as e:
-            logger.error(f"❌ Failed to load Win Predictor: {e}")
+            return predictor
 
-        # Game State Predictor (NEW - 79.28% accuracy with timeline data)
-        try:
-            self.game_state_predictor = GameStatePredictor()
-            self.game_state_predictor.load_model('./models/game_state_predictor.pkl')
-            logger.info(f"✓ Game State Predictor loaded (Accuracy: {self.game_state_predictor.metadata.get('accuracy', 0)*100:.2f}%)")
-        except Exception as e:
-            logger.error(f"❌ Failed to load Game State Predictor: {e}")
+        if name == 'game_state_predictor':
+            predictor = GameStatePredictor()
+            if not predictor.load_model(paths[0]):
+                raise RuntimeError(f"Failed to load {paths[0]}")  # load_model logged the cause
+            return predictor
+
+        raise ValueError(f"Not a model component: {name}")
 
-        # Item Builds (from PostgreSQL)
+    def _load_item_builds(self):
+        """Item Builds (from PostgreSQL)"""
         try:
             from api.core.database import get_item_builds
             self.item_builds = get_item_builds()
@@ -98,18 +490,21 @@ class MLEngine:
         except Exception as e:
             logger.warning(f"⚠️  Item builds not available: {e}")
 
-        # Intelligent Item Recommender (needs champion_stats and item_builds)
+    def _load_item_recommender(self):
+        """Intelligent Item Recommender (needs champion_stats and item_builds)"""
         try:
             self.item_recommender = IntelligentItemRecommender(
                 data_dir='./data/champion_data',
                 champion_stats=self.champion_stats,
-                item_builds=self.item_builds
+                item_builds=self.item_builds,
+                registry=self.champion_registry
             )
             logger.info("✓ Intelligent Item Recommender loaded")
         except Exception as e:
             logger.error(f"❌ Failed to load Intelligent Item Recommender: {e}")
 
-        # Best Teammates (from PostgreSQL)
+    def _load_best_teammates(self):
+        """Best Teammates (from PostgreSQL)"""
         try:
             from api.core.database import get_best_teammates
             self.best_teammates = get_best_teammates()
@@ -118,25 +513,116 @@ class MLEngine:
             logger.error(f"❌ Failed to load Best Teammates from DB: {e}")
             self.best_teammates = {}  # Empty fallback (non-critical feature)
 
-        # Riot Live Client
+    def _load_riot_live_client(self):
+        """Riot Live Client"""
         try:
-            self.riot_live_client = RiotLiveClient()
-            logger.info("✓ Riot Live Client initialized")
+            self.riot_live_client = RiotLiveClient(
+                base_url=settings.LIVE_CLIENT_URL,
+                async_transport=settings.LIVE_CLIENT_ASYNC
+            )
+            transport = "async" if self.riot_live_client.async_transport else "sync"
+            logger.info(f"✓ Riot Live Client initialized ({self.riot_live_client.base_url}, {transport} transport)")
+            if settings.LIVE_RECORD_DIR:
+                self.riot_live_client.recorder = SessionRecorder(settings.LIVE_RECORD_DIR)
+                logger.info(f"✓ Recording live sessions to {settings.LIVE_RECORD_DIR}")
         except Exception as e:
             logger.error(f"❌ Failed to initialize Riot Live Client: {e}")
 
-        # Dynamic Build Generator (needs champion_stats and item_builds)
+    def _load_build_generator(self):
+        """Dynamic Build Generator (needs champion_stats, item_builds and the registry)"""
         try:
             self.build_generator = DynamicBuildGenerator(
                 data_dir='./data/champion_data',
                 champion_stats=self.champion_stats,
-                item_builds=self.item_builds
+                item_builds=self.item_builds,
+                registry=self.champion_registry
             )
             logger.info("✓ Dynamic Build Generator initialized")
         except Exception as e:
             logger.error(f"❌ Failed to initialize Build Generator: {e}")
 
-        logger.info("🎉 All models loaded successfully!")
+    async def predict_champion_matchup(self, blue_champions: List[str], red_champions: List[str]) -> Dict:
+        """
+        Champion matchup prediction through the cache and the micro-batching dispatcher
+
+        Same result as champion_predictor.predict(); concurrent calls are
+        merged into one predict_batch() call. With PREDICTION_CACHE, drafts
+        are keyed by their resolved champions in pick order (the model is
+        positional); the prediction always runs on the caller's draft.
+        """
+        predictor = self.champion_predictor
+        key = matchup_key(predictor.registry, blue_champions, red_champions) if settings.PREDICTION_CACHE else None
+
+        if key is not None:
+            cached = self.champion_cache.get(key, predictor.version)
+            if cached is not None:
+                return cached
+
+        if not settings.INFERENCE_BATCHING:
+            result = await run_cpu(predictor.predict, blue_champions, red_champions)
+        else:
+            result = await self.champion_batcher.submit((blue_champions, red_champions))
+
+        if key is not None:
+            self.champion_cache.put(key, result, predictor.version)
+        return result
+
+    async def predict_game_state(self, game_state: Dict) -> Dict:
+        """
+        Game state prediction through the cache and the micro-batching dispatcher
+
+        With PREDICTION_CACHE, the cache key snaps gold/xp/cs to the
+        prediction_cache.GAME_STATE_STEPS grid, so near-identical states
+        share one cached result; a miss predicts the unquantized state.
+
+        Args:
+            game_state: Keyword arguments for game_state_predictor.predict()
+        """
+        predictor = self.game_state_predictor
+        key = None
+
+        if settings.PREDICTION_CACHE:
+            key = game_state_key(game_state)
+            cached = self.game_state_cache.get(key, predictor.version)
+            if cached is not None:
+                return cached
+
+        if not settings.INFERENCE_BATCHING:
+            result = await run_cpu(predictor.predict, **game_state)
+        else:
+            result = await self.game_state_batcher.submit(game_state)
+
+        if key is not None:
+            self.game_state_cache.put(key, result, predictor.version)
+        return result
+
+    async def predict_win(self, game_state: Dict) -> Dict:
+        """
+        Live win prediction through the micro-batching dispatcher
+
+        Same result as win_predictor.predict(); live games send continuous
+        gold values, so there is no cache in front of it.
+
+        Args:
+            game_state: Team totals as returned by RiotLiveClient.format_for_prediction()
+        """
+        if not settings.INFERENCE_BATCHING:
+            return await run_cpu(self.win_predictor.predict, game_state)
+        return await self.win_batcher.submit(game_state)
+
+    def get_inference_stats(self) -> Dict:
+        """Batch-size / queue-wait histograms per model queue and prediction cache counters"""
+        return {
+            "batching_enabled": settings.INFERENCE_BATCHING,
+            "champion_matchup": self.champion_batcher.get_stats(),
+            "game_state": self.game_state_batcher.get_stats(),
+            "win": self.win_batcher.get_stats(),
+            "prediction_cache": {
+                "enabled": settings.PREDICTION_CACHE,
+                "champion_matchup": self.champion_cache.get_stats(),
+                "game_state": self.game_state_cache.get_stats()
+            }
+        }
 
     def get_health_status(self) -> Dict:
         """Get health status of all loaded models"""
@@ -147,7 +633,9 @@ class MLEngine:
             "champion_stats": self.champion_stats is not None,
             "item_builds": self.item_builds is not None,
             "item_recommender": self.item_recommender is not None,
-            "best_teammates": self.best_teammates is not None
+            "best_teammates": self.best_teammates is not None,
+            "load_timings": dict(self.load_timings),
+            "engine_snapshot": self.engine_snapshot
         }
 
 
@@ -0,0 +1,232 @@
+"""
+Model hot reload
+Picks up retrained model artifacts without restarting the API
+"""
+
+import asyncio
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from api.core.config import settings
+from api.core.executors import run_io
+from api.core.logging import logger
+from api.services.ml_engine import ml_engine
+
+# Fixture game states (both model input formats share the keys they need)
+_EVEN_STATE = {
+    'blue_gold': 40000, 'red_gold': 40000, 'blue_xp': 45000, 'red_xp': 45000,
+    'blue_level': 50, 'red_level': 50, 'blue_cs': 700, 'red_cs': 700,
+    'blue_kills': 15, 'red_kills': 15, 'blue_dragons': 2, 'red_dragons': 2,
+    'blue_barons': 0, 'red_barons': 0, 'blue_towers': 3, 'red_towers': 3,
+}
+_BLUE_AHEAD_STATE = dict(_EVEN_STATE, blue_gold=48000, blue_xp=52000, blue_level=56, blue_cs=800,
+                         blue_kills=25, red_kills=8, blue_dragons=4, red_dragons=0, blue_towers=7, red_towers=1)
+_RED_AHEAD_STATE = {
+    (f"red_{key[5:]}" if key.startswith('blue_') else f"blue_{key[4:]}"): value
+    for key, value in _BLUE_AHEAD_STATE.items()
+}
+_WIN_MODEL_EXTRAS = {'game_duration': 25, 'blue_deaths': 15, 'red_deaths': 15, 'blue_assists': 30,
+                     'red_assists': 30, 'blue_vision_score': 60, 'red_vision_score': 60}
+
+
+class ReloadError(RuntimeError):
+    """A new model failed to load or validate (the old one keeps serving)"""
+
+
+class ModelReloader:
+    """
+    Hot reload of model components (MLEngine.MODEL_PATHS)
+
+    A reload builds a fresh instance beside the live one (including its
+    compiled forest), warms it and validates it on a small fixture set:
+    finite probabilities in [0, 1] summing to 1, batch and single
+    predictions agreeing, and - for game state models - a blue-ahead state
+    scoring above its mirror. Only then is it published with one reference
+    swap (MLEngine.swap_components). Requests already running keep the
+    object they dereferenced, so they finish on the old model; a failed
+    reload leaves the old model serving.
+
+    Triggers:
+    - a poller (MODEL_RELOAD_POLL_SECONDS, 0 = off) watching the artifact
+      files; a file that differs from the one the serving model was built
+      from (MLEngine.model_signatures - for a model restored from the engine
+      snapshot, the artifact the snapshot was built from) is reloaded once it
+      has stopped changing for a full poll interval, so half-written pickles
+      are never read
+    - POST /api/admin/reload-models (only reloads the worker serving it -
+      multi-worker deployments should rely on the poller)
+
+    Reloads run one at a time on the io executor.
+    """
+
+    def __init__(self, engine, poll_interval: float):
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        # Component -> artifact signature of the last failed reload, and a pending change
+        self._failed: Dict[str, Tuple] = {}
+        self._pending: Dict[str, Tuple] = {}
+
+        self.reloads = 0
+        self.failures = 0
+        self.history: List[Dict] = []  # most recent last
+
+    # ------------------------------------------------------------------
+    # Watching
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the poller (if enabled)"""
+        if self.poll_interval > 0 and self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+            logger.info(f"✓ Model file watcher started (every {self.poll_interval:g}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for name in self._changed():
+                try:
+                    await self.reload([name], trigger='watch')
+                except ReloadError:
+                    pass  # logged and recorded; the old model keeps serving
+
+    def _changed(self) -> List[str]:
+        """Components whose artifacts changed and have been stable for one poll"""
+        ready = []
+        for name in self.engine.MODEL_PATHS:
+            if getattr(self.engine, name) is None:
+                continue  # not loaded (yet): nothing to replace
+            signature = self.engine.artifact_signature(name)
+            if signature in (self.engine.model_signatures.get(name), self._failed.get(name)):
+                self._pending.pop(name, None)
+            elif self._pending.get(name) == signature:
+                ready.append(name)
+            else:
+                self._pending[name] = signature  # still being written, or just appeared
+        return ready
+
+    # ------------------------------------------------------------------
+    # Reloading
+    # ------------------------------------------------------------------
+
+    async def reload(self, components: Optional[Iterable[str]] = None, trigger: str = 'manual') -> List[Dict]:
+        """
+        Reload model components (default: all), one after another
+
+        Returns:
+            One result dict per component
+
+        Raises:
+            ValueError: If a component is not a model component
+            ReloadError: If any component failed (after trying all of them)
+        """
+        names = list(components) if components else list(self.engine.MODEL_PATHS)
+        unknown = [name for name in names if name not in self.engine.MODEL_PATHS]
+        if unknown:
+            raise ValueError(f"Unknown model components {unknown}; expected some of {list(self.engine.MODEL_PATHS)}")
+
+        results = [await run_io(self._reload_one, name, trigger) for name in names]
+        failed = [result for result in results if result['status'] == 'failed']
+        if failed:
+            raise ReloadError("; ".join(f"{result['component']}: {result['error']}" for result in failed))
+        return results
+
+    def _reload_one(self, name: str, trigger: str) -> Dict:
+        """Build, warm, validate and publish one component (blocking)"""
+        with self._lock:
+            signature = self.engine.artifact_signature(name)
+            started = time.perf_counter()
+            result = {'component': name, 'trigger': trigger, 'at': time.time()}
+            try:
+                model = self.engine.build_model(name)
+                checks = self._validate(name, model)
+            except Exception as e:
+                self.failures += 1
+                result.update(status='failed', error=str(e),
+                              seconds=round(time.perf_counter() - started, 3))
+                logger.error(f"❌ Reload of {name} failed, keeping the current model: {e}")
+                # A failed artifact is not retried until it changes again
+                self._failed[name] = signature
+            else:
+                replacements = {name: model}
+                if name == 'champion_predictor' and model.registry is not self.engine.champion_registry:
+                    # Retrained with other champions: publish the registry built for it
+                    replacements.update(champion_encoder=model.champion_to_id, champion_registry=model.registry)
+                self.engine.model_signatures[name] = signature  # before the swap: versions derive from it
+                self.engine.swap_components(**replacements)
+                self._failed.pop(name, None)
+                self.reloads += 1
+                result.update(status='reloaded', checks=checks,
+                              seconds=round(time.perf_counter() - started, 3))
+                logger.info(f"✓ {name} reloaded ({checks} fixture checks, {result['seconds']}s)")
+
+            self._pending.pop(name, None)
+            self.history = (self.history + [result])[-20:]
+            return result
+
+    def _validate(self, name: str, model) -> int:
+        """
+        Run the fixture set through a new model (also warms it up)
+
+        Returns:
+            Number of predictions checked
+
+        Raises:
+            ReloadError: On the first failed check
+        """
+        if name == 'champion_predictor':
+            champions = sorted(model.champion_to_id)[:10]
+            if len(champions) < 10:
+                raise ReloadError(f"Encoder knows only {len(champions)} champions")
+            cases = [(champions[:5], champions[5:]), (champions[5:], champions[:5]),
+                     (champions[:1], champions[5:6])]
+            single = [model.predict(blue, red) for blue, red in cases]
+            batch = model.predict_batch(cases)
+        elif name == 'game_state_predictor':
+            cases = [_EVEN_STATE, _BLUE_AHEAD_STATE, _RED_AHEAD_STATE]
+            single = [model.predict(**state) for state in cases]
+            batch = model.predict_batch(cases)
+        else:
+            cases = [dict(state, **_WIN_MODEL_EXTRAS) for state in (_EVEN_STATE, _BLUE_AHEAD_STATE, _RED_AHEAD_STATE)]
+            single = [model.predict(state) for state in cases]
+            batch = model.predict_batch(cases)
+
+        for one, batched in zip(single, batch):
+            if 'error' in one:
+                raise ReloadError(f"Fixture prediction failed: {one['error']}")
+            blue, red = one['blue_win_probability'], one['red_win_probability']
+            if not (math.isfinite(blue) and 0.0 <= blue <= 1.0 and abs(blue + red - 1.0) < 1e-3):
+                raise ReloadError(f"Invalid probabilities: blue={blue}, red={red}")
+            if abs(blue - batched['blue_win_probability']) > 1e-3:
+                raise ReloadError(f"Batch and single predictions disagree: {batched['blue_win_probability']} vs {blue}")
+
+        if name != 'champion_predictor' and single[1]['blue_win_probability'] <= single[2]['blue_win_probability']:
+            raise ReloadError("Blue-ahead fixture does not score above its mirror")
+        return len(single) + len(batch)
+
+    def get_stats(self) -> Dict:
+        """Reload metrics for health/monitoring endpoints"""
+        return {
+            'watching': self._task is not None,
+            'poll_interval_seconds': self.poll_interval,
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'last': self.history[-1] if self.history else None
+        }
+
+
+# Global reloader instance (started by the app lifespan)
+model_reloader = ModelReloader(ml_engine, poll_interval=settings.MODEL_RELOAD_POLL_SECONDS)
@@ -0,0 +1,133 @@
+"""
+Prediction cache
+Memoizes champion matchup and game state predictions by canonical input
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+# Game state quantization grid (field suffix -> step). Cache keys are snapped
+# to the grid, so every state in one cell shares one cached result.
+GAME_STATE_STEPS = {
+    'gold': 100,
+    'xp': 100,
+    'cs': 5,
+}
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction results
+
+    Entries belong to a model version (the predictors' `version`, renewed
+    from a process-wide counter on every load). The first lookup with a
+    newer version drops every entry, so reloading a model or
+    champion_stats invalidates the cache without any explicit call;
+    results from a replaced model are not stored.
+
+    Thread-safe; get()/put() are O(1).
+    """
+
+    def __init__(self, name: str, max_entries: int):
+        self.name = name
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._entries: 'OrderedDict[Hashable, Dict]' = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[Dict]:
+        """Cached result (a deep copy - results hold nested dicts) or None"""
+        with self._lock:
+            self._check_version(version)
+            result = self._entries.get(key) if version == self._version else None
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, key: Hashable, result: Dict, version: int):
+        """Store a result computed with the given model version"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            if version != self._version:
+                return  # computed with a model that has since been replaced
+            self._entries[key] = copy.deepcopy(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry"""
+        with self._lock:
+            self._clear()
+
+    def _check_version(self, version: int):
+        """Move to a newer model version (older versions are never cached again)"""
+        if self._version is None or version > self._version:
+            self._clear()
+            self._version = version
+
+    def _clear(self):
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Cache metrics for health/monitoring endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+def matchup_key(registry, blue_champions: Iterable[str],
+                red_champions: Iterable[str]) -> Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    """
+    Key of a draft: registry indices per team, in pick order
+
+    The matchup model is positional (blue_champ_0..4), so the order is part
+    of the key; only spelling/aliases are canonicalized. Returns None if a
+    champion cannot be resolved (the prediction itself then reports the
+    error).
+    """
+    teams = []
+    for champions in (blue_champions, red_champions):
+        indices = tuple(registry.resolve(champion) for champion in champions)
+        if any(index is None for index in indices):
+            return None
+        teams.append(indices)
+    return teams[0], teams[1]
+
+
+def quantize_game_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Snap a game state to the GAME_STATE_STEPS grid (other fields unchanged)"""
+    quantized = {}
+    for field, value in state.items():
+        step = GAME_STATE_STEPS.get(field.rsplit('_', 1)[-1])
+        quantized[field] = int(round(value / step) * step) if step and value is not None else value
+    return quantized
+
+
+def game_state_key(state: Dict[str, Any]) -> Tuple:
+    """Key of a game state, snapped to the GAME_STATE_STEPS grid"""
+    return tuple(sorted(quantize_game_state(state).items()))
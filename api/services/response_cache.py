@@ -0,0 +1,274 @@
+"""
+HTTP response cache
+Serves repeated GETs of data-derived routes from a cache, with ETag / 304
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from api.core.config import settings
+from api.core.executors import run_io
+from api.core.logging import logger
+from api.services.ml_engine import ml_engine
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class MemoryBackend:
+    """In-process LRU (per worker)"""
+
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    SQLite file shared by every worker on the host
+
+    WAL mode lets workers read while one writes; each thread keeps its own
+    connection. Expired rows are purged, and the table trimmed to
+    max_entries (oldest first), every PURGE_EVERY writes.
+    """
+
+    blocking = True
+    PURGE_EVERY = 64
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Not kept: this may run in a pre-fork master, and connections must not cross fork()
+        conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, stored_at REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        row = self._connection().execute(
+            "SELECT body, etag, expires_at FROM responses WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        return CachedResponse(bytes(row[0]), row[1], row[2]) if row else None
+
+    def set(self, key: str, entry: CachedResponse):
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, etag, expires_at, stored_at) VALUES (?, ?, ?, ?, ?)",
+            (key, entry.body, entry.etag, entry.expires_at, time.time())
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        self._connection().execute("DELETE FROM responses")
+
+    def size(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Route-level response cache
+
+    Usage:
+        @router.get("/champions/list")
+        @response_cache.cached(ttl=300, depends_on=('champion_stats', 'champion_registry'))
+        async def get_champions_list(request: Request): ...
+
+    The key is the route path plus the endpoint's bound arguments (query
+    and path parameters after FastAPI's parsing, defaults filled in), so
+    "?limit=050&sort_by=games" and "?sort_by=games&limit=50" share an entry.
+    It also contains the content version of every MLEngine component the
+    route depends on (MLEngine.component_versions - derived from the data
+    and model files, so the same in every worker): a reload or refresh that
+    changes one makes its old entries unreachable.
+
+    Responses carry a strong ETag (hash of the body); a matching
+    If-None-Match is answered with 304 without sending the body.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    def cached(self, ttl: float, depends_on: Tuple[str, ...] = ()):
+        """Decorator for GET endpoints (they need a `request: Request` parameter)"""
+        def decorator(endpoint: Callable):
+            signature = inspect.signature(endpoint)
+
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                request: Request = kwargs['request']
+                if not settings.RESPONSE_CACHE:
+                    return await endpoint(*args, **kwargs)
+
+                bound = signature.bind_partial(*args, **kwargs)
+                bound.apply_defaults()
+                params = sorted((name, value) for name, value in bound.arguments.items() if name != 'request')
+                versions = [(name, ml_engine.component_versions.get(name)) for name in depends_on]
+                key = json.dumps([request.scope['route'].path, params, versions], default=str)
+
+                entry = await self._get(key)
+                if entry is not None:
+                    self.hits += 1
+                    return self._respond(request, entry, ttl)
+
+                self.misses += 1
+                result = await endpoint(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result  # already a response (e.g. an error); not cached
+
+                body = json.dumps(jsonable_encoder(result), separators=(',', ':')).encode()
+                entry = CachedResponse(
+                    body=body,
+                    etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+                    expires_at=time.time() + ttl
+                )
+                await self._set(key, entry)
+                return self._respond(request, entry, ttl)
+
+            return wrapper
+        return decorator
+
+    def _respond(self, request: Request, entry: CachedResponse, ttl: float) -> Response:
+        remaining = max(int(entry.expires_at - time.time()), 0)
+        headers = {'ETag': entry.etag, 'Cache-Control': f'max-age={min(remaining, int(ttl))}'}
+
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match and self._etag_matches(if_none_match, entry.etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=entry.body, media_type='application/json', headers=headers)
+
+    @staticmethod
+    def _etag_matches(header: str, etag: str) -> bool:
+        """If-None-Match uses weak comparison (RFC 9110 13.1.2)"""
+        candidates = [tag.strip() for tag in header.split(',')]
+        return '*' in candidates or any(tag.removeprefix('W/') == etag for tag in candidates)
+
+    async def _get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            if self.backend.blocking:
+                return await run_io(self.backend.get, key)
+            return self.backend.get(key)
+        except Exception as e:
+            # A broken cache must never fail the request
+            self.errors += 1
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+
+    async def _set(self, key: str, entry: CachedResponse):
+        try:
+            if self.backend.blocking:
+                await run_io(self.backend.set, key, entry)
+            else:
+                self.backend.set(key, entry)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Response cache write failed: {e}")
+
+    def invalidate(self):
+        """Drop every entry (all workers, for the SQLite backend)"""
+        self.backend.clear()
+
+    def get_stats(self) -> Dict:
+        """Cache metrics for health/monitoring endpoints"""
+        try:
+            entries = self.backend.size()
+        except Exception:
+            entries = None
+        return {
+            'enabled': settings.RESPONSE_CACHE,
+            'backend': type(self.backend).__name__,
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+            'errors': self.errors
+        }
+
+
+def _create_backend():
+    if settings.RESPONSE_CACHE_BACKEND == 'sqlite':
+        try:
+            return SQLiteBackend(settings.RESPONSE_CACHE_PATH, settings.RESPONSE_CACHE_SIZE)
+        except Exception as e:
+            logger.warning(f"⚠️  SQLite response cache unavailable, using in-process cache: {e}")
+    return MemoryBackend(settings.RESPONSE_CACHE_SIZE)
+
+
+# Global response cache instance
+response_cache = ResponseCache(_create_backend())
@@ -4,19 +4,22 @@ PostgreSQL Database Utilities for API
 Provides database connection and query utilities for Vercel serverless functions.
 
 Features:
-- Connection pooling
-- Query caching
+- Connection pooling (api/core/db_pool.py)
+- Query caching (database stats: planner estimates, TTL, last good value on errors)
 - Error handling
 - Performance metrics
 """
 
 import os
+import time
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from typing import Dict, List, Optional, Tuple
-from functools import lru_cache
 import logging
 
+from api.core.config import settings
+from api.core.db_pool import ConnectionPool
+
 logger = logging.getLogger(__name__)
 
 # Database connection URL from environment variable
@@ -24,19 +27,30 @@ DATABASE_URL = os.environ.get('POSTGRES_URL')
 if not DATABASE_URL:
     raise ValueError("POSTGRES_URL environment variable is required")
 
+# Shared by every DatabaseConnection in this process
+_pool = ConnectionPool(
+    DATABASE_URL,
+    min_size=settings.DB_POOL_MIN_SIZE,
+    max_size=settings.DB_POOL_MAX_SIZE,
+    timeout=settings.DB_POOL_TIMEOUT,
+    max_idle=settings.DB_POOL_MAX_IDLE_SECONDS,
+    max_lifetime=settings.DB_POOL_MAX_LIFETIME_SECONDS,
+    health_check_after=settings.DB_POOL_HEALTH_CHECK_SECONDS
+)
+
 
 class DatabaseConnection:
-    """Manages PostgreSQL database connections"""
+    """Checks a PostgreSQL connection out of the shared pool"""
 
     def __init__(self):
         self.conn = None
+        self._failed = False
 
     def connect(self):
-        """Establish database connection"""
-        if self.conn is None or self.conn.closed:
+        """Check out a pooled connection"""
+        if self.conn is None:
             try:
-                self.conn = psycopg2.connect(DATABASE_URL)
-                logger.info("✓ Connected to PostgreSQL")
+                self.conn = _pool.acquire()
             except Exception as e:
                 logger.error(f"❌ Database connection failed: {e}")
                 raise
@@ -44,18 +58,24 @@ class DatabaseConnection:
         return self.conn
 
     def close(self):
-        """Close database connection"""
-        if self.conn and not self.conn.closed:
-            self.conn.close()
-            logger.info("✓ Database connection closed")
+        """Return the connection to the pool"""
+        if self.conn is not None:
+            _pool.release(self.conn, failed=self._failed)
+            self.conn = None
 
     def __enter__(self):
         return self.connect()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._failed = exc_type is not None
         self.close()
 
 
+def _fetch(cur, query: str, params: tuple = None) -> List[Dict]:
+    cur.execute(query, params)
+    return [dict(row) for row in cur.fetchall()]
+
+
 def execute_query(query: str, params: tuple = None, fetch: bool = True) -> Optional[List[Dict]]:
     """
     Execute a SQL query and return results as dict.
@@ -86,28 +106,56 @@ def execute_query(query: str, params: tuple = None, fetch: bool = True) -> Optio
         raise
 
 
-@lru_cache(maxsize=32)
+# Last good database stats and when they were read
+_stats_cache: Dict = {'value': None, 'fetched_at': 0.0}
+
+
 def get_database_stats() -> Dict:
     """
-    Get database statistics (cached).
+    Get database statistics (cached for DB_STATS_TTL_SECONDS).
+
+    Row counts are planner estimates (pg_class.reltuples), so the query
+    cost does not grow with the tables. If the database fails, the last
+    good stats are returned with their age.
 
     Returns:
-        Dict with table row counts and database size
+        Dict with table row counts, database size and 'age_seconds'
     """
+    now = time.time()
+    cached = _stats_cache['value']
+    if cached is not None and now - _stats_cache['fetched_at'] < settings.DB_STATS_TTL_SECONDS:
+        return dict(cached, age_seconds=round(now - _stats_cache['fetched_at'], 1))
+
+    stats = _query_database_stats()
+    if stats:
+        _stats_cache['value'], _stats_cache['fetched_at'] = stats, now
+        return dict(stats, age_seconds=0.0)
+    if cached is not None:
+        return dict(cached, age_seconds=round(now - _stats_cache['fetched_at'], 1), stale=True)
+    return {}
+
+
+def _query_database_stats() -> Dict:
     try:
         stats = {}
 
-        # Table counts
+        # Table counts (estimates; tables never analyzed are small - counted exactly)
         query = """
             SELECT
-                (SELECT COUNT(*) FROM matches) as matches,
-                (SELECT COUNT(*) FROM match_champions) as champions,
-                (SELECT COUNT(*) FROM match_snapshots) as snapshots
+                relname,
+                CASE WHEN reltuples >= 0 THEN reltuples::bigint END as estimate
+            FROM pg_class
+            WHERE relkind = 'r'
+              AND relnamespace = 'public'::regnamespace
+              AND relname IN ('matches', 'match_champions', 'match_snapshots')
         """
-        result = execute_query(query)
+        estimates = {row['relname']: row['estimate'] for row in execute_query(query)}
 
-        if result:
-            stats.update(result[0])
+        for key, table in (('matches', 'matches'), ('champions', 'match_champions'), ('snapshots', 'match_snapshots')):
+            if estimates.get(table) is not None:
+                stats[key] = estimates[table]
+            else:
+                stats[key] = execute_query(f"SELECT COUNT(*) as count FROM {table}")[0]['count']
 
         # Database size
         query = """
@@ -139,32 +187,35 @@ def get_match_data(match_id: str) -> Optional[Dict]:
         Dict with match, champions, and snapshots data
     """
     try:
-        # Get match
-        match_query = "SELECT * FROM matches WHERE match_id = %s"
-        match_result = execute_query(match_query, (match_id,))
-
-        if not match_result:
-            return None
+        # One connection (and transaction) for all three queries
+        with DatabaseConnection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                # Get match
+                match_query = "SELECT * FROM matches WHERE match_id = %s"
+                match_result = _fetch(cur, match_query, (match_id,))
 
-        match = match_result[0]
+                if not match_result:
+                    return None
 
-        # Get champions
-        champions_query = """
-            SELECT team, champion_id, position
-            FROM match_champions
-            WHERE match_id = %s
-            ORDER BY team, position
-        """
-        champions = execute_query(champions_query, (match_id,))
-
-        # Get snapshots
-        snapshots_query = """
-            SELECT *
-            FROM match_snapshots
-            WHERE match_id = %s
-            ORDER BY snapshot_time
-        """
-        snapshots = execute_query(snapshots_query, (match_id,))
+                match = match_result[0]
+
+                # Get champions
+                champions_query = """
+                    SELECT team, champion_id, position
+                    FROM match_champions
+                    WHERE match_id = %s
+                    ORDER BY team, position
+                """
+                champions = _fetch(cur, champions_query, (match_id,))
+
+                # Get snapshots
+                snapshots_query = """
+                    SELECT *
+                    FROM match_snapshots
+                    WHERE match_id = %s
+                    ORDER BY snapshot_time
+                """
+                snapshots = _fetch(cur, snapshots_query, (match_id,))
 
         return {
             'match': match,
@@ -190,16 +241,18 @@ def get_champion_winrate(champion_id: int, team: str = None) -> Optional[float]:
     """
     try:
         if team:
+            name = 'utils_champion_winrate_team'
             query = """
                 SELECT
                     COUNT(CASE WHEN m.blue_win = TRUE THEN 1 END)::float /
                     COUNT(*)::float as winrate
                 FROM match_champions mc
                 JOIN matches m ON mc.match_id = m.match_id
-                WHERE mc.champion_id = %s AND mc.team = %s
+                WHERE mc.champion_id = $1 AND mc.team = $2
             """
             params = (champion_id, team)
         else:
+            name = 'utils_champion_winrate'
             query = """
                 SELECT
                     COUNT(CASE
@@ -209,11 +262,18 @@ def get_champion_winrate(champion_id: int, team: str = None) -> Optional[float]:
                     END)::float / COUNT(*)::float as winrate
                 FROM match_champions mc
                 JOIN matches m ON mc.match_id = m.match_id
-                WHERE mc.champion_id = %s
+                WHERE mc.champion_id = $1
             """
             params = (champion_id,)
 
-        result = execute_query(query, params)
+        # Hot query: prepared once per pooled connection
+        with DatabaseConnection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                if settings.DB_PREPARED_STATEMENTS:
+                    conn.execute_prepared(cur, name, query, params)
+                else:
+                    cur.execute(query.replace('$1', '%s').replace('$2', '%s'), params)
+                result = [dict(row) for row in cur.fetchall()]
 
         if result and result[0]['winrate'] is not None:
             return float(result[0]['winrate'])
@@ -273,9 +333,9 @@ def test_connection() -> bool:
     try:
         with DatabaseConnection() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT 1")
+                cur.execute("SELECT 1 as ok")
                 result = cur.fetchone()
-                return result[0] == 1
+                return result['ok'] == 1
     except Exception as e:
         logger.error(f"Connection test failed: {e}")
         return False
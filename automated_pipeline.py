@@ -267,15 +267,37 @@ class AutomatedPipeline:
             return False
 
     def step_restart_backend(self) -> bool:
-        """Step 7: Restart backend to load new models (optional)"""
-        self.log_step("Backend Restart", "Skipped", "Manual restart required")
+        """Step 7: Get the running API onto the new models (no restart needed)"""
+        if not self.stats['models_updated']:
+            self.log_step("Model Reload", "Skipped", "No models updated")
+            return True
+
+        # Running APIs watch models/ and hot-reload changed files on their own
+        # (MODEL_RELOAD_POLL_SECONDS). With API_BASE_URL set, ask for it right away.
+        api_url = os.getenv('API_BASE_URL')
+        api_key = os.getenv('INTERNAL_API_KEY')
+        if not api_url or not api_key:
+            self.log_step("Model Reload", "Skipped", "API picks up new models via its file watcher")
+            return True
 
-        # TODO: Implement automatic backend restart
-        # Could use systemd, pm2, or similar process manager
-        # For now, we'll just notify that models are updated
+        if self.dry_run:
+            self.log_step("Model Reload", "Dry Run", f"Would POST {api_url}/api/admin/reload-models")
+            return True
 
-        logger.info("  ℹ Backend restart not automated")
-        logger.info("  ℹ Run: python3 api_v2.py to load new models")
+        try:
+            import requests
+            response = requests.post(
+                f"{api_url.rstrip('/')}/api/admin/reload-models",
+                headers={'X-INTERNAL-API-KEY': api_key},
+                timeout=300
+            )
+            response.raise_for_status()
+            reloaded = [result['component'] for result in response.json()['results']]
+            self.log_step("Model Reload", "Success", f"Reloaded: {', '.join(reloaded)}")
+        except Exception as e:
+            # Not fatal: the old models keep serving and the file watcher retries
+            self.log_step("Model Reload", "Failed", str(e))
+            logger.warning("  ⚠ Reload request failed - the API keeps serving the previous models")
 
         return True
 
@@ -336,7 +358,7 @@ class AutomatedPipeline:
             ("Generate Item Builds", self.step_generate_builds),
             ("Generate Frontend Stats", self.step_generate_frontend_stats),
             ("Sync to Frontend", self.step_sync_to_frontend),
-            ("Restart Backend", self.step_restart_backend),
+            ("Reload Models", self.step_restart_backend),
         ]
 
         for idx, (name, step_func) in enumerate(steps, 1):
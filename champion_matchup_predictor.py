@@ -4,14 +4,26 @@ Champion Matchup Predictor
 Predicts win probability based on champion team compositions.
 """
 
+import itertools
 import pickle
 import json
+import math
+import statistics
+import time
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import logging
 
+import numpy as np
+
+from champion_registry import ChampionRegistry
+from compiled_forest import CompiledForest, MAX_COMPILED_ROWS, load_or_compile
+
 logger = logging.getLogger(__name__)
 
+# Process-wide, so a new predictor never reuses an old version (see PredictionCache)
+_versions = itertools.count(1)
+
 
 class ChampionMatchupPredictor:
     """Predicts win probability based on champion compositions"""
@@ -21,14 +33,34 @@ class ChampionMatchupPredictor:
         self.champion_stats = {}
         self.champion_to_id = {}
         self.id_to_champion = {}
-
-    def load_model(self, model_path: str, champion_stats: Dict = None):
+        self.compiled_model: Optional[CompiledForest] = None
+        self.registry: Optional[ChampionRegistry] = None
+        self.version = next(_versions)  # renewed whenever model or stats change
+        # Per registry index (filled by attach_registry)
+        self._encoded = np.zeros(0, dtype=np.int64)    # encoder value, -1 = not in encoder
+        self._winrate = np.zeros(0, dtype=np.float64)  # win rate, 0.5 if unknown
+        self._candidates = np.zeros(0, dtype=np.intp)  # indices of every encoder champion
+        self._pick_weight = np.zeros(0, dtype=np.float64)  # pick count (completion sampling weight)
+
+    def load_model(self, model_path: str, champion_stats: Dict = None, registry: ChampionRegistry = None):
         """
         Load the trained champion matchup prediction model
 
         Args:
             model_path: Path to the pickled model file
             champion_stats: Optional dict of champion stats from database (if None, stats disabled)
+            registry: Shared ChampionRegistry, built with this model's encoder
+                (a private one is built if None)
+        """
+        self.read_model(model_path)
+        self.attach_data(model_path, champion_stats, registry)
+
+    def read_model(self, model_path: str):
+        """
+        Read the model and its champion encoders (not usable before attach_data)
+
+        Lets a caller build the shared ChampionRegistry from the encoder
+        before the predictor is attached to it.
         """
         try:
             # Try joblib first (modern scikit-learn models)
@@ -53,18 +85,65 @@ class ChampionMatchupPredictor:
             logger.info(f"  Model type: {type(self.model).__name__}")
             logger.info(f"  Champions loaded: {len(self.champion_to_id)}")
 
-            # Use provided champion stats (from database) instead of loading from JSON
-            if champion_stats is not None:
-                self.champion_stats = champion_stats
-                logger.info(f"  Champion stats loaded from database ({len(champion_stats)} champions)")
-            else:
-                logger.warning("  No champion stats provided - win rate features disabled")
-                self.champion_stats = {}
-
         except Exception as e:
             logger.error(f"Failed to load champion predictor: {e}")
             raise
 
+    def attach_data(self, model_path: str, champion_stats: Dict = None, registry: ChampionRegistry = None):
+        """Attach stats and registry to a read model and compile its forest"""
+        # Use provided champion stats (from database) instead of loading from JSON
+        if champion_stats is not None:
+            self.champion_stats = champion_stats
+            logger.info(f"  Champion stats loaded from database ({len(champion_stats)} champions)")
+        else:
+            logger.warning("  No champion stats provided - win rate features disabled")
+            self.champion_stats = {}
+
+        self.attach_registry(registry)
+        self.compiled_model = self._compile(model_path)
+
+    def attach_registry(self, registry: ChampionRegistry = None):
+        """
+        Resolve champion names through a ChampionRegistry
+
+        The registry is only read (it is shared): it must have been built
+        with this model's encoder (see ChampionRegistry.covers); if None, a
+        private one is built from the encoder and stats. Precomputes
+        index -> encoder value / win rate arrays so feature rows are built
+        with array indexing (see _feature_matrix).
+        """
+        if registry is None:
+            registry = ChampionRegistry.from_sources(self.champion_stats, encoder=self.champion_to_id)
+        elif not registry.covers(self.champion_to_id):
+            raise ValueError("Champion registry was not built with this model's encoder")
+        self.registry = registry
+
+        size = len(self.registry)
+        self._encoded = np.full(size, -1, dtype=np.int64)
+        for name, encoded in self.champion_to_id.items():
+            self._encoded[self.registry.resolve(name)] = int(encoded)
+
+        # Stats champions the registry does not know cannot be requested anyway
+        known_stats = [(index, stats) for index, stats in (
+            (self.registry.resolve(key), stats) for key, stats in self.champion_stats.items()
+        ) if index is not None]
+
+        self._winrate = np.full(size, 0.5, dtype=np.float64)
+        for index, stats in known_stats:
+            self._winrate[index] = stats.get('win_rate', 0.5)
+
+        self._candidates = np.flatnonzero(self._encoded >= 0)
+
+        # Completion sampling weights: pick counts, champions without picks
+        # get the smallest observed weight (uniform if no stats at all)
+        picks = np.zeros(size, dtype=np.float64)
+        for index, stats in known_stats:
+            picks[index] = max(float(stats.get('picks', 0) or 0), 0.0)
+        observed = picks[self._candidates]
+        floor = observed[observed > 0].min() if (observed > 0).any() else 1.0
+        self._pick_weight = np.where(picks > 0, picks, floor)
+        self.version = next(_versions)
+
     def predict(self, blue_champions: List[str], red_champions: List[str]) -> Dict:
         """
         Predict win probability for a champion matchup
@@ -79,61 +158,508 @@ class ChampionMatchupPredictor:
         if not self.model:
             raise ValueError("Model not loaded. Call load_model() first.")
 
-        # Normalize champion names (handle spaces, capitalization)
-        blue_champions = [self._normalize_champion_name(c) for c in blue_champions]
-        red_champions = [self._normalize_champion_name(c) for c in red_champions]
-
-        # Convert champion names to IDs with case-insensitive lookup
-        try:
-            blue_ids = [self.champion_to_id[self._find_champion_in_encoder(champ)] for champ in blue_champions]
-            red_ids = [self.champion_to_id[self._find_champion_in_encoder(champ)] for champ in red_champions]
-        except ValueError as e:
-            # Re-raise ValueError with helpful message
-            raise
-        except KeyError as e:
-            raise ValueError(f"Unknown champion in encoder: {e}")
-
-        # Pad to 5 champions (use 0 for missing slots)
-        blue_ids = (blue_ids + [0] * 5)[:5]
-        red_ids = (red_ids + [0] * 5)[:5]
-
-        # Calculate winrate features
-        blue_winrates = [self._get_champion_winrate(c) for c in blue_champions]
-        red_winrates = [self._get_champion_winrate(c) for c in red_champions]
-
-        blue_avg_winrate = sum(blue_winrates) / len(blue_winrates) if blue_winrates else 0.5
-        red_avg_winrate = sum(red_winrates) / len(red_winrates) if red_winrates else 0.5
-        blue_max_winrate = max(blue_winrates) if blue_winrates else 0.5
-        red_max_winrate = max(red_winrates) if red_winrates else 0.5
-        blue_min_winrate = min(blue_winrates) if blue_winrates else 0.5
-        red_min_winrate = min(red_winrates) if red_winrates else 0.5
-        winrate_diff = blue_avg_winrate - red_avg_winrate
-
-        # Create feature vector with 17 features:
-        # [blue_avg_wr, red_avg_wr, blue_max_wr, red_max_wr, blue_min_wr, red_min_wr, wr_diff,
-        #  blue_champ_0, blue_champ_1, blue_champ_2, blue_champ_3, blue_champ_4,
-        #  red_champ_0, red_champ_1, red_champ_2, red_champ_3, red_champ_4]
-        features = [[
-            blue_avg_winrate, red_avg_winrate,
-            blue_max_winrate, red_max_winrate,
-            blue_min_winrate, red_min_winrate,
-            winrate_diff,
-            *blue_ids, *red_ids
-        ]]
+        features, blue_champions, red_champions = self._build_features(blue_champions, red_champions)
 
         # Predict
         try:
-            blue_win_prob = self.model.predict_proba(features)[0][1]
-            red_win_prob = 1 - blue_win_prob
+            blue_win_prob = self._predict_proba(features.reshape(1, -1))[0][1]
         except Exception as e:
             logger.error(f"Prediction error: {e}")
-            # Fallback to champion win rates
-            blue_win_prob = blue_avg_winrate
-            red_win_prob = red_avg_winrate
-            # Normalize
-            total = blue_win_prob + red_win_prob
-            blue_win_prob = blue_win_prob / total
-            red_win_prob = red_win_prob / total
+            blue_win_prob = self._fallback_probability(features)
+
+        return self._format_result(blue_win_prob, blue_champions, red_champions)
+
+    def predict_batch(self, matchups: List[Tuple[List[str], List[str]]]) -> List[Dict]:
+        """
+        Predict win probabilities for many champion matchups at once
+
+        All feature rows are built first and scored with a single
+        vectorized predict_proba call.
+
+        Args:
+            matchups: List of (blue_champions, red_champions) tuples
+
+        Returns:
+            List of prediction dicts (same format as predict()), in input order
+        """
+        if not self.model:
+            raise ValueError("Model not loaded. Call load_model() first.")
+
+        if not matchups:
+            return []
+
+        blue_rows = []
+        red_rows = []
+        for i, (blue_champions, red_champions) in enumerate(matchups):
+            try:
+                blue_rows.append(self._resolve_team(blue_champions))
+                red_rows.append(self._resolve_team(red_champions))
+            except ValueError as e:
+                raise ValueError(f"Matchup {i}: {e}")
+
+        teams = [
+            ([self.registry.name_of(i) for i in blue], [self.registry.name_of(i) for i in red])
+            for blue, red in zip(blue_rows, red_rows)
+        ]
+        rows = self._feature_matrix(self._pad_teams(blue_rows), self._pad_teams(red_rows))
+
+        try:
+            blue_probs = self._predict_proba(rows)[:, 1]
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+            blue_probs = [self._fallback_probability(row) for row in rows]
+
+        return [
+            self._format_result(prob, blue, red)
+            for prob, (blue, red) in zip(blue_probs, teams)
+        ]
+
+    def predict_marginalized(self, blue_champions: List[str], red_champions: List[str],
+                             samples: int = 1000, seed: Optional[int] = 0,
+                             confidence_level: float = 0.95) -> Dict:
+        """
+        Predict a partial draft by averaging over sampled completions
+
+        predict() pads open slots with id 0, which the model never saw in
+        training. Here every open slot is filled instead: each sample draws
+        the missing champions without replacement, weighted by pick count
+        (champion_stats 'picks'), and all samples are scored in one batch.
+
+        Args:
+            blue_champions: Blue picks so far (0-5)
+            red_champions: Red picks so far (0-5)
+            samples: Number of sampled completions
+            seed: RNG seed (same seed + draft = same result); None = random
+            confidence_level: Level of the reported intervals
+
+        Returns:
+            Dict in predict() format (blue win probability = mean over the
+            samples, confidence from that mean as for a full draft) plus
+            'marginalization': sample count, std, a confidence interval of
+            the mean and the central interval of the completions
+        """
+        if not self.model:
+            raise ValueError("Model not loaded. Call load_model() first.")
+        if samples < 1:
+            raise ValueError("samples must be at least 1")
+        if not 0 < confidence_level < 1:
+            raise ValueError("confidence_level must be between 0 and 1")
+
+        blue = self._resolve_team(blue_champions)
+        red = self._resolve_team(red_champions)
+        if len(blue) > 5 or len(red) > 5:
+            raise ValueError("A team cannot have more than 5 champions")
+
+        open_blue, open_red = 5 - len(blue), 5 - len(red)
+        open_slots = open_blue + open_red
+        if open_slots == 0:
+            samples = 1
+
+        pool = self._candidates[~np.isin(self._candidates, blue + red)]
+        if len(pool) < open_slots:
+            raise ValueError("Not enough champions left to complete the draft")
+
+        completions = self._sample_completions(pool, samples, open_slots, np.random.default_rng(seed))
+
+        blue_matrix = np.empty((samples, 5), dtype=np.intp)
+        red_matrix = np.empty((samples, 5), dtype=np.intp)
+        blue_matrix[:, :len(blue)] = blue
+        blue_matrix[:, len(blue):] = completions[:, :open_blue]
+        red_matrix[:, :len(red)] = red
+        red_matrix[:, len(red):] = completions[:, open_blue:]
+
+        blue_probs = self._predict_proba(self._feature_matrix(blue_matrix, red_matrix))[:, 1]
+
+        mean = float(blue_probs.mean())
+        std = float(blue_probs.std(ddof=1)) if samples > 1 else 0.0
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence_level / 2)
+        margin = z * std / math.sqrt(samples)
+        tail = (1 - confidence_level) / 2 * 100
+
+        result = self._format_result(mean, [self.registry.name_of(i) for i in blue],
+                                     [self.registry.name_of(i) for i in red])
+        result['confidence'] = self._calculate_confidence(mean, 5, 5)
+        result['marginalization'] = {
+            'samples': int(samples),
+            'open_slots': open_slots,
+            'seed': seed,
+            'std': std,
+            'confidence_level': confidence_level,
+            'mean_interval': [max(mean - margin, 0.0), min(mean + margin, 1.0)],
+            'completion_interval': [float(v) for v in np.percentile(blue_probs, [tail, 100 - tail])]
+        }
+        return result
+
+    def _sample_completions(self, pool: np.ndarray, samples: int, slots: int,
+                            rng: np.random.Generator) -> np.ndarray:
+        """
+        (samples, slots) champions drawn from pool without replacement, weighted by pick count
+
+        Slots are drawn in order by inverse-CDF lookup; a draw that repeats
+        an earlier slot of its row is redrawn (rejection = drawing from the
+        remaining champions), so only colliding rows are ever resampled.
+        """
+        cumulative = np.cumsum(self._pick_weight[pool])
+        total = cumulative[-1]
+        completions = np.empty((samples, slots), dtype=np.intp)
+
+        for slot in range(slots):
+            rows = np.arange(samples)
+            while len(rows):
+                draws = np.searchsorted(cumulative, rng.random(len(rows)) * total, side='right')
+                completions[rows, slot] = np.minimum(draws, len(pool) - 1)
+                repeated = (completions[rows, :slot] == completions[rows, slot:slot + 1]).any(axis=1)
+                rows = rows[repeated]
+
+        return pool[completions]
+
+    def best_picks(self, blue_champions: List[str], red_champions: List[str], team: str = 'blue',
+                   bans: List[str] = (), top_k: int = 10) -> Dict:
+        """
+        Score every champion the model knows as the next pick for one team
+
+        One feature row per candidate (plus the current draft as row 0) is
+        built as a single matrix and scored with one predict_proba call.
+
+        Args:
+            blue_champions: Blue picks so far (0-4 champions if team='blue')
+            red_champions: Red picks so far
+            team: Team to pick for ('blue' or 'red')
+            bans: Banned champions (excluded from the candidates)
+            top_k: Number of suggestions to return
+
+        Returns:
+            Dict with the team's current win probability, the number of
+            candidates scored and the top_k picks (best first)
+        """
+        if not self.model:
+            raise ValueError("Model not loaded. Call load_model() first.")
+        if team not in ('blue', 'red'):
+            raise ValueError(f"team must be 'blue' or 'red', got '{team}'")
+
+        blue = self._resolve_team(blue_champions)
+        red = self._resolve_team(red_champions)
+        own, other = (blue, red) if team == 'blue' else (red, blue)
+        if len(own) >= 5:
+            raise ValueError(f"{team.capitalize()} team already has 5 champions")
+
+        taken = set(blue) | set(red) | {self.registry.require(ban) for ban in bans}
+        candidates = self._candidates[~np.isin(self._candidates, list(taken))]
+        n = len(candidates)
+
+        # Row 0 = current draft (empty slot), rows 1..n = one candidate each
+        own_matrix = np.empty((n + 1, len(own) + 1), dtype=np.intp)
+        own_matrix[:, :len(own)] = own
+        own_matrix[0, -1] = -1
+        own_matrix[1:, -1] = candidates
+        other_matrix = np.tile(np.asarray(other, dtype=np.intp), (n + 1, 1))
+
+        if team == 'blue':
+            X = self._feature_matrix(own_matrix, other_matrix)
+        else:
+            X = self._feature_matrix(other_matrix, own_matrix)
+
+        blue_probs = self._predict_proba(X)[:, 1]
+        probs = blue_probs if team == 'blue' else 1.0 - blue_probs
+        current, scores = float(probs[0]), probs[1:]
+
+        k = min(top_k, n)
+        top = np.argpartition(-scores, k - 1)[:k] if 0 < k < n else np.arange(k)
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return {
+            'team': team,
+            'current_win_probability': current,
+            'candidates_scored': int(n),
+            'picks': [
+                {
+                    'champion': self.registry.name_of(int(candidates[i])),
+                    'win_probability': float(scores[i]),
+                    'win_probability_gain': float(scores[i] - current),
+                    'win_rate': float(self._winrate[candidates[i]])
+                }
+                for i in top
+            ]
+        }
+
+    def ban_suggestions(self, blue_champions: List[str], red_champions: List[str], team: str = 'blue',
+                        bans: List[str] = (), top_k: int = 5, beam_width: int = 4, depth: int = 3,
+                        time_budget_ms: float = 200.0, max_rows: int = 20000) -> Dict:
+        """
+        Rank the opponent's possible next picks by how much they hurt our draft
+
+        Beam-searched minimax over the remaining draft: ply 1 is the
+        opponent picking each candidate, later plies alternate our best
+        responses and theirs (a full team is skipped). Every node of a ply
+        is expanded in one feature matrix and scored with one model call;
+        each node keeps its beam_width most plausible children (best for
+        the side picking). Values are backed up with max (our picks) / min
+        (their picks), so a champion's threat accounts for our replies.
+
+        Args:
+            blue_champions: Blue picks so far
+            red_champions: Red picks so far
+            team: Our team ('blue' or 'red'); bans are suggested against the other
+            bans: Champions already banned
+            top_k: Number of ban suggestions (also the number of ply-1 branches searched deeper)
+            beam_width: Children kept per node below ply 1
+            depth: Maximum number of plies
+            time_budget_ms: Deeper plies are skipped once their estimated cost exceeds the budget
+            max_rows: Largest batch a single ply may score
+
+        Returns:
+            Dict with our current win probability, search statistics and
+            the top_k ban suggestions (most threatening first)
+        """
+        if not self.model:
+            raise ValueError("Model not loaded. Call load_model() first.")
+        if team not in ('blue', 'red'):
+            raise ValueError(f"team must be 'blue' or 'red', got '{team}'")
+
+        start = time.perf_counter()
+        budget = time_budget_ms / 1000.0
+        opponent = 'red' if team == 'blue' else 'blue'
+
+        blue = self._resolve_team(blue_champions)
+        red = self._resolve_team(red_champions)
+        if len(red if team == 'blue' else blue) >= 5:
+            raise ValueError(f"{opponent.capitalize()} team already has 5 champions")
+
+        taken = set(blue) | set(red) | {self.registry.require(ban) for ban in bans}
+        pool = self._candidates[~np.isin(self._candidates, list(taken))]
+        if len(pool) == 0:
+            raise ValueError("No champions left to pick")
+
+        def our_probability(blue_matrix, red_matrix):
+            blue_probs = self._predict_proba(self._feature_matrix(blue_matrix, red_matrix))[:, 1]
+            return blue_probs if team == 'blue' else 1.0 - blue_probs
+
+        # Ply 1: every opponent pick, with the current draft (padded) as row 0
+        blue_states, red_states = self._as_states(blue), self._as_states(red)
+        child_blue, child_red, parent, picked = self._expand(blue_states, red_states, opponent, pool)
+        scores = our_probability(
+            np.concatenate([self._pad_state(blue_states, child_blue.shape[1]), child_blue]),
+            np.concatenate([self._pad_state(red_states, child_red.shape[1]), child_red])
+        )
+        current, scores = float(scores[0]), scores[1:]
+        nodes_scored = len(scores)
+        ply_rows, ply_seconds = len(scores), time.perf_counter() - start
+
+        # Branches searched deeper (and reported): the most threatening opponent picks
+        keep = self._beam(np.zeros(len(scores), dtype=np.intp), scores, max(top_k, beam_width), maximize=False)
+        roots, immediate = picked[keep], scores[keep]
+        blue_states, red_states = child_blue[keep], child_red[keep]
+        values = immediate
+
+        # Deeper plies: (parent index, maximize, parent scores) per level, for backing values up
+        levels: List[Tuple[np.ndarray, bool, np.ndarray]] = []
+        last_side = opponent
+        depth_searched, truncated = 1, False
+
+        for _ in range(depth - 1):
+            side = self._next_side(blue_states.shape[1], red_states.shape[1], last_side)
+            if side is None:
+                break
+
+            rows = len(blue_states) * len(pool)
+            estimate = rows * ply_seconds / max(ply_rows, 1)
+            if rows > max_rows or time.perf_counter() - start + estimate > budget:
+                truncated = True
+                break
+
+            ply_start = time.perf_counter()
+            child_blue, child_red, parent, picked = self._expand(blue_states, red_states, side, pool)
+            if len(parent) == 0:
+                break
+            scores = our_probability(child_blue, child_red)
+            nodes_scored += len(scores)
+            ply_rows, ply_seconds = len(scores), time.perf_counter() - ply_start
+
+            maximize = side == team
+            keep = self._beam(parent, scores, beam_width, maximize)
+            levels.append((parent[keep], maximize, values))
+            blue_states, red_states, values = child_blue[keep], child_red[keep], scores[keep]
+            last_side = side
+            depth_searched += 1
+
+        # Minimax backup to the ply-1 branches
+        for parent, maximize, parent_scores in reversed(levels):
+            backed = np.full(len(parent_scores), -np.inf if maximize else np.inf)
+            (np.maximum if maximize else np.minimum).at(backed, parent, values)
+            values = np.where(np.isfinite(backed), backed, parent_scores)
+
+        order = np.argsort(values, kind='stable')[:top_k]
+
+        return {
+            'team': team,
+            'current_win_probability': current,
+            'depth_searched': depth_searched,
+            'beam_width': beam_width,
+            'nodes_scored': int(nodes_scored),
+            'truncated': truncated,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+            'bans': [
+                {
+                    'champion': self.registry.name_of(int(roots[i])),
+                    'win_probability_if_picked': float(values[i]),
+                    'immediate_win_probability': float(immediate[i]),
+                    'threat': float(current - values[i])
+                }
+                for i in order
+            ]
+        }
+
+    @staticmethod
+    def _as_states(team: List[int]) -> np.ndarray:
+        """One team as a (1, picks) state matrix"""
+        return np.asarray(team, dtype=np.intp).reshape(1, len(team))
+
+    @staticmethod
+    def _pad_state(states: np.ndarray, width: int) -> np.ndarray:
+        """Pad state rows with empty (-1) slots up to width"""
+        padded = np.full((len(states), width), -1, dtype=np.intp)
+        padded[:, :states.shape[1]] = states
+        return padded
+
+    @staticmethod
+    def _next_side(blue_picks: int, red_picks: int, last: str) -> Optional[str]:
+        """Side picking after `last` (teams alternate, a full team is skipped)"""
+        following = 'red' if last == 'blue' else 'blue'
+        for side in (following, last):
+            if (blue_picks if side == 'blue' else red_picks) < 5:
+                return side
+        return None
+
+    @staticmethod
+    def _expand(blue: np.ndarray, red: np.ndarray, side: str, pool: np.ndarray):
+        """
+        Every (state, candidate) pair as side's next pick
+
+        Args:
+            blue, red: (m, picks) index matrices - states of one ply have equal team sizes
+            side: Team picking
+            pool: Candidate indices (bans and the initial picks already removed)
+
+        Returns:
+            Tuple of (child blue, child red, parent state index, picked index)
+            for every candidate not already picked in its state
+        """
+        parent = np.repeat(np.arange(len(blue)), len(pool))
+        picked = np.tile(pool, len(blue))
+
+        in_state = (blue[parent] == picked[:, None]).any(axis=1) | (red[parent] == picked[:, None]).any(axis=1)
+        parent, picked = parent[~in_state], picked[~in_state]
+
+        if side == 'blue':
+            return np.column_stack([blue[parent], picked]), red[parent], parent, picked
+        return blue[parent], np.column_stack([red[parent], picked]), parent, picked
+
+    @staticmethod
+    def _beam(parent: np.ndarray, scores: np.ndarray, width: int, maximize: bool) -> np.ndarray:
+        """Indices of the `width` best children of every parent (best for the side picking)"""
+        order = np.lexsort((-scores if maximize else scores, parent))
+        grouped = parent[order]
+        starts = np.searchsorted(grouped, grouped, side='left')
+        rank = np.arange(len(order)) - starts
+        return order[rank < width]
+
+    def _build_features(self, blue_champions: List[str], red_champions: List[str]) -> Tuple[np.ndarray, List[str], List[str]]:
+        """
+        Build the 17-feature model input row for one matchup
+
+        Returns:
+            Tuple of (feature row, canonical blue champions, canonical red champions)
+        """
+        blue_indices = self._resolve_team(blue_champions)
+        red_indices = self._resolve_team(red_champions)
+
+        features = self._feature_matrix(self._pad_teams([blue_indices]), self._pad_teams([red_indices]))[0]
+
+        blue_champions = [self.registry.name_of(i) for i in blue_indices]
+        red_champions = [self.registry.name_of(i) for i in red_indices]
+        return features, blue_champions, red_champions
+
+    def _feature_matrix(self, blue: np.ndarray, red: np.ndarray) -> np.ndarray:
+        """
+        Build model input rows for many matchups at once
+
+        Args:
+            blue: (n, slots) registry indices of blue champions, -1 = empty
+                  slot (only as trailing padding)
+            red: Same for red
+
+        Returns:
+            (n, 17) feature matrix:
+            [blue_avg_wr, red_avg_wr, blue_max_wr, red_max_wr, blue_min_wr, red_min_wr, wr_diff,
+             blue_champ_0..4, red_champ_0..4] - champion ids padded with 0
+        """
+        blue_avg, blue_max, blue_min, blue_ids = self._team_features(blue)
+        red_avg, red_max, red_min, red_ids = self._team_features(red)
+
+        return np.column_stack([
+            blue_avg, red_avg,
+            blue_max, red_max,
+            blue_min, red_min,
+            blue_avg - red_avg,
+            blue_ids, red_ids
+        ])
+
+    def _team_features(self, team: np.ndarray):
+        """Win-rate aggregates (0.5 for empty teams) and padded encoder ids for one side"""
+        team = np.asarray(team, dtype=np.intp)
+        present = team >= 0
+        count = present.sum(axis=1)
+        has_any = count > 0
+        safe = np.where(present, team, 0)
+
+        winrates = self._winrate[safe] if len(self._winrate) else np.full(team.shape, 0.5)
+        avg = np.where(has_any, np.where(present, winrates, 0.0).sum(axis=1) / np.maximum(count, 1), 0.5)
+        high = np.where(has_any, np.where(present, winrates, -np.inf).max(axis=1, initial=-np.inf), 0.5)
+        low = np.where(has_any, np.where(present, winrates, np.inf).min(axis=1, initial=np.inf), 0.5)
+
+        ids = np.zeros((len(team), 5), dtype=np.float64)
+        slots = min(team.shape[1], 5)
+        if slots and len(self._encoded):
+            ids[:, :slots] = np.where(present, self._encoded[safe], 0)[:, :slots]
+
+        return avg, high, low, ids
+
+    @staticmethod
+    def _pad_teams(teams: List[List[int]]) -> np.ndarray:
+        """Stack teams of different sizes into one index matrix (-1 padded, at least 5 slots)"""
+        width = max([5] + [len(team) for team in teams])
+        matrix = np.full((len(teams), width), -1, dtype=np.intp)
+        for row, team in enumerate(teams):
+            matrix[row, :len(team)] = team
+        return matrix
+
+    def _resolve_team(self, champions: List[str]) -> List[int]:
+        """Registry indices of a team (any spelling: "kog maw", "KogMaw", "mf", 96)"""
+        return [self._encoder_index(c) for c in champions]
+
+    def _compile(self, model_path: str) -> Optional[CompiledForest]:
+        """Compile the forest for fast inference (None = use sklearn)"""
+        try:
+            return load_or_compile(self.model, model_path)
+        except Exception as e:
+            logger.warning(f"  Forest compilation failed, using sklearn: {e}")
+            return None
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities via the compiled forest when available"""
+        if self.compiled_model is not None and len(X) <= MAX_COMPILED_ROWS:
+            return self.compiled_model.predict_proba(X)
+        return self.model.predict_proba(X)
+
+    def _fallback_probability(self, features: List[float]) -> float:
+        """Fallback to normalized champion win rates if the model fails"""
+        blue_avg_winrate, red_avg_winrate = features[0], features[1]
+        total = blue_avg_winrate + red_avg_winrate
+        return blue_avg_winrate / total if total > 0 else 0.5
+
+    def _format_result(self, blue_win_prob: float, blue_champions: List[str], red_champions: List[str]) -> Dict:
+        """Build the prediction response dict for one matchup"""
+        red_win_prob = 1 - blue_win_prob
 
         # Calculate confidence based on team sizes and probability gap
         confidence = self._calculate_confidence(blue_win_prob, len(blue_champions), len(red_champions))
@@ -156,61 +682,24 @@ class ChampionMatchupPredictor:
             'red_avg_winrate': float(red_avg_wr)
         }
 
-    def _normalize_champion_name(self, name: str) -> str:
-        """Normalize champion name (remove spaces, preserve CamelCase)"""
-        # Remove spaces and preserve CamelCase
-        # If name has spaces, capitalize each word
-        # If name is already CamelCase (no spaces), preserve it
-        name = name.strip()
-        
-        # If it has spaces, join and capitalize each word
-        if ' ' in name:
-            normalized = ''.join(word.capitalize() for word in name.split())
-        elif name.isupper():
-            # ALL_CAPS -> convert to CamelCase
-            normalized = name.capitalize()
-        elif name.islower():
-            # all_lower -> convert to CamelCase
-            normalized = name.capitalize()
-        else:
-            # Already CamelCase - preserve as is
-            normalized = name
-        
-        return normalized
-
-    def _find_champion_in_encoder(self, champion_name: str) -> str:
-        """Find champion in encoder with case-insensitive lookup"""
-        # Try exact match first
-        if champion_name in self.champion_to_id:
-            return champion_name
-        
-        # Case-insensitive lookup
-        champion_lower = champion_name.lower()
-        for encoded_name in self.champion_to_id.keys():
-            if encoded_name.lower() == champion_lower:
-                return encoded_name
-        
-        # If still not found, raise error with suggestions
-        similar = [name for name in self.champion_to_id.keys() 
-                  if champion_lower in name.lower() or name.lower() in champion_lower][:5]
-        raise ValueError(
-            f"Unknown champion: '{champion_name}'. "
-            f"Similar champions: {similar if similar else 'None found'}"
-        )
+    def _encoder_index(self, champion: str) -> int:
+        """
+        Registry index of a champion the model was trained on
+
+        Raises:
+            ValueError: If the champion is unknown to the encoder
+        """
+        index = self.registry.require(champion)
+        if index >= len(self._encoded) or self._encoded[index] < 0:
+            raise ValueError(f"Unknown champion in encoder: '{champion}'")
+        return index
 
     def _get_champion_winrate(self, champion: str) -> float:
         """Get winrate for a single champion"""
-        # Try exact match first
-        if champion in self.champion_stats:
-            return self.champion_stats[champion].get('win_rate', 0.5)
-        
-        # Case-insensitive lookup in stats
-        champion_lower = champion.lower()
-        for stat_name in self.champion_stats.keys():
-            if stat_name.lower() == champion_lower:
-                return self.champion_stats[stat_name].get('win_rate', 0.5)
-        
-        return 0.5
+        index = self.registry.resolve(champion) if self.registry else None
+        if index is None or index >= len(self._winrate):
+            return 0.5
+        return float(self._winrate[index])
 
     def _calculate_team_winrate(self, champions: List[str]) -> float:
         """Calculate average winrate for a team of champions"""
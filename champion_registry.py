@@ -0,0 +1,283 @@
+"""
+Champion Registry
+=================
+One identity table for champions, shared by the predictors, the item
+recommender and the API routers.
+
+Champions are referred to in several ways across the project:
+- Riot numeric ids ("157", 157) - DB aggregates and teammate synergies
+- Display names ("Kog'Maw", "Master Yi") - JSON exports, model encoders
+- Riot's internal keys ("KogMaw", "MonkeyKing") - Live Client / Data Dragon
+- Player shorthand ("mf", "j4", "asol")
+
+Every form is mapped to a dense integer index through plain dict lookups,
+so resolving a name costs one normalization and one hash lookup everywhere.
+
+Usage:
+    registry = ChampionRegistry.from_sources(champion_stats, item_builds, encoder=champion_to_id)
+    index = registry.require("master yi")
+    registry.name_of(index)            # "Master Yi"
+    registry.get(champion_stats, "157") # stats entry, whatever the mapping is keyed by
+"""
+
+import difflib
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Riot's internal keys / shorthand that normalization alone does not cover
+# (normalized alias -> normalized display name)
+KNOWN_ALIASES = {
+    'monkeyking': 'wukong',
+    'nunu': 'nunuwillump',
+    'renata': 'renataglasc',
+    'mf': 'missfortune',
+    'tf': 'twistedfate',
+    'asol': 'aurelionsol',
+    'j4': 'jarvaniv',
+    'jarvan': 'jarvaniv',
+    'lb': 'leblanc',
+    'yi': 'masteryi',
+    'kog': 'kogmaw',
+    'cait': 'caitlyn',
+    'ez': 'ezreal',
+    'gp': 'gangplank',
+    'tk': 'tahmkench',
+    'xin': 'xinzhao',
+    'heimer': 'heimerdinger',
+    'blitz': 'blitzcrank',
+    'naut': 'nautilus',
+    'morde': 'mordekaiser',
+    'voli': 'volibear',
+    'kass': 'kassadin',
+    'fiddle': 'fiddlesticks',
+    'cass': 'cassiopeia',
+    'mundo': 'drmundo',
+    'lee': 'leesin',
+}
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]')
+
+ChampionRef = Union[str, int]
+
+
+class ChampionRegistry:
+    """
+    Dense champion index with O(1) resolution from any known spelling
+
+    Entries are created on first registration and never removed. Only
+    while building can an id-less entry be folded into the entry for its
+    id (see register()); indices handed out after that stay stable.
+
+    A registry is built once (from_sources) and only read afterwards: it
+    is shared between components and worker threads, so a component that
+    needs champions the registry lacks gets a new registry instead.
+    """
+
+    def __init__(self):
+        self.names: List[Optional[str]] = []    # index -> display name (None if only the id is known)
+        self.ids: List[Optional[int]] = []      # index -> Riot champion id
+        self._by_key: Dict[str, int] = {}       # normalized name / alias -> index
+        self._by_id: Dict[int, int] = {}        # Riot id -> index
+        self._raw_keys: List[List[str]] = []    # index -> every raw key registered for it
+        self._merged: Dict[int, int] = {}       # folded entry -> entry it resolves to
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, champion: ChampionRef) -> bool:
+        return self.resolve(champion) is not None
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Lowercase, alphanumerics only ("Kog'Maw" / "kog maw" / "KogMaw" -> "kogmaw")"""
+        return _NON_ALNUM.sub('', name.lower())
+
+    @staticmethod
+    def _parse_id(champion: ChampionRef) -> Optional[int]:
+        if isinstance(champion, int) and not isinstance(champion, bool):
+            return champion
+        if isinstance(champion, str) and champion.strip().isdigit():
+            return int(champion)
+        return None
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def register(self, name: Optional[str] = None, champion_id: Optional[int] = None,
+                 aliases: Iterable[str] = ()) -> int:
+        """
+        Add a champion (or more spellings of one) and return its index
+
+        A numeric name is treated as an id. If the name or id is already
+        known, the existing entry is extended, so registering
+        ("157", None) and later ("Yasuo", 157) ends up as one champion.
+        """
+        raw_key = str(name) if name is not None else None
+        if champion_id is None and name is not None:
+            champion_id = self._parse_id(name)
+            if champion_id is not None:
+                name = None
+        key = self.normalize(name) if name else None
+
+        index = self._by_id.get(champion_id) if champion_id is not None else None
+        named_index = self._by_key.get(key) if key else None
+        if index is None:
+            index = named_index
+        elif named_index is not None and named_index != index and self.ids[named_index] is None:
+            # Name-keyed and id-keyed data met before the name <-> id link was known
+            self._merge(named_index, index)
+
+        if index is None:
+            index = len(self.names)
+            self.names.append(None)
+            self.ids.append(None)
+            self._raw_keys.append([])
+
+        if name and self.names[index] is None:
+            self.names[index] = name
+        if champion_id is not None and self.ids[index] is None:
+            self.ids[index] = champion_id
+            self._by_id[champion_id] = index
+        if raw_key is not None and raw_key not in self._raw_keys[index]:
+            self._raw_keys[index].append(raw_key)
+
+        for spelling in ([name] if name else []) + list(aliases):
+            self._by_key.setdefault(self.normalize(spelling), index)
+
+        # Shorthand for this champion
+        if key:
+            for alias, target in KNOWN_ALIASES.items():
+                if target == key:
+                    self._by_key.setdefault(alias, index)
+
+        return index
+
+    def _merge(self, source: int, target: int):
+        """Fold an id-less entry into another (source keeps resolving, to target)"""
+        for key, index in self._by_key.items():
+            if index == source:
+                self._by_key[key] = target
+        self._merged[source] = target
+        if self.names[target] is None:
+            self.names[target] = self.names[source]
+        for raw_key in self._raw_keys[source]:
+            if raw_key not in self._raw_keys[target]:
+                self._raw_keys[target].append(raw_key)
+
+    def register_mapping(self, mapping: Optional[Mapping]):
+        """Register every key of a dict keyed by champion name or id"""
+        for key in (mapping or {}):
+            self.register(key)
+
+    def register_encoder(self, champion_to_id: Optional[Mapping[str, int]]):
+        """Register a model encoder (display name -> Riot id)"""
+        for name, champion_id in (champion_to_id or {}).items():
+            self.register(name, int(champion_id))
+
+    @classmethod
+    def from_sources(cls, *mappings: Optional[Mapping],
+                     encoder: Optional[Mapping[str, int]] = None) -> 'ChampionRegistry':
+        """
+        Build a registry from dicts keyed by champion name or id
+
+        The encoder (name -> id) is registered first so that id-keyed and
+        name-keyed data resolve to the same champion.
+        """
+        registry = cls()
+        registry.register_encoder(encoder)
+        for mapping in mappings:
+            registry.register_mapping(mapping)
+        return registry
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def resolve(self, champion: ChampionRef) -> Optional[int]:
+        """Index of a champion name/id/alias, or None if unknown"""
+        champion_id = self._parse_id(champion)
+        if champion_id is not None:
+            return self._by_id.get(champion_id)
+        if not isinstance(champion, str):
+            return None
+        return self._by_key.get(self.normalize(champion))
+
+    def covers(self, champion_to_id: Optional[Mapping[str, int]]) -> bool:
+        """Whether every champion of a model encoder resolves, to the entry of its id"""
+        for name, champion_id in (champion_to_id or {}).items():
+            index = self._by_id.get(int(champion_id))
+            if index is None or self.resolve(name) != index:
+                return False
+        return True
+
+    def require(self, champion: ChampionRef) -> int:
+        """
+        Index of a champion
+
+        Raises:
+            ValueError: If the champion is unknown (message lists similar names)
+        """
+        index = self.resolve(champion)
+        if index is None:
+            similar = self.suggest(str(champion))
+            raise ValueError(
+                f"Unknown champion: '{champion}'. "
+                f"Similar champions: {similar if similar else 'None found'}"
+            )
+        return index
+
+    def name_of(self, index: int) -> str:
+        """Display name (falls back to the id when no name is known)"""
+        name = self.names[index]
+        return name if name is not None else str(self.ids[index])
+
+    def id_of(self, index: int) -> Optional[int]:
+        return self.ids[index]
+
+    def canonical(self, champion: ChampionRef) -> Optional[str]:
+        """Display name for any spelling, or None if unknown"""
+        index = self.resolve(champion)
+        return self.name_of(index) if index is not None else None
+
+    def get(self, mapping: Optional[Mapping], champion: ChampionRef, default: Any = None) -> Any:
+        """
+        Look up a champion in a dict keyed by any of its registered forms
+
+        Tries the display name, the id and the raw keys registered for the
+        champion - a bounded number of dict lookups, independent of size.
+        """
+        if not mapping:
+            return default
+        if champion in mapping:
+            return mapping[champion]
+
+        index = self.resolve(champion)
+        if index is None:
+            return default
+
+        name, champion_id = self.names[index], self.ids[index]
+        for key in (name, str(champion_id) if champion_id is not None else None, *self._raw_keys[index]):
+            if key is not None and key in mapping:
+                return mapping[key]
+        return default
+
+    def suggest(self, query: str, limit: int = 5) -> List[str]:
+        """
+        Similar champion names (error messages / search only - not O(1))
+        """
+        key = self.normalize(query)
+        if not key:
+            return []
+
+        candidates = {self.name_of(i): self.normalize(self.name_of(i))
+                      for i in range(len(self)) if i not in self._merged}
+        contained = [name for name, norm in candidates.items() if key in norm or norm in key]
+        close = difflib.get_close_matches(key, list(candidates.values()), n=limit, cutoff=0.6)
+        by_norm = {norm: name for name, norm in candidates.items()}
+
+        suggestions = contained + [by_norm[norm] for norm in close if by_norm[norm] not in contained]
+        return suggestions[:limit]
@@ -0,0 +1,367 @@
+"""
+Compiled Forest Inference
+=========================
+Flattens a fitted scikit-learn RandomForest / ExtraTrees classifier into
+contiguous NumPy arrays and evaluates all trees for a whole batch with a
+vectorized level-by-level traversal (no per-tree Python loop, no sklearn
+input validation).
+
+The compiled form is saved as a .npz next to the model .pkl and is checked
+against sklearn's predict_proba before it is used.
+
+Usage:
+    python compiled_forest.py models/game_state_predictor.pkl
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the array layout changes (old .npz files are recompiled)
+FORMAT_VERSION = 1
+
+# Above this batch size sklearn's (multi-threaded, n_jobs=-1) C traversal
+# catches up, so predictors hand larger batches back to sklearn
+MAX_COMPILED_ROWS = 1024
+
+
+class CompiledForest:
+    """
+    Flat array representation of a tree ensemble classifier.
+
+    All trees are concatenated into one node table, renumbered so that the
+    right child of every split node directly follows its left child. One
+    traversal step is then `node = left[node] + (x[feature[node]] > threshold[node])`.
+    Leaves point to themselves with an infinite threshold, so a fixed number
+    of steps (max_depth) brings every tree to its leaf.
+    """
+
+    # Rows per traversal chunk (keeps the per-level working set in cache)
+    CHUNK_ROWS = 512
+
+    def __init__(self,
+                 feature: np.ndarray,
+                 threshold: np.ndarray,
+                 left: np.ndarray,
+                 leaf_value: np.ndarray,
+                 roots: np.ndarray,
+                 max_depth: int,
+                 n_features: int,
+                 classes: np.ndarray):
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)        # (n_nodes,), 0 for leaves
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)  # (n_nodes,), +inf for leaves
+        self.left = np.ascontiguousarray(left, dtype=np.intp)              # (n_nodes,), self for leaves
+        self.leaf_value = np.ascontiguousarray(leaf_value, dtype=np.float64)  # (n_nodes, n_classes)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)            # (n_trees,)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.classes_ = classes
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @classmethod
+    def from_sklearn(cls, model) -> 'CompiledForest':
+        """
+        Compile a fitted RandomForestClassifier or ExtraTreesClassifier
+
+        Raises:
+            TypeError: If the model is not a supported tree ensemble
+        """
+        if not is_compilable(model):
+            raise TypeError(f"Cannot compile model of type {type(model).__name__}")
+
+        features, thresholds, lefts, values, roots = [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            children_left = tree.children_left
+            children_right = tree.children_right
+
+            # Breadth-first renumbering: siblings get consecutive ids
+            order = np.empty(n, dtype=np.intp)      # new id -> old id
+            new_left = np.empty(n, dtype=np.intp)   # indexed by new id
+            order[0] = 0
+            next_id = 1
+            for new_id in range(n):
+                old_id = order[new_id]
+                if children_left[old_id] == -1:
+                    new_left[new_id] = new_id + offset
+                else:
+                    order[next_id] = children_left[old_id]
+                    order[next_id + 1] = children_right[old_id]
+                    new_left[new_id] = next_id + offset
+                    next_id += 2
+
+            is_leaf = children_left[order] == -1
+
+            # Per-tree class fractions (sklearn averages normalized leaf values)
+            value = tree.value[order, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+
+            features.append(np.where(is_leaf, 0, tree.feature[order]))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold[order]))
+            lefts.append(new_left)
+            values.append(value / totals)
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            leaf_value=np.concatenate(values),
+            roots=np.asarray(roots),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+            classes=np.asarray(model.classes_)
+        )
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Predict class probabilities for a batch
+
+        Args:
+            X: Array-like of shape (n_samples, n_features)
+
+        Returns:
+            Array of shape (n_samples, n_classes), same as sklearn's predict_proba
+        """
+        # sklearn evaluates splits on float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, but model expects {self.n_features}")
+
+        n_samples = X.shape[0]
+        if n_samples <= self.CHUNK_ROWS:
+            return self._predict_chunk(X)
+
+        return np.concatenate([
+            self._predict_chunk(X[start:start + self.CHUNK_ROWS])
+            for start in range(0, n_samples, self.CHUNK_ROWS)
+        ])
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        """Traverse all trees for all rows of X, one tree level per step"""
+        n_samples = X.shape[0]
+        n_trees = self.n_trees
+        X_flat = np.ascontiguousarray(X).ravel()
+
+        # Current node per (sample, tree), flattened sample-major
+        nodes = np.tile(self.roots, n_samples)
+
+        if n_samples == 1:
+            for _ in range(self.max_depth):
+                go_right = X_flat.take(self.feature.take(nodes)) > self.threshold.take(nodes)
+                nodes = self.left.take(nodes)
+                nodes += go_right
+        else:
+            row_offset = np.repeat(np.arange(n_samples, dtype=np.intp) * self.n_features, n_trees)
+            for _ in range(self.max_depth):
+                values = X_flat.take(self.feature.take(nodes) + row_offset)
+                go_right = values > self.threshold.take(nodes)
+                nodes = self.left.take(nodes)
+                nodes += go_right
+
+        leaf_values = self.leaf_value.take(nodes, axis=0)
+        return leaf_values.reshape(n_samples, n_trees, -1).mean(axis=1)
+
+    def save(self, path: str):
+        """Save compiled arrays to an uncompressed .npz (fast to load)"""
+        np.savez(
+            path,
+            format_version=np.int32(FORMAT_VERSION),
+            feature=self.feature.astype(np.int32),
+            threshold=self.threshold,
+            left=self.left.astype(np.int32),
+            leaf_value=self.leaf_value,
+            roots=self.roots.astype(np.int32),
+            max_depth=np.int32(self.max_depth),
+            n_features=np.int32(self.n_features),
+            classes=self.classes_
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledForest':
+        """Load compiled arrays from a .npz written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['format_version'])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported compiled forest format {version} (expected {FORMAT_VERSION})")
+
+            return cls(
+                feature=data['feature'],
+                threshold=data['threshold'],
+                left=data['left'],
+                leaf_value=data['leaf_value'],
+                roots=data['roots'],
+                max_depth=int(data['max_depth']),
+                n_features=int(data['n_features']),
+                classes=data['classes']
+            )
+
+
+def is_compilable(model) -> bool:
+    """Check if a model is a tree ensemble classifier we can compile"""
+    try:
+        from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+    except ImportError:
+        return False
+
+    return isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)) and hasattr(model, 'estimators_')
+
+
+def compiled_path_for(model_path: str) -> Path:
+    """Path of the compiled .npz stored next to a model .pkl"""
+    return Path(model_path).with_suffix('.npz')
+
+
+def make_parity_sample(compiled: CompiledForest, n_samples: int = 256, seed: int = 0) -> np.ndarray:
+    """
+    Build inputs that exercise both sides of the forest's split thresholds
+
+    Each feature value is drawn from that feature's own thresholds,
+    nudged slightly up or down (or exactly on the threshold).
+    """
+    rng = np.random.default_rng(seed)
+    X = np.zeros((n_samples, compiled.n_features), dtype=np.float64)
+    is_split = np.isfinite(compiled.threshold)
+
+    for f in range(compiled.n_features):
+        thresholds = compiled.threshold[is_split & (compiled.feature == f)]
+        if len(thresholds) == 0:
+            continue
+        picks = rng.choice(thresholds, size=n_samples)
+        nudge = rng.choice([-1.0, 0.0, 1.0], size=n_samples) * np.maximum(np.abs(picks), 1.0) * 1e-3
+        X[:, f] = picks + nudge
+
+    return X
+
+
+def check_parity(compiled: CompiledForest, model, X: Optional[np.ndarray] = None, atol: float = 1e-9) -> float:
+    """
+    Compare compiled probabilities against sklearn's predict_proba
+
+    Returns:
+        Max absolute probability difference
+
+    Raises:
+        ValueError: If the difference exceeds atol
+    """
+    if X is None:
+        X = make_parity_sample(compiled)
+
+    expected = model.predict_proba(X)
+    actual = compiled.predict_proba(X)
+    max_diff = float(np.max(np.abs(expected - actual))) if len(X) else 0.0
+
+    if max_diff > atol:
+        raise ValueError(f"Compiled forest does not match sklearn (max diff {max_diff:.2e})")
+
+    return max_diff
+
+
+def load_or_compile(model, model_path: str) -> Optional[CompiledForest]:
+    """
+    Get the compiled form of a model, reusing the .npz next to the .pkl
+
+    The .npz is only reused if it is at least as new as the .pkl. Freshly
+    compiled forests are saved (best effort - read-only filesystems such as
+    serverless deployments just skip the write). Both paths are
+    parity-checked against sklearn before being returned.
+
+    Returns:
+        CompiledForest, or None if the model is not a compilable tree ensemble
+        or the parity check fails (callers fall back to sklearn)
+    """
+    if not is_compilable(model):
+        return None
+
+    npz_path = compiled_path_for(model_path)
+    compiled = None
+
+    try:
+        pkl_mtime = Path(model_path).stat().st_mtime
+        if npz_path.exists() and npz_path.stat().st_mtime >= pkl_mtime:
+            compiled = CompiledForest.load(str(npz_path))
+            logger.info(f"  Compiled forest loaded from {npz_path}")
+    except Exception as e:
+        logger.warning(f"  Ignoring compiled forest {npz_path}: {e}")
+        compiled = None
+
+    fresh = compiled is None
+    if fresh:
+        compiled = CompiledForest.from_sklearn(model)
+
+    try:
+        check_parity(compiled, model)
+    except ValueError as e:
+        logger.warning(f"  {e} - falling back to sklearn predict_proba")
+        return None
+
+    if fresh:
+        try:
+            compiled.save(str(npz_path))
+            logger.info(f"  Compiled forest saved to {npz_path} ({compiled.n_trees} trees, {compiled.n_nodes} nodes)")
+        except OSError as e:
+            logger.warning(f"  Could not save compiled forest to {npz_path}: {e}")
+
+    return compiled
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    import joblib
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if len(sys.argv) < 2:
+        print("Usage: python compiled_forest.py <model.pkl> [<model.pkl> ...]")
+        sys.exit(1)
+
+    for model_path in sys.argv[1:]:
+        data = joblib.load(model_path)
+        model = data.get('model') if isinstance(data, dict) else data
+
+        compiled = load_or_compile(model, model_path)
+        if compiled is None:
+            print(f"{model_path}: not compilable ({type(model).__name__})")
+            continue
+
+        X = make_parity_sample(compiled, n_samples=10000, seed=1)
+        max_diff = check_parity(compiled, model, X)
+
+        def _bench(fn, rows, repeat):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                fn(rows)
+            return (time.perf_counter() - start) / repeat
+
+        single = X[:1]
+        sk_single = _bench(model.predict_proba, single, 50)
+        cf_single = _bench(compiled.predict_proba, single, 500)
+        sk_batch = _bench(model.predict_proba, X, 3)
+        cf_batch = _bench(compiled.predict_proba, X, 3)
+
+        print(f"{model_path}: {compiled.n_trees} trees, {compiled.n_nodes} nodes, depth {compiled.max_depth}")
+        print(f"  parity max diff: {max_diff:.2e} ({len(X)} rows)")
+        print(f"  single row: sklearn {sk_single * 1e6:.0f}µs | compiled {cf_single * 1e6:.0f}µs")
+        print(f"  batch {len(X)}: sklearn {len(X) / sk_batch:,.0f} rows/s | compiled {len(X) / cf_batch:,.0f} rows/s")
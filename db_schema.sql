@@ -6,6 +6,8 @@
 -- ========================================
 
 -- Drop existing tables if they exist (for clean re-runs)
+DROP TABLE IF EXISTS champion_pair_agg CASCADE;
+DROP TABLE IF EXISTS champion_agg CASCADE;
 DROP TABLE IF EXISTS match_snapshots CASCADE;
 DROP TABLE IF EXISTS match_champions CASCADE;
 DROP TABLE IF EXISTS matches CASCADE;
@@ -126,6 +128,193 @@ COMMENT ON TABLE match_snapshots IS 'Game state snapshots at 10min, 15min, 20min
 COMMENT ON COLUMN match_snapshots.snapshot_time IS 'Time in minutes (10, 15, or 20)';
 COMMENT ON COLUMN match_snapshots.gold_diff IS 'Blue gold - Red gold (positive = blue advantage)';
 
+-- ========================================
+-- 4. AGGREGATE TABLES
+-- ========================================
+-- Running totals per champion and per champion pair, kept current by
+-- triggers as matches are inserted, deleted or re-scored. API startup
+-- reads these (bounded by the champion count) instead of aggregating
+-- every match.
+--
+-- This section is idempotent: run it on an existing database, then
+-- backfill once with
+--     SELECT rebuild_champion_aggregates();
+-- or: python scripts/rebuild_champion_aggregates.py
+--
+-- Bulk loads: disable trg_champion_agg_insert on match_champions for the
+-- load, re-enable it and rebuild. Deleting individual match_champions
+-- rows (rather than their match) is not tracked; rebuild afterwards.
+
+CREATE TABLE IF NOT EXISTS champion_agg (
+    champion_id INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_champion_agg_games ON champion_agg(games DESC);
+
+CREATE TABLE IF NOT EXISTS champion_pair_agg (
+    champion_lo INTEGER NOT NULL,
+    champion_hi INTEGER NOT NULL,
+    same_team BOOLEAN NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (champion_lo, champion_hi, same_team),
+    CHECK (champion_lo < champion_hi)
+);
+
+CREATE INDEX IF NOT EXISTS idx_champion_pair_agg_games ON champion_pair_agg(same_team, games DESC);
+
+COMMENT ON TABLE champion_agg IS 'Games and wins per champion (maintained by triggers)';
+COMMENT ON TABLE champion_pair_agg IS 'Games and wins per champion pair, as teammates or opponents (maintained by triggers)';
+COMMENT ON COLUMN champion_pair_agg.wins IS 'same_team: games the pair won; opponents: games champion_lo won';
+
+-- New champion picks: count each new row, and each pair it forms with the
+-- match's other rows (pairs of two new rows once, via the lower id)
+CREATE OR REPLACE FUNCTION champion_agg_insert() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO champion_agg (champion_id, games, wins)
+    SELECT n.champion_id,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE m.blue_win = (n.team = 'blue'))
+    FROM new_rows n
+    JOIN matches m ON m.match_id = n.match_id
+    GROUP BY n.champion_id
+    ON CONFLICT (champion_id) DO UPDATE
+        SET games = champion_agg.games + EXCLUDED.games,
+            wins = champion_agg.wins + EXCLUDED.wins;
+
+    INSERT INTO champion_pair_agg (champion_lo, champion_hi, same_team, games, wins)
+    SELECT LEAST(a.champion_id, b.champion_id),
+           GREATEST(a.champion_id, b.champion_id),
+           a.team = b.team,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE m.blue_win =
+               ((CASE WHEN a.champion_id < b.champion_id THEN a.team ELSE b.team END) = 'blue'))
+    FROM new_rows a
+    JOIN match_champions b ON b.match_id = a.match_id AND b.id <> a.id
+    JOIN matches m ON m.match_id = a.match_id
+    WHERE a.champion_id <> b.champion_id
+      AND (a.id < b.id OR NOT EXISTS (SELECT 1 FROM new_rows n WHERE n.id = b.id))
+    GROUP BY 1, 2, 3
+    ON CONFLICT (champion_lo, champion_hi, same_team) DO UPDATE
+        SET games = champion_pair_agg.games + EXCLUDED.games,
+            wins = champion_pair_agg.wins + EXCLUDED.wins;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add (sign = 1) or remove (sign = -1) one match's contribution
+CREATE OR REPLACE FUNCTION champion_agg_apply_match(p_match_id VARCHAR, p_blue_win BOOLEAN, p_sign INTEGER)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO champion_agg (champion_id, games, wins)
+    SELECT champion_id,
+           p_sign * COUNT(*),
+           p_sign * COUNT(*) FILTER (WHERE p_blue_win = (team = 'blue'))
+    FROM match_champions
+    WHERE match_id = p_match_id
+    GROUP BY champion_id
+    ON CONFLICT (champion_id) DO UPDATE
+        SET games = champion_agg.games + EXCLUDED.games,
+            wins = champion_agg.wins + EXCLUDED.wins;
+
+    INSERT INTO champion_pair_agg (champion_lo, champion_hi, same_team, games, wins)
+    SELECT LEAST(a.champion_id, b.champion_id),
+           GREATEST(a.champion_id, b.champion_id),
+           a.team = b.team,
+           p_sign * COUNT(*),
+           p_sign * COUNT(*) FILTER (WHERE p_blue_win =
+               ((CASE WHEN a.champion_id < b.champion_id THEN a.team ELSE b.team END) = 'blue'))
+    FROM match_champions a
+    JOIN match_champions b ON b.match_id = a.match_id AND a.id < b.id
+    WHERE a.match_id = p_match_id
+      AND a.champion_id <> b.champion_id
+    GROUP BY 1, 2, 3
+    ON CONFLICT (champion_lo, champion_hi, same_team) DO UPDATE
+        SET games = champion_pair_agg.games + EXCLUDED.games,
+            wins = champion_pair_agg.wins + EXCLUDED.wins;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Deleted match: its picks still exist BEFORE the cascade removes them
+CREATE OR REPLACE FUNCTION champion_agg_match_delete() RETURNS trigger AS $$
+BEGIN
+    PERFORM champion_agg_apply_match(OLD.match_id, OLD.blue_win, -1);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Corrected result: move the match's wins to the other side
+CREATE OR REPLACE FUNCTION champion_agg_match_update() RETURNS trigger AS $$
+BEGIN
+    PERFORM champion_agg_apply_match(OLD.match_id, OLD.blue_win, -1);
+    PERFORM champion_agg_apply_match(NEW.match_id, NEW.blue_win, 1);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION champion_agg_truncate() RETURNS trigger AS $$
+BEGIN
+    TRUNCATE champion_agg, champion_pair_agg;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_champion_agg_insert ON match_champions;
+CREATE TRIGGER trg_champion_agg_insert
+    AFTER INSERT ON match_champions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION champion_agg_insert();
+
+DROP TRIGGER IF EXISTS trg_champion_agg_truncate ON match_champions;
+CREATE TRIGGER trg_champion_agg_truncate
+    AFTER TRUNCATE ON match_champions
+    FOR EACH STATEMENT EXECUTE FUNCTION champion_agg_truncate();
+
+DROP TRIGGER IF EXISTS trg_champion_agg_match_delete ON matches;
+CREATE TRIGGER trg_champion_agg_match_delete
+    BEFORE DELETE ON matches
+    FOR EACH ROW EXECUTE FUNCTION champion_agg_match_delete();
+
+DROP TRIGGER IF EXISTS trg_champion_agg_match_update ON matches;
+CREATE TRIGGER trg_champion_agg_match_update
+    AFTER UPDATE OF blue_win ON matches
+    FOR EACH ROW WHEN (OLD.blue_win IS DISTINCT FROM NEW.blue_win)
+    EXECUTE FUNCTION champion_agg_match_update();
+
+-- Recompute both tables from scratch (backfills, bulk loads)
+CREATE OR REPLACE FUNCTION rebuild_champion_aggregates() RETURNS void AS $$
+BEGIN
+    -- Hold off concurrent inserts so no match is counted twice or missed
+    LOCK TABLE match_champions IN SHARE MODE;
+    TRUNCATE champion_agg, champion_pair_agg;
+
+    INSERT INTO champion_agg (champion_id, games, wins)
+    SELECT mc.champion_id,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE m.blue_win = (mc.team = 'blue'))
+    FROM match_champions mc
+    JOIN matches m ON m.match_id = mc.match_id
+    GROUP BY mc.champion_id;
+
+    INSERT INTO champion_pair_agg (champion_lo, champion_hi, same_team, games, wins)
+    SELECT LEAST(a.champion_id, b.champion_id),
+           GREATEST(a.champion_id, b.champion_id),
+           a.team = b.team,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE m.blue_win =
+               ((CASE WHEN a.champion_id < b.champion_id THEN a.team ELSE b.team END) = 'blue'))
+    FROM match_champions a
+    JOIN match_champions b ON b.match_id = a.match_id AND a.id < b.id
+    JOIN matches m ON m.match_id = a.match_id
+    WHERE a.champion_id <> b.champion_id
+    GROUP BY 1, 2, 3;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ========================================
 -- VERIFICATION QUERIES
 -- ========================================
@@ -133,7 +322,8 @@ COMMENT ON COLUMN match_snapshots.gold_diff IS 'Blue gold - Red gold (positive =
 
 -- Check tables exist
 SELECT table_name FROM information_schema.tables
-WHERE table_schema = 'public' AND table_name IN ('matches', 'match_champions', 'match_snapshots');
+WHERE table_schema = 'public' AND table_name IN ('matches', 'match_champions', 'match_snapshots',
+                                                 'champion_agg', 'champion_pair_agg');
 
 -- Check row counts (should be 0 initially)
 SELECT
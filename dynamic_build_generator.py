@@ -18,6 +18,13 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from champion_registry import ChampionRegistry
+
+# Champion groups used by the composition heuristics (matched by canonical name)
+HEALERS = ('Soraka', 'Yuumi', 'Sona', 'Nami')
+ASSASSINS = ('Zed', 'Talon', 'Katarina', 'Fizz')
+AD_MIDS = ('Zed', 'Talon')
+
 
 class GameState(Enum):
     """Current game state"""
@@ -60,7 +67,8 @@ class ItemBuildPath:
 class DynamicBuildGenerator:
     """Generates dynamic, AI-powered item builds"""
 
-    def __init__(self, data_dir='./data/champion_data', champion_stats: Dict = None, item_builds: Dict = None):
+    def __init__(self, data_dir='./data/champion_data', champion_stats: Dict = None, item_builds: Dict = None,
+                 registry: ChampionRegistry = None):
         """
         Initialize Dynamic Build Generator
 
@@ -68,6 +76,7 @@ class DynamicBuildGenerator:
             data_dir: Legacy parameter (not used when champion_stats/item_builds provided)
             champion_stats: Dict of champion stats from database (recommended)
             item_builds: Dict of item builds from database (recommended)
+            registry: Shared ChampionRegistry, only read (one is built from the data if None)
         """
         self.data_dir = Path(data_dir)
 
@@ -89,8 +98,23 @@ class DynamicBuildGenerator:
             self.item_builds = self._load_json('item_builds.json')
             print(f"⚠️  Loading item builds from JSON fallback")
 
+        self.attach_registry(registry)
+
         print(f"✓ Loaded {len(self.items)} items")
 
+    def attach_registry(self, registry: ChampionRegistry = None):
+        """Resolve champion names (any spelling, id or alias) through a shared registry (only read)"""
+        if registry is None:
+            registry = ChampionRegistry.from_sources(self.item_builds, self.champion_stats)
+        self.registry = registry
+        self._healers = {self._canonical(name) for name in HEALERS}
+        self._assassins = {self._canonical(name) for name in ASSASSINS}
+        self._ad_mids = {self._canonical(name) for name in AD_MIDS}
+
+    def _canonical(self, name: str) -> str:
+        """Registry display name (the name as given if the registry does not know it)"""
+        return self.registry.canonical(name) or name
+
     def _load_json(self, filename: str) -> dict:
         """Load JSON file (legacy fallback)"""
         path = self.data_dir / filename
@@ -378,26 +402,27 @@ class DynamicBuildGenerator:
         }
 
         for champ in enemy_team:
-            analysis['roles'][champ.name] = champ.role
+            name = self._canonical(champ.name)
+            analysis['roles'][name] = champ.role
 
             # Role-based categorization
             if champ.role == 'Support':
                 analysis['support_count'] += 1
                 # Simplified: Assume some supports are healers
-                if champ.name in ['Soraka', 'Yuumi', 'Sona', 'Nami']:
+                if name in self._healers:
                     analysis['has_healer'] = True
 
             # Simplified AD/AP detection (would use actual champion data)
             # For now, use heuristics based on typical roles
             if champ.role in ['ADC', 'Top']:
                 analysis['ad_count'] += 1
-            if champ.role in ['Mid', 'Support'] and champ.name not in ['Zed', 'Talon']:
+            if champ.role in ['Mid', 'Support'] and name not in self._ad_mids:
                 analysis['ap_count'] += 1
 
             # Detect threats
-            if champ.name in ['Zed', 'Talon', 'Katarina', 'Fizz']:
+            if name in self._assassins:
                 analysis['assassin_count'] += 1
-                analysis['threats'].append(f"{champ.name} ({champ.role})")
+                analysis['threats'].append(f"{name} ({champ.role})")
 
         analysis['is_ad_heavy'] = analysis['ad_count'] >= 3
         analysis['is_ap_heavy'] = analysis['ap_count'] >= 3
@@ -594,7 +619,7 @@ class DynamicBuildGenerator:
         """Generate human-readable explanation of the build"""
 
         parts = []
-        parts.append(f"Build for {champion.name} ({champion.role})")
+        parts.append(f"Build for {self._canonical(champion.name)} ({champion.role})")
 
         if game_state == GameState.LEADING:
             parts.append("🔥 When ahead: Focus on snowballing with damage items")
@@ -8,14 +8,20 @@ Model Accuracy: 79.28% (20-minute snapshot)
 Trained on: 10,000 matches with timeline data
 """
 
+import itertools
 import joblib
 import numpy as np
 import logging
 from pathlib import Path
 from typing import Dict, Optional, List
 
+from compiled_forest import CompiledForest, MAX_COMPILED_ROWS, load_or_compile
+
 logger = logging.getLogger(__name__)
 
+# Process-wide, so a new predictor never reuses an old version (see PredictionCache)
+_versions = itertools.count(1)
+
 
 class GameStatePredictor:
     """
@@ -30,10 +36,12 @@ class GameStatePredictor:
     
     def __init__(self):
         self.model = None
+        self.compiled_model: Optional[CompiledForest] = None
         self.feature_names: List[str] = []
         self.snapshot_time: int = 20  # Default: 20-minute snapshot
         self.metadata: Dict = {}
         self.is_loaded = False
+        self.version = next(_versions)  # renewed on every load
     
     def load_model(self, model_path: str = './models/game_state_predictor.pkl') -> bool:
         """Load the trained game state predictor model"""
@@ -44,12 +52,15 @@ class GameStatePredictor:
             self.feature_names = model_package['feature_names']
             self.snapshot_time = model_package.get('snapshot_time', 20)
             self.metadata = model_package.get('metadata', {})
+            self.compiled_model = self._compile(model_path)
             self.is_loaded = True
+            self.version = next(_versions)
             
             logger.info(f"✓ Game State Predictor loaded from {model_path}")
             logger.info(f"  Snapshot time: {self.snapshot_time} minutes")
             logger.info(f"  Features: {len(self.feature_names)}")
             logger.info(f"  Accuracy: {self.metadata.get('accuracy', 0)*100:.2f}%")
+            logger.info(f"  Compiled inference: {'enabled' if self.compiled_model else 'disabled (sklearn)'}")
             
             return True
             
@@ -101,44 +112,105 @@ class GameStatePredictor:
         """
         if not self.is_loaded:
             raise RuntimeError("Model not loaded. Call load_model() first.")
-        
+
+        state = {
+            'blue_gold': blue_gold, 'red_gold': red_gold,
+            'blue_xp': blue_xp, 'red_xp': red_xp,
+            'blue_level': blue_level, 'red_level': red_level,
+            'blue_cs': blue_cs, 'red_cs': red_cs,
+            'blue_kills': blue_kills, 'red_kills': red_kills,
+            'blue_dragons': blue_dragons, 'red_dragons': red_dragons,
+            'blue_barons': blue_barons, 'red_barons': red_barons,
+            'blue_towers': blue_towers, 'red_towers': red_towers,
+        }
+
+        # Build feature array in correct order
+        X = np.array([self._build_feature_row(state)])
+
+        # Predict
+        blue_prob = float(self._predict_proba(X)[0][1])
+
+        return self._format_result(blue_prob, state)
+
+    def predict_batch(self, game_states: List[Dict]) -> List[Dict]:
+        """
+        Predict win probabilities for many game states at once.
+
+        Args:
+            game_states: List of dicts with the same keys as predict()'s
+                arguments (objective counts default to 0)
+
+        Returns:
+            List of prediction dicts (same format as predict()), in input order
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Call load_model() first.")
+
+        if not game_states:
+            return []
+
+        X = np.array([self._build_feature_row(state) for state in game_states])
+
+        # One vectorized call for the whole batch
+        blue_probs = self._predict_proba(X)[:, 1]
+
+        return [
+            self._format_result(float(prob), state)
+            for prob, state in zip(blue_probs, game_states)
+        ]
+
+    def _compile(self, model_path: str) -> Optional[CompiledForest]:
+        """Compile the forest for fast inference (None = use sklearn)"""
+        try:
+            return load_or_compile(self.model, model_path)
+        except Exception as e:
+            logger.warning(f"  Forest compilation failed, using sklearn: {e}")
+            return None
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities via the compiled forest when available"""
+        if self.compiled_model is not None and len(X) <= MAX_COMPILED_ROWS:
+            return self.compiled_model.predict_proba(X)
+        return self.model.predict_proba(X)
+
+    def _build_feature_row(self, state: Dict) -> List[float]:
+        """Build one model input row (ordered like self.feature_names)"""
         # Calculate diffs
-        gold_diff = blue_gold - red_gold
-        xp_diff = blue_xp - red_xp
-        kill_diff = blue_kills - red_kills
-        
+        gold_diff = state['blue_gold'] - state['red_gold']
+        xp_diff = state['blue_xp'] - state['red_xp']
+        kill_diff = state['blue_kills'] - state['red_kills']
+
         # Build feature vector in the correct order
         snapshot_prefix = f't{self.snapshot_time}_'
-        
+
         feature_values = {
-            f'{snapshot_prefix}blue_gold': blue_gold,
-            f'{snapshot_prefix}red_gold': red_gold,
+            f'{snapshot_prefix}blue_gold': state['blue_gold'],
+            f'{snapshot_prefix}red_gold': state['red_gold'],
             f'{snapshot_prefix}gold_diff': gold_diff,
-            f'{snapshot_prefix}blue_xp': blue_xp,
-            f'{snapshot_prefix}red_xp': red_xp,
+            f'{snapshot_prefix}blue_xp': state['blue_xp'],
+            f'{snapshot_prefix}red_xp': state['red_xp'],
             f'{snapshot_prefix}xp_diff': xp_diff,
-            f'{snapshot_prefix}blue_level': blue_level,
-            f'{snapshot_prefix}red_level': red_level,
-            f'{snapshot_prefix}blue_cs': blue_cs,
-            f'{snapshot_prefix}red_cs': red_cs,
-            f'{snapshot_prefix}blue_dragons': blue_dragons,
-            f'{snapshot_prefix}red_dragons': red_dragons,
-            f'{snapshot_prefix}blue_barons': blue_barons,
-            f'{snapshot_prefix}red_barons': red_barons,
-            f'{snapshot_prefix}blue_towers': blue_towers,
-            f'{snapshot_prefix}red_towers': red_towers,
-            f'{snapshot_prefix}blue_kills': blue_kills,
-            f'{snapshot_prefix}red_kills': red_kills,
+            f'{snapshot_prefix}blue_level': state['blue_level'],
+            f'{snapshot_prefix}red_level': state['red_level'],
+            f'{snapshot_prefix}blue_cs': state['blue_cs'],
+            f'{snapshot_prefix}red_cs': state['red_cs'],
+            f'{snapshot_prefix}blue_dragons': state.get('blue_dragons', 0),
+            f'{snapshot_prefix}red_dragons': state.get('red_dragons', 0),
+            f'{snapshot_prefix}blue_barons': state.get('blue_barons', 0),
+            f'{snapshot_prefix}red_barons': state.get('red_barons', 0),
+            f'{snapshot_prefix}blue_towers': state.get('blue_towers', 0),
+            f'{snapshot_prefix}red_towers': state.get('red_towers', 0),
+            f'{snapshot_prefix}blue_kills': state['blue_kills'],
+            f'{snapshot_prefix}red_kills': state['red_kills'],
             f'{snapshot_prefix}kill_diff': kill_diff,
         }
-        
-        # Build feature array in correct order
-        X = np.array([[feature_values.get(fname, 0) for fname in self.feature_names]])
-        
-        # Predict
-        blue_prob = float(self.model.predict_proba(X)[0][1])
+
+        return [feature_values.get(fname, 0) for fname in self.feature_names]
+
+    def _format_result(self, blue_prob: float, state: Dict) -> Dict:
+        """Build the prediction response dict for one game state"""
         red_prob = 1 - blue_prob
-        
+
         # Determine prediction text and confidence
         if blue_prob > 0.7:
             prediction = "Blue Team strongly favored"
@@ -155,24 +227,24 @@ class GameStatePredictor:
         else:
             prediction = "Even game"
             confidence = "low"
-        
+
         return {
             'blue_win_probability': round(blue_prob, 4),
             'red_win_probability': round(red_prob, 4),
             'prediction': prediction,
             'confidence': confidence,
             'details': {
-                'gold_diff': gold_diff,
-                'xp_diff': xp_diff,
-                'kill_diff': kill_diff,
-                'tower_diff': blue_towers - red_towers,
-                'dragon_diff': blue_dragons - red_dragons,
+                'gold_diff': state['blue_gold'] - state['red_gold'],
+                'xp_diff': state['blue_xp'] - state['red_xp'],
+                'kill_diff': state['blue_kills'] - state['red_kills'],
+                'tower_diff': state.get('blue_towers', 0) - state.get('red_towers', 0),
+                'dragon_diff': state.get('blue_dragons', 0) - state.get('red_dragons', 0),
                 'snapshot_time': self.snapshot_time,
                 'model': 'game_state_predictor',
                 'accuracy': f"{self.metadata.get('accuracy', 0)*100:.2f}%"
             }
         }
-    
+
     def get_model_info(self) -> Dict:
         """Get model metadata"""
         return {
@@ -0,0 +1,57 @@
+"""
+Gunicorn configuration - multi-worker deployment with shared model memory
+=========================================================================
+
+    gunicorn api.index:app        (this file is picked up automatically)
+
+With SHARED_MODEL_MEMORY=true (default) the app and every MLEngine
+component are loaded once in the master process, before the workers are
+forked. Workers then share those pages copy-on-write instead of each
+loading its own copy of the forests and champion data:
+
+- Snapshot arrays (api/services/engine_snapshot.py) are mmapped read-only
+  and shared through the page cache regardless of process model.
+- Python objects (champion dicts, sklearn models) are shared as long as
+  nothing writes to their pages. The cyclic GC would, by updating object
+  headers during collections, so the master disables GC while loading and
+  gc.freeze()s everything it loaded just before forking; workers re-enable
+  GC for their own (new) objects only.
+
+Measure the effect with:
+    python scripts/measure_worker_memory.py --compare
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+preload_app = os.getenv("SHARED_MODEL_MEMORY", "true").lower() == "true"
+
+if preload_app:
+    # Objects created from here on are never moved between GC generations in the master
+    gc.disable()
+
+
+def when_ready(server):
+    """Master: app is imported (preload_app), workers not forked yet"""
+    if not preload_app:
+        return
+
+    from api.services.ml_engine import ml_engine
+
+    ml_engine.preload()
+    # Preloading may have queried the database: pooled connections must not cross fork()
+    from api.core.database import close_pool
+    close_pool()
+    gc.freeze()
+    server.log.info(f"Models preloaded in master, {gc.get_freeze_count()} objects frozen")
+
+
+def post_fork(server, worker):
+    """Worker: collect only objects created after the fork"""
+    if preload_app:
+        gc.enable()
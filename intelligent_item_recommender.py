@@ -17,11 +17,14 @@ from typing import List, Dict, Optional, Tuple
 from collections import defaultdict, Counter
 import difflib
 
+from champion_registry import ChampionRegistry
+
 
 class IntelligentItemRecommender:
     """Intelligenter Item-Recommender mit Heuristik"""
 
-    def __init__(self, data_dir='./data/champion_data', champion_stats: Dict = None, item_builds: Dict = None):
+    def __init__(self, data_dir='./data/champion_data', champion_stats: Dict = None, item_builds: Dict = None,
+                 registry: ChampionRegistry = None):
         """
         Initialize Item Recommender
 
@@ -29,6 +32,7 @@ class IntelligentItemRecommender:
             data_dir: Legacy parameter (not used when champion_stats/item_builds provided)
             champion_stats: Dict of champion stats from database (recommended)
             item_builds: Dict of item builds from database (recommended)
+            registry: Shared ChampionRegistry, only read (one is built from the data if None)
         """
         self.data_dir = Path(data_dir)
 
@@ -53,6 +57,17 @@ class IntelligentItemRecommender:
             list(self.item_builds.keys())
         ))
 
+        # Exact lookups (any spelling, id or alias) go through the registry;
+        # difflib is only used for typos and search
+        if registry is None:
+            registry = ChampionRegistry.from_sources(self.item_builds, self.champion_stats)
+        self.registry = registry
+        self._key_by_index = {}  # registry index -> our key (item_builds keys preferred)
+        for name in list(self.item_builds.keys()) + list(self.champion_stats.keys()):
+            index = self.registry.resolve(name)
+            if index is not None:
+                self._key_by_index.setdefault(index, name)
+
         print(f"✓ Total {len(self.champion_names)} unique champions")
 
     def _load_json(self, filename: str) -> dict:
@@ -107,8 +122,9 @@ class IntelligentItemRecommender:
     def get_champion_stats(self, champion: str) -> Optional[Dict]:
         """Holt Champion Stats mit Fuzzy Matching"""
         # Try exact match first
-        if champion in self.champion_stats:
-            return self.champion_stats[champion]
+        stats = self.registry.get(self.champion_stats, champion)
+        if stats is not None:
+            return stats
 
         # Fuzzy match
         matches = self.fuzzy_find_champion(champion, threshold=0.7)
@@ -265,9 +281,10 @@ class IntelligentItemRecommender:
 
     def _find_best_champion_match(self, champion: str) -> Optional[str]:
         """Findet den besten Champion-Match"""
-        # Exact match
-        if champion in self.champion_names:
-            return champion
+        # Exact match (any spelling, id or alias)
+        index = self.registry.resolve(champion)
+        if index in self._key_by_index:
+            return self._key_by_index[index]
 
         # Fuzzy match
         matches = self.fuzzy_find_champion(champion, threshold=0.7)
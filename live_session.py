@@ -0,0 +1,251 @@
+"""
+Live Session Recording
+======================
+Append-only recordings of the Live Client's `allgamedata` payloads, so a
+real game can be replayed through the live prediction path offline
+(scripts/replay_live_session.py, scripts/live_client_standin.py).
+
+A session file is gzip-compressed JSON Lines, one record per payload:
+    {"t": <unix time of the poll>, "data": <allgamedata payload>}
+Consecutive payloads share one compression stream, and every record ends
+with a zlib sync flush: the file is readable up to the last record while
+it is still being written, and a crash loses at most the record in
+flight. Reopening a file appends a new gzip member; gzip readers (and
+zcat) see one stream.
+
+snapshot_diff() turns two consecutive payloads into the diff format
+accepted by PATCH /api/live/sessions/{id} (scripts/live_agent.py).
+
+Usage:
+    client.recorder = SessionRecorder('recordings')   # one file per game
+    for timestamp, payload in read_session(path): ...
+    diff = snapshot_diff(previous, payload)            # None: send the full payload
+
+    python live_session.py record --output recordings [--url ...] [--interval 1]
+    python live_session.py info recordings/session_20260101_201500.jsonl.gz
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SESSION_SUFFIX = '.jsonl.gz'
+# Player fields carried by diffs (what the live prediction path reads)
+DIFF_PLAYER_FIELDS = ('currentGold', 'level')
+
+
+class SessionRecorder:
+    """
+    Writes allgamedata payloads to session files, one file per game
+
+    A new file is started on the first payload and whenever the game time
+    goes backwards (a new game, or the client restarted). Safe to call
+    from several threads.
+    """
+
+    def __init__(self, directory: Union[str, Path], prefix: str = 'session', compresslevel: int = 6):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.compresslevel = compresslevel
+        self.path: Optional[Path] = None
+        self._file: Optional[gzip.GzipFile] = None
+        self._game_time = 0.0
+        self._lock = threading.Lock()
+
+        self.sessions = 0
+        self.records = 0
+        self.bytes_in = 0
+
+    def record(self, payload: Dict, timestamp: Optional[float] = None):
+        """Append one payload (timestamp: unix time, default now)"""
+        line = json.dumps(
+            {'t': round(time.time() if timestamp is None else timestamp, 3), 'data': payload},
+            separators=(',', ':')
+        ).encode() + b'\n'
+        game_time = float((payload.get('gameData') or {}).get('gameTime') or 0.0)
+
+        with self._lock:
+            if self._file is None or game_time < self._game_time:
+                self._open_next()
+            self._game_time = game_time
+            self._file.write(line)
+            self._file.flush(zlib.Z_SYNC_FLUSH)
+            self.records += 1
+            self.bytes_in += len(line)
+
+    def _open_next(self):
+        self._close_file()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.prefix}_{time.strftime('%Y%m%d_%H%M%S')}"
+        path = self.directory / f"{stem}{SESSION_SUFFIX}"
+        counter = 2
+        while path.exists():
+            path = self.directory / f"{stem}_{counter}{SESSION_SUFFIX}"
+            counter += 1
+        self._file = gzip.open(path, 'ab', compresslevel=self.compresslevel)
+        self.path = path
+        self.sessions += 1
+        logger.info(f"Recording live session to {path}")
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """Finish the current session file"""
+        with self._lock:
+            self._close_file()
+
+    def get_stats(self) -> Dict:
+        """Recorder metrics for health/monitoring endpoints"""
+        return {
+            'path': str(self.path) if self.path else None,
+            'sessions': self.sessions,
+            'records': self.records,
+            'bytes_in': self.bytes_in
+        }
+
+
+def read_session(path: Union[str, Path]) -> Iterator[Tuple[float, Dict]]:
+    """
+    Yield (timestamp, payload) for every complete record of a session file
+
+    A file that is still being written (or was cut off) is read up to its
+    last complete record.
+    """
+    with gzip.open(path, 'rb') as f:
+        while True:
+            try:
+                line = f.readline()
+            except EOFError:
+                return  # no end-of-stream marker yet
+            if not line:
+                return
+            if not line.endswith(b'\n'):
+                return  # record in flight
+            record = json.loads(line)
+            yield record['t'], record['data']
+
+
+def snapshot_diff(previous: Dict, current: Dict) -> Optional[Dict]:
+    """
+    Changes from one allgamedata payload to the next, as a partial payload
+
+    - gameData: the current gameTime
+    - allPlayers: only players with changes, identified by summonerName,
+      with only the changed scores / currentGold / level
+    - events.Events: only events after the previous payload's last EventID
+
+    Returns None when a diff cannot describe the change (other lineup, or
+    the game time went back): send the full payload instead.
+    """
+    before = {p.get('summonerName'): p for p in previous.get('allPlayers', [])}
+    players = current.get('allPlayers', [])
+    if [p.get('summonerName') for p in players] != list(before):
+        return None
+    game_time = (current.get('gameData') or {}).get('gameTime', 0)
+    if game_time < (previous.get('gameData') or {}).get('gameTime', 0):
+        return None
+
+    changed_players = []
+    for player in players:
+        old = before[player.get('summonerName')]
+        changes = {field: player[field] for field in DIFF_PLAYER_FIELDS
+                   if field in player and player[field] != old.get(field)}
+        old_scores = old.get('scores') or {}
+        scores = {key: value for key, value in (player.get('scores') or {}).items() if old_scores.get(key) != value}
+        if scores:
+            changes['scores'] = scores
+        if changes:
+            changed_players.append({'summonerName': player.get('summonerName'), **changes})
+
+    old_events = (previous.get('events') or {}).get('Events') or []
+    last_id = old_events[-1].get('EventID', len(old_events) - 1) if old_events else -1
+    events = (current.get('events') or {}).get('Events') or []
+    new_events = [event for i, event in enumerate(events) if event.get('EventID', i) > last_id]
+
+    return {
+        'gameData': {'gameTime': game_time},
+        'allPlayers': changed_players,
+        'events': {'Events': new_events}
+    }
+
+
+def session_info(path: Union[str, Path]) -> Dict:
+    """Record count, wall-clock and game time span, and compression of a session file"""
+    path = Path(path)
+    records = 0
+    raw_bytes = 0
+    first_t = last_t = None
+    first_game = last_game = None
+    for timestamp, payload in read_session(path):
+        records += 1
+        raw_bytes += len(json.dumps(payload, separators=(',', ':')))
+        game_time = float((payload.get('gameData') or {}).get('gameTime') or 0.0)
+        if first_t is None:
+            first_t, first_game = timestamp, game_time
+        last_t, last_game = timestamp, game_time
+
+    size = path.stat().st_size
+    return {
+        'path': str(path),
+        'records': records,
+        'started': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(first_t)) if first_t else None,
+        'duration_seconds': round(last_t - first_t, 1) if records else 0.0,
+        'game_time': [first_game, last_game] if records else None,
+        'size_bytes': size,
+        'payload_bytes': raw_bytes,
+        'compression_ratio': round(raw_bytes / size, 1) if size else None
+    }
+
+
+def _record(args):
+    from riot_live_client import RiotLiveClient
+
+    client = RiotLiveClient(base_url=args.url, async_transport=False)
+    client.recorder = SessionRecorder(args.output)
+    print(f"Recording {client.base_url}/allgamedata every {args.interval:g}s to {args.output}/ (Ctrl+C to stop)")
+    try:
+        while True:
+            started = time.monotonic()
+            client.get_all_game_data()
+            time.sleep(max(args.interval - (time.monotonic() - started), 0))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.recorder.close()
+        stats = client.recorder.get_stats()
+        print(f"\n{stats['records']} records in {stats['sessions']} session(s), last: {stats['path']}")
+
+
+def _info(args):
+    for path in args.paths:
+        print(json.dumps(session_info(path), indent=2))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Record and inspect live game session files")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help="Poll the live client and record allgamedata")
+    record_parser.add_argument('--output', default='recordings', help="Session directory (default: recordings)")
+    record_parser.add_argument('--url', default=None, help="Live client base URL (default: the local client)")
+    record_parser.add_argument('--interval', type=float, default=1.0, help="Seconds between polls (default: 1)")
+    record_parser.set_defaults(func=_record)
+
+    info_parser = commands.add_parser('info', help="Summarize session files")
+    info_parser.add_argument('paths', nargs='+')
+    info_parser.set_defaults(func=_info)
+
+    args = parser.parse_args()
+    args.func(args)
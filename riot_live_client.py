@@ -9,26 +9,81 @@ https://developer.riotgames.com/docs/lol#game-client-api
 
 API läuft lokal auf: https://127.0.0.1:2999/liveclientdata/
 
+Zwei Transporte: synchron (requests) und asynchron (httpx, falls
+installiert - Methoden mit Suffix _async). Ohne laufenden League Client
+ersetzt scripts/live_client_standin.py die API mit aufgezeichneten Daten;
+aufgezeichnet wird mit einem live_session.SessionRecorder (client.recorder).
+
 Author: Merlin Mechler
 """
 
+import asyncio
 import requests
+import threading
 import urllib3
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import time
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 # Disable SSL warnings (Riot uses self-signed certificate)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+# Objective event -> team stat it counts towards (credited to the killer's team)
+OBJECTIVE_EVENTS = {
+    'TurretKilled': 'towers_destroyed',
+    'DragonKill': 'dragons_killed',
+    'BaronKill': 'barons_killed',
+    'HeraldKill': 'heralds_killed',
+}
+
+
 class RiotLiveClient:
-    """Client für Riot Games Live Client Data API"""
+    """
+    Client für Riot Games Live Client Data API
+
+    Hält pro Spiel-Session einen Zustand, damit jeder Poll nur neue Events
+    verarbeitet: Summoner-Name → Team, die zuletzt verarbeitete EventID und
+    laufende Objective-Zähler pro Team. Ein neues Spiel (EventIDs oder
+    Spielzeit laufen zurück, anderes Lineup) setzt den Zustand zurück.
+    """
 
     BASE_URL = "https://127.0.0.1:2999/liveclientdata"
 
-    def __init__(self):
+    # Async transport timeouts in seconds (the API is local: anything slower is a stalled client)
+    ASYNC_CONNECT_TIMEOUT = 0.25
+    ASYNC_READ_TIMEOUT = 1.0
+    ASYNC_ALLGAMEDATA_TIMEOUT = 2.0
+
+    def __init__(self, base_url: Optional[str] = None, async_transport: bool = True):
+        """
+        Args:
+            base_url: Basis-URL der Live Client API (Default: BASE_URL)
+            async_transport: _async Methoden über httpx (falls installiert)
+        """
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
         self.session = requests.Session()
         self.session.verify = False  # Riot uses self-signed cert
+        self.async_transport = async_transport and httpx is not None
+        self._async_client = None
+        self._async_loop = None
+        self._state_lock = threading.Lock()  # polls may run on several threads
+        self.recorder = None  # live_session.SessionRecorder: gets every allgamedata payload
+        self._reset_session()
+
+    def _reset_session(self):
+        """Setzt den Event-Zustand für ein neues Spiel zurück"""
+        self._roster: Optional[Tuple] = None
+        self._team_of: Dict[str, str] = {}  # summonerName -> 'ORDER' / 'CHAOS'
+        self._event_cursor = -1  # last processed EventID
+        self._game_time = 0.0
+        self._objectives: Dict[str, Dict[str, int]] = {
+            team: {stat: 0 for stat in OBJECTIVE_EVENTS.values()} for team in ('ORDER', 'CHAOS')
+        }
 
     def is_game_running(self) -> bool:
         """
@@ -39,7 +94,7 @@ class RiotLiveClient:
         """
         try:
             response = self.session.get(
-                f"{self.BASE_URL}/gamedata",
+                f"{self.base_url}/gamedata",
                 timeout=2
             )
             return response.status_code == 200
@@ -55,17 +110,29 @@ class RiotLiveClient:
         """
         try:
             response = self.session.get(
-                f"{self.BASE_URL}/allgamedata",
+                f"{self.base_url}/allgamedata",
                 timeout=5
             )
 
             if response.status_code == 200:
-                return response.json()
+                all_data = response.json()
+                self._record(all_data)
+                return all_data
             return None
         except Exception as e:
             print(f"Error fetching game data: {e}")
             return None
 
+    def _record(self, all_data: Dict):
+        """Gibt einen Payload an den Recorder weiter (falls gesetzt)"""
+        if self.recorder is None:
+            return
+        try:
+            # One compressed append per poll (well under a millisecond), also on the async path
+            self.recorder.record(all_data)
+        except Exception as e:
+            print(f"Error recording game data: {e}")
+
     def get_active_player(self) -> Optional[Dict]:
         """
         Holt Daten des aktiven Spielers (du selbst)
@@ -75,7 +142,7 @@ class RiotLiveClient:
         """
         try:
             response = self.session.get(
-                f"{self.BASE_URL}/activeplayer",
+                f"{self.base_url}/activeplayer",
                 timeout=2
             )
 
@@ -85,6 +152,66 @@ class RiotLiveClient:
         except:
             return None
 
+    # ------------------------------------------------------------------
+    # Async transport (httpx, one pooled keep-alive connection set per event loop)
+    # ------------------------------------------------------------------
+
+    def _get_async_client(self):
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                verify=False,  # Riot uses self-signed cert
+                timeout=httpx.Timeout(self.ASYNC_READ_TIMEOUT, connect=self.ASYNC_CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    async def _get_async(self, path: str, read_timeout: float):
+        if not self.async_transport:
+            raise RuntimeError("Async transport unavailable (httpx not installed or disabled)")
+        return await self._get_async_client().get(
+            f"{self.base_url}/{path}",
+            timeout=httpx.Timeout(read_timeout, connect=self.ASYNC_CONNECT_TIMEOUT)
+        )
+
+    async def is_game_running_async(self) -> bool:
+        """Wie is_game_running(), ohne einen Thread zu blockieren"""
+        try:
+            response = await self._get_async('gamedata', self.ASYNC_READ_TIMEOUT)
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    async def get_all_game_data_async(self) -> Optional[Dict]:
+        """Wie get_all_game_data(), ohne einen Thread zu blockieren"""
+        try:
+            response = await self._get_async('allgamedata', self.ASYNC_ALLGAMEDATA_TIMEOUT)
+            if response.status_code == 200:
+                all_data = response.json()
+                self._record(all_data)
+                return all_data
+            return None
+        except Exception as e:
+            print(f"Error fetching game data: {e}")
+            return None
+
+    async def get_active_player_async(self) -> Optional[Dict]:
+        """Wie get_active_player(), ohne einen Thread zu blockieren"""
+        try:
+            response = await self._get_async('activeplayer', self.ASYNC_READ_TIMEOUT)
+            if response.status_code == 200:
+                return response.json()
+            return None
+        except Exception:
+            return None
+
+    async def aclose(self):
+        """Schließt die Verbindungen des async Transports"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def extract_team_data(self, all_data: Dict) -> Dict:
         """
         Extrahiert Team-Daten für unser ML-Modell
@@ -106,9 +233,11 @@ class RiotLiveClient:
         blue_team = [p for p in all_players if p.get('team') == 'ORDER']
         red_team = [p for p in all_players if p.get('team') == 'CHAOS']
 
-        # Calculate team stats
-        blue_stats = self._calculate_team_stats(blue_team, events, team='ORDER')
-        red_stats = self._calculate_team_stats(red_team, events, team='CHAOS')
+        # Count objectives of new events, then calculate team stats
+        with self._state_lock:
+            objectives = self._process_events(all_players, events, game_data.get('gameTime', 0))
+        blue_stats = self._calculate_team_stats(blue_team, objectives['ORDER'])
+        red_stats = self._calculate_team_stats(red_team, objectives['CHAOS'])
 
         return {
             'game_time': game_data.get('gameTime', 0),
@@ -127,14 +256,52 @@ class RiotLiveClient:
             'raw_data': all_data  # Für Debugging
         }
 
-    def _calculate_team_stats(self, team_players: List[Dict], events: List[Dict], team: str) -> Dict:
+    def _process_events(self, all_players: List[Dict], events: List[Dict], game_time: float) -> Dict[str, Dict[str, int]]:
+        """
+        Verarbeitet nur die Events seit dem letzten Poll
+
+        Args:
+            all_players: Alle Spieler (für die Summoner → Team Zuordnung)
+            events: Vollständige Event-Liste des Polls (aufsteigende EventIDs)
+            game_time: Spielzeit in Sekunden
+
+        Returns:
+            Kopie der Objective-Zähler pro Team ('ORDER' / 'CHAOS')
+        """
+        roster = tuple((p.get('summonerName'), p.get('team')) for p in all_players)
+        last_event_id = events[-1].get('EventID', len(events) - 1) if events else -1
+
+        # New game (or an older snapshot): start over
+        if (roster != self._roster and self._roster is not None) \
+                or game_time < self._game_time or last_event_id < self._event_cursor:
+            self._reset_session()
+        if roster != self._roster:
+            self._roster = roster
+            self._team_of = {name: team for name, team in roster}
+        self._game_time = game_time
+
+        # Walk back from the end to the first unprocessed event
+        start = len(events)
+        while start > 0 and events[start - 1].get('EventID', start - 1) > self._event_cursor:
+            start -= 1
+
+        for event in events[start:]:
+            stat = OBJECTIVE_EVENTS.get(event.get('EventName', ''))
+            if stat is not None:
+                team = self._team_of.get(event.get('KillerName', ''))
+                if team in self._objectives:
+                    self._objectives[team][stat] += 1
+        self._event_cursor = max(self._event_cursor, last_event_id)
+
+        return {team: dict(counts) for team, counts in self._objectives.items()}
+
+    def _calculate_team_stats(self, team_players: List[Dict], objectives: Dict[str, int]) -> Dict:
         """
         Berechnet aggregierte Team-Stats
 
         Args:
             team_players: Liste der Spieler im Team
-            events: Liste aller Game-Events
-            team: 'ORDER' oder 'CHAOS'
+            objectives: Objective-Zähler des Teams (aus _process_events)
 
         Returns:
             Dict mit Team-Stats
@@ -145,11 +312,8 @@ class RiotLiveClient:
             'assists': 0,
             'total_gold': 0,
             'avg_level': 0,
-            'towers_destroyed': 0,
-            'dragons_killed': 0,
-            'barons_killed': 0,
-            'heralds_killed': 0,
-            'vision_score': 0
+            'vision_score': 0,
+            **objectives
         }
 
         # Aggregate player stats
@@ -166,35 +330,6 @@ class RiotLiveClient:
         if len(team_players) > 0:
             stats['avg_level'] = stats['avg_level'] / len(team_players)
 
-        # Count objectives from events
-        for event in events:
-            event_name = event.get('EventName', '')
-
-            # Towers
-            if event_name == 'TurretKilled':
-                killer_team = event.get('KillerName', '')
-                # Check if killer is from this team
-                if any(killer_team == p.get('summonerName') for p in team_players):
-                    stats['towers_destroyed'] += 1
-
-            # Dragons
-            elif event_name == 'DragonKill':
-                killer = event.get('KillerName', '')
-                if any(killer == p.get('summonerName') for p in team_players):
-                    stats['dragons_killed'] += 1
-
-            # Baron
-            elif event_name == 'BaronKill':
-                killer = event.get('KillerName', '')
-                if any(killer == p.get('summonerName') for p in team_players):
-                    stats['barons_killed'] += 1
-
-            # Herald
-            elif event_name == 'HeraldKill':
-                killer = event.get('KillerName', '')
-                if any(killer == p.get('summonerName') for p in team_players):
-                    stats['heralds_killed'] += 1
-
         return stats
 
     def format_for_prediction(self, team_data: Dict) -> Dict:
@@ -246,6 +381,15 @@ class RiotLiveClient:
         team_data = self.extract_team_data(all_data)
         return self.format_for_prediction(team_data)
 
+    async def get_live_prediction_data_async(self) -> Optional[Dict]:
+        """Wie get_live_prediction_data(), ohne einen Thread zu blockieren"""
+        all_data = await self.get_all_game_data_async()
+        if not all_data:
+            return None
+
+        team_data = self.extract_team_data(all_data)
+        return self.format_for_prediction(team_data)
+
 
 def test_live_api():
     """Test-Funktion - zeigt ob API erreichbar ist"""
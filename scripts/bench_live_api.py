@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Live API Load Test
+Throughput and latency of /api/live/* against a live client stand-in
+
+Start the stand-in and the API first, e.g.:
+    python scripts/live_client_standin.py --synthetic --speed 20 --loop
+    LIVE_CLIENT_URL=http://127.0.0.1:2999/liveclientdata uvicorn api.index:app --port 8000
+
+Usage:
+    python scripts/bench_live_api.py [--url http://127.0.0.1:8000] [--concurrency 32]
+        [--duration 10] [--endpoints predict,status,game-data] [--streams 50]
+
+Request endpoints are hit by --concurrency workers for --duration seconds
+each; --streams additionally holds that many /api/live/stream connections
+open for the same time and counts the events they receive.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+async def load(client: httpx.AsyncClient, url: str, concurrency: int, duration: float) -> Dict:
+    """Hit one endpoint from `concurrency` workers for `duration` seconds"""
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'max': latencies[-1] if latencies else 0.0,
+        'statuses': statuses,
+        'errors': errors
+    }
+
+
+async def hold_streams(client: httpx.AsyncClient, url: str, streams: int, duration: float) -> Dict:
+    """Keep `streams` SSE connections open and count received events by type"""
+    counts: Dict[str, int] = {}
+    failed = 0
+
+    async def stream():
+        nonlocal failed
+        try:
+            async with client.stream('GET', url, timeout=None) as response:
+                if response.status_code != 200:
+                    failed += 1
+                    return
+                async for line in response.aiter_lines():
+                    if line.startswith('event: '):
+                        name = line[7:]
+                        counts[name] = counts.get(name, 0) + 1
+        except httpx.HTTPError:
+            failed += 1
+
+    tasks = [asyncio.ensure_future(stream()) for _ in range(streams)]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {'streams': streams, 'failed': failed, 'events': counts}
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + args.streams + 8)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30.0) as client:
+        streams = None
+        if args.streams:
+            streams = asyncio.ensure_future(
+                hold_streams(client, '/api/live/stream', args.streams,
+                             args.duration * len(args.endpoints) + 1)
+            )
+            await asyncio.sleep(1)  # let the shared poller start
+
+        print(f"{'endpoint':<24} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  status")
+        for endpoint in args.endpoints:
+            result = await load(client, f"/api/live/{endpoint}", args.concurrency, args.duration)
+            statuses = ' '.join(f"{code}x{count}" for code, count in sorted(result['statuses'].items()))
+            if result['errors']:
+                statuses += f" errors x{result['errors']}"
+            print(f"/api/live/{endpoint:<14} {result['requests']:>9} {result['rps']:>9.1f} {result['p50']:>8.1f} "
+                  f"{result['p95']:>8.1f} {result['p99']:>8.1f} {result['max']:>8.1f}  {statuses}")
+
+        if streams is not None:
+            result = await streams
+            events = ', '.join(f"{name}: {count}" for name, count in sorted(result['events'].items())) or 'none'
+            print(f"/api/live/stream: {result['streams']} streams ({result['failed']} failed), events {events}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the live game endpoints")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per endpoint")
+    parser.add_argument('--endpoints', default='predict,status,game-data',
+                        type=lambda value: [e.strip() for e in value.split(',') if e.strip()])
+    parser.add_argument('--streams', type=int, default=0, help="Concurrent /api/live/stream connections")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        sys.exit(130)
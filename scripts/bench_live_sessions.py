@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Live Session Push Load Test
+Many simulated agents pushing game data to /api/live/sessions at once
+
+Each simulated agent replays a generated game (one of --games distinct
+ones, from a random starting minute): one full snapshot (PUT), then a
+diff (PATCH) every --interval seconds. Diff bodies are encoded before the
+run (only the push sequence numbers are prepended per push), so the load
+generator mostly measures the server.
+
+Usage:
+    uvicorn api.index:app --port 8000
+    python scripts/bench_live_sessions.py [--url http://127.0.0.1:8000] [--sessions 1000]
+        [--interval 1] [--duration 30]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from live_client_standin import synthetic_frames
+from live_session import snapshot_diff
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def encode(body: Dict) -> bytes:
+    return json.dumps(body, separators=(',', ':')).encode()
+
+
+def numbered(body: bytes, seq: int, base_seq: int = None) -> bytes:
+    """Encoded JSON object with seq (and base_seq) added in front"""
+    fields = f'"seq":{seq},' if base_seq is None else f'"seq":{seq},"base_seq":{base_seq},'
+    return b'{' + fields.encode() + body[1:]
+
+
+def prepare_games(count: int, minutes: int, step: float) -> List[Dict]:
+    """Frames and pre-encoded diffs (diffs[i]: frame i-1 -> i) per generated game"""
+    games = []
+    for seed in range(count):
+        frames = synthetic_frames(minutes, step, seed)
+        diffs = [b''] + [encode(snapshot_diff(a, b)) for a, b in zip(frames, frames[1:])]
+        games.append({'frames': frames, 'diffs': diffs})
+    return games
+
+
+async def main(args):
+    games = prepare_games(args.games, args.minutes, args.interval * args.speed)
+    frame_count = len(games[0]['frames'])
+    print(f"{args.sessions} sessions, 1 push / {args.interval:g}s each, {args.duration:g}s "
+          f"({args.games} games x {frame_count} frames)")
+
+    latencies: Dict[str, List[float]] = {'PUT': [], 'PATCH': []}
+    statuses: Dict[int, int] = {}
+    errors = 0
+    deadline = time.perf_counter() + args.duration
+    headers = {'Content-Type': 'application/json'}
+    if args.api_key:
+        headers['X-INTERNAL-API-KEY'] = args.api_key
+
+    async def request(client, method: str, url: str, body: bytes) -> int:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, content=body)
+        except httpx.HTTPError:
+            errors += 1
+            return 0
+        latencies[method].append((time.perf_counter() - started) * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        return response.status_code
+
+    async def agent(client, index: int):
+        rng = random.Random(index)
+        game = games[index % len(games)]
+        position = rng.randrange(frame_count // 2)
+        url = f"/api/live/sessions/{uuid.uuid4().hex}"
+        await asyncio.sleep(rng.random() * args.interval)  # spread the pushes
+        send_full = True
+        seq = acked_seq = 0
+        while time.perf_counter() < deadline:
+            tick = time.perf_counter()
+            seq += 1
+            if send_full:
+                status = await request(client, 'PUT', url, numbered(encode(game['frames'][position]), seq))
+            else:
+                status = await request(client, 'PATCH', url, numbered(game['diffs'][position], seq, acked_seq))
+            send_full = status != 200
+            acked_seq = seq
+            position = (position + 1) % frame_count
+            if position == 0:
+                send_full = True  # next game
+            await asyncio.sleep(max(args.interval - (time.perf_counter() - tick), 0))
+        await client.delete(url)
+
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, headers=headers, timeout=30.0) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(agent(client, i) for i in range(args.sessions)))
+        elapsed = time.perf_counter() - started
+        server = (await client.get('/api/live/sessions')).json()
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{total} pushes in {elapsed:.1f}s = {total / elapsed:.0f} pushes/s "
+          f"(target {args.sessions / args.interval:.0f}/s)")
+    print(f"{'method':<8} {'requests':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for method, values in latencies.items():
+        values.sort()
+        print(f"{method:<8} {len(values):>9} {percentile(values, 0.5):>8.1f} {percentile(values, 0.95):>8.1f} "
+              f"{percentile(values, 0.99):>8.1f} {values[-1] if values else 0.0:>8.1f}")
+    status_line = ' '.join(f"{code}x{count}" for code, count in sorted(statuses.items()))
+    print(f"status {status_line}" + (f", errors x{errors}" if errors else ''))
+    print("server: " + json.dumps({key: server.get(key) for key in (
+        'active', 'full_pushes', 'diff_pushes', 'state_predictions', 'unchanged_states', 'conflicts', 'errors',
+        'state_bytes')}))
+    push_ms = server.get('push_ms') or {}
+    if push_ms:
+        print(f"server push_ms: {json.dumps(push_ms)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test pushed live sessions")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--api-key', help="X-INTERNAL-API-KEY, if the server requires it")
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between pushes per session")
+    parser.add_argument('--speed', type=float, default=10.0, help="Game seconds per real second (default: 10)")
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--games', type=int, default=4, help="Distinct generated games")
+    parser.add_argument('--minutes', type=int, default=35, help="Generated game length")
+    parser.add_argument('--connections', type=int, default=256)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Live Game Agent
+Pushes the local League client's game data to a coaching API server
+
+Runs on the player's machine: polls the Live Client Data API and pushes
+to /api/live/sessions/{session_id} - the full allgamedata payload when a
+game starts (or the server asks for it with a 409), then only the changes
+since the last push (live_session.snapshot_diff). Pushes are numbered
+(seq) and each diff names the push it is based on (base_seq), so a diff
+never lands on a server holding other state. Each game gets a new
+session id; the session is ended when the game is over.
+
+Usage:
+    python scripts/live_agent.py --server https://coach.example.com [--api-key KEY] [--interval 1]
+    python scripts/live_agent.py --server http://127.0.0.1:8000 --client-url http://127.0.0.1:2999/liveclientdata
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from live_session import snapshot_diff
+from riot_live_client import RiotLiveClient
+
+
+class Agent:
+    def __init__(self, server: str, api_key: str = None):
+        self.url = f"{server.rstrip('/')}/api/live/sessions"
+        self.http = requests.Session()
+        self.http.headers['Content-Type'] = 'application/json'
+        if api_key:
+            self.http.headers['X-INTERNAL-API-KEY'] = api_key
+        self.session_id = None
+        self.previous = None  # last payload the server acknowledged
+        self.seq = 0  # last push sent
+        self.acked_seq = 0  # seq of self.previous
+
+    def push(self, payload: dict):
+        diff = snapshot_diff(self.previous, payload) if self.previous is not None else None
+        if self.session_id is None or (diff is None and self.previous is not None):
+            self.session_id = uuid.uuid4().hex  # new game
+        if diff is not None:
+            response = self._send('PATCH', {**diff, 'base_seq': self.acked_seq})
+            if response.status_code == 409:
+                # Server lost the session or holds other state (expired, restarted, other worker)
+                response = self._send('PUT', payload)
+        else:
+            response = self._send('PUT', payload)
+        response.raise_for_status()
+        self.previous = payload
+        self.acked_seq = self.seq
+        return response.json()
+
+    def _send(self, method: str, body: dict):
+        self.seq += 1
+        return self.http.request(method, f"{self.url}/{self.session_id}",
+                                 data=json.dumps({**body, 'seq': self.seq}, separators=(',', ':')), timeout=5)
+
+    def end(self):
+        if self.session_id is not None:
+            try:
+                self.http.delete(f"{self.url}/{self.session_id}", timeout=5)
+            except requests.RequestException:
+                pass  # expires on the server anyway
+        self.session_id = None
+        self.previous = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Push live game data to a coaching API server")
+    parser.add_argument('--server', required=True, help="API base URL")
+    parser.add_argument('--api-key', help="X-INTERNAL-API-KEY, if the server requires it")
+    parser.add_argument('--client-url', default=None, help="Live client base URL (default: the local client)")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between pushes (default: 1)")
+    args = parser.parse_args()
+
+    client = RiotLiveClient(base_url=args.client_url, async_transport=False)
+    agent = Agent(args.server, args.api_key)
+    print(f"Pushing {client.base_url} to {agent.url} every {args.interval:g}s (Ctrl+C to stop)")
+
+    try:
+        while True:
+            started = time.monotonic()
+            payload = client.get_all_game_data()
+            if payload is None:
+                if agent.session_id is not None:
+                    print("Game over, session ended")
+                agent.end()
+            else:
+                try:
+                    result = agent.push(payload)
+                    state = result.get('game_state_blue_win_probability')
+                    champion = result.get('champion_matchup_blue_win_probability')
+                    print(f"\r{result['game_time'] / 60:5.1f} min  blue: matchup "
+                          f"{champion * 100 if champion is not None else 0:5.1f}%  state "
+                          f"{f'{state * 100:5.1f}%' if state is not None else '    -'}", end='', flush=True)
+                except requests.RequestException as e:
+                    print(f"\nPush failed: {e}")
+                    agent.previous = None  # resend in full next time
+            time.sleep(max(args.interval - (time.monotonic() - started), 0))
+    except KeyboardInterrupt:
+        agent.end()
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Live Client Stand-in
+Serves recorded liveclientdata JSON in place of a running League client
+
+Replays a sequence of `allgamedata` payloads on the Live Client Data API
+routes (allgamedata, activeplayer, gamedata, playerlist, eventdata, ...),
+so the live client, /api/live/* and the live stream can be exercised and
+load-tested on any machine. Point the API at it with
+LIVE_CLIENT_URL=http://127.0.0.1:2999/liveclientdata.
+
+Sources:
+- a JSON file holding a list of allgamedata payloads
+- a JSON Lines file (one payload per line)
+- a directory of *.json payloads (replayed in file name order)
+- a session file recorded by live_session.py (*.jsonl.gz)
+- --synthetic: a generated game (no recording needed)
+
+Frames advance with game time (gameData.gameTime) at --speed times real
+time, starting with the first request; --step-per-request advances one
+frame per allgamedata request instead (deterministic benchmarks). Payloads
+are encoded once at startup, so the stand-in stays cheap under load.
+
+Usage:
+    python scripts/live_client_standin.py recording.json --speed 10
+    python scripts/live_client_standin.py --synthetic --minutes 35 --loop
+"""
+
+import argparse
+import asyncio
+import bisect
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from live_session import SESSION_SUFFIX, read_session
+
+CHAMPIONS = ['Ahri', 'Garen', 'LeeSin', 'Jinx', 'Thresh', 'Darius', 'Vi', 'Yasuo', 'Caitlyn', 'Lulu']
+OBJECTIVES = ['TurretKilled', 'DragonKill', 'BaronKill', 'HeraldKill']
+
+
+def load_frames(source: str) -> List[Dict]:
+    """Read allgamedata payloads from a JSON / JSON Lines / session file or a directory"""
+    path = Path(source)
+    if path.name.endswith(SESSION_SUFFIX):
+        return [payload for _, payload in read_session(path)]
+    if path.is_dir():
+        return [json.loads(file.read_text()) for file in sorted(path.glob('*.json'))]
+
+    text = path.read_text()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def synthetic_frames(minutes: int, step: float, seed: int) -> List[Dict]:
+    """Generate one game: 10 players, growing scores and gold, kill and objective events"""
+    rng = random.Random(seed)
+    players = [
+        {
+            'summonerName': f"Player{i + 1}",
+            'championName': CHAMPIONS[i],
+            'team': 'ORDER' if i < 5 else 'CHAOS',
+            'level': 1,
+            'currentGold': 500.0,
+            'scores': {'kills': 0, 'deaths': 0, 'assists': 0, 'creepScore': 0, 'wardScore': 0.0}
+        }
+        for i in range(10)
+    ]
+    events = [{'EventID': 0, 'EventName': 'GameStart', 'EventTime': 0.0}]
+    frames = []
+
+    game_time = 0.0
+    while game_time <= minutes * 60:
+        for player in players:
+            player['level'] = min(18, 1 + int(game_time / 100))
+            player['currentGold'] = round(player['currentGold'] + rng.uniform(0, 12) * step, 1)
+            player['scores']['creepScore'] += rng.randint(0, int(step))
+            player['scores']['wardScore'] = round(player['scores']['wardScore'] + rng.uniform(0, 0.05) * step, 2)
+
+        if game_time > 90 and rng.random() < 0.08 * step:
+            killer, victim = rng.sample(range(10), 2)
+            players[killer]['scores']['kills'] += 1
+            players[victim]['scores']['deaths'] += 1
+            events.append({'EventID': len(events), 'EventName': 'ChampionKill', 'EventTime': game_time,
+                           'KillerName': players[killer]['summonerName'],
+                           'VictimName': players[victim]['summonerName']})
+        if game_time > 300 and rng.random() < 0.01 * step:
+            killer = rng.randrange(10)
+            events.append({'EventID': len(events), 'EventName': rng.choice(OBJECTIVES), 'EventTime': game_time,
+                           'KillerName': players[killer]['summonerName']})
+
+        active = players[0]
+        frames.append({
+            'activePlayer': {
+                'summonerName': active['summonerName'],
+                'level': active['level'],
+                'currentGold': active['currentGold'],
+                'championStats': {'currentHealth': 1000.0, 'maxHealth': 1000.0}
+            },
+            'allPlayers': copy.deepcopy(players),
+            'events': {'Events': list(events)},
+            'gameData': {'gameMode': 'CLASSIC', 'gameTime': game_time, 'mapNumber': 11}
+        })
+        game_time += step
+    return frames
+
+
+class Replay:
+    """Frame clock and pre-encoded responses"""
+
+    ROUTES = {
+        'allgamedata': lambda frame: frame,
+        'activeplayer': lambda frame: frame.get('activePlayer'),
+        'activeplayername': lambda frame: (frame.get('activePlayer') or {}).get('summonerName'),
+        'gamedata': lambda frame: frame.get('gameData'),
+        'playerlist': lambda frame: frame.get('allPlayers'),
+        'eventdata': lambda frame: frame.get('events'),
+    }
+
+    def __init__(self, frames: List[Dict], speed: float, loop: bool, step_per_request: bool):
+        if not frames:
+            raise ValueError("No frames to replay")
+        self.speed = speed
+        self.loop = loop
+        self.step_per_request = step_per_request
+        self.times = [float(frame.get('gameData', {}).get('gameTime', 0)) for frame in frames]
+        self.encoded = [
+            {route: json.dumps(extract(frame), separators=(',', ':')).encode()
+             for route, extract in self.ROUTES.items() if extract(frame) is not None}
+            for frame in frames
+        ]
+        self.started_at = None
+        self.position = 0
+        self.requests = 0
+
+    def current(self, advance: bool = False) -> int:
+        """Index of the frame to serve now"""
+        if self.step_per_request:
+            index = self.position
+            if advance:
+                self.position += 1
+                if self.position >= len(self.encoded):
+                    self.position = 0 if self.loop else len(self.encoded) - 1
+            return index
+
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        game_time = self.times[0] + (time.monotonic() - self.started_at) * self.speed
+        span = self.times[-1] - self.times[0]
+        if self.loop and span > 0 and game_time > self.times[-1]:
+            game_time = self.times[0] + (game_time - self.times[0]) % span
+        return max(bisect.bisect_right(self.times, game_time) - 1, 0)
+
+
+def create_app(replay: Replay, latency_ms: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Live Client Stand-in", docs_url=None, redoc_url=None)
+
+    @app.get("/liveclientdata/{route}")
+    async def live_client_data(route: str):
+        if route not in Replay.ROUTES:
+            raise HTTPException(status_code=404, detail=f"Unknown route {route}")
+        replay.requests += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        body = replay.encoded[replay.current(advance=route == 'allgamedata')].get(route)
+        if body is None:
+            # As the real client does for activeplayer while spectating
+            raise HTTPException(status_code=404, detail=f"{route} not available")
+        return Response(content=body, media_type='application/json')
+
+    @app.get("/standin/status")
+    async def standin_status():
+        index = replay.current()
+        return {'frame': index, 'frames': len(replay.encoded), 'game_time': replay.times[index],
+                'requests': replay.requests}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded liveclientdata payloads like a League client")
+    parser.add_argument('source', nargs='?', help="JSON / JSON Lines / session file or directory of allgamedata payloads")
+    parser.add_argument('--synthetic', action='store_true', help="Replay a generated game instead of a recording")
+    parser.add_argument('--minutes', type=int, default=30, help="Synthetic game length (default: 30)")
+    parser.add_argument('--step', type=float, default=1.0, help="Synthetic seconds of game time per frame (default: 1)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--speed', type=float, default=1.0, help="Game seconds per real second (default: 1)")
+    parser.add_argument('--step-per-request', action='store_true', help="Advance one frame per allgamedata request")
+    parser.add_argument('--loop', action='store_true', help="Restart at the end instead of holding the last frame")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Added delay per response")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2999)
+    parser.add_argument('--ssl-certfile', help="Serve HTTPS like the real client (with --ssl-keyfile)")
+    parser.add_argument('--ssl-keyfile')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        frames = synthetic_frames(args.minutes, args.step, args.seed)
+    elif args.source:
+        frames = load_frames(args.source)
+    else:
+        parser.error("give a recording or --synthetic")
+
+    replay = Replay(frames, args.speed, args.loop, args.step_per_request)
+    scheme = 'https' if args.ssl_certfile else 'http'
+    print(f"Replaying {len(frames)} frames ({replay.times[0]:.0f}s - {replay.times[-1]:.0f}s game time) "
+          f"on {scheme}://{args.host}:{args.port}/liveclientdata", file=sys.stderr)
+
+    uvicorn.run(create_app(replay, args.latency_ms), host=args.host, port=args.port, log_level='warning',
+                ssl_certfile=args.ssl_certfile, ssl_keyfile=args.ssl_keyfile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Worker Memory Measurement
+=========================
+Per-process RSS / PSS of a gunicorn master and its workers, read from
+/proc/<pid>/smaps_rollup (Linux only).
+
+PSS splits each shared page evenly between the processes mapping it, so
+the sum of PSS over master + workers is the real memory cost of the
+deployment; RSS counts shared pages once per process.
+
+Usage:
+    # Measure a running server
+    python scripts/measure_worker_memory.py --pid <gunicorn master pid>
+
+    # Start gunicorn without and with SHARED_MODEL_MEMORY and compare
+    python scripts/measure_worker_memory.py --compare [--workers 4]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# smaps_rollup fields reported (kB in the file)
+FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+
+def read_smaps_rollup(pid: int) -> Dict[str, int]:
+    """Memory counters of one process in kB"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].rstrip(':') in FIELDS:
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return values
+
+
+def child_pids(parent: int) -> List[int]:
+    """PIDs whose parent is `parent` (scans /proc, no psutil needed)"""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # Field 4 is the ppid; the command name (field 2) may contain spaces
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == parent:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def measure(master_pid: int) -> Dict:
+    """Memory of the master and each worker, plus totals (MB)"""
+    rows = []
+    for role, pid in [('master', master_pid)] + [('worker', pid) for pid in child_pids(master_pid)]:
+        try:
+            values = read_smaps_rollup(pid)
+        except OSError:
+            continue
+        rows.append({
+            'pid': pid,
+            'role': role,
+            'rss': values.get('Rss', 0) / 1024,
+            'pss': values.get('Pss', 0) / 1024,
+            'shared': (values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0)) / 1024,
+            'private': (values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)) / 1024,
+        })
+
+    workers = [row for row in rows if row['role'] == 'worker']
+    return {
+        'processes': rows,
+        'total_pss': sum(row['pss'] for row in rows),
+        'total_rss': sum(row['rss'] for row in rows),
+        'worker_rss': sum(row['rss'] for row in workers) / len(workers) if workers else 0.0,
+        'worker_private': sum(row['private'] for row in workers) / len(workers) if workers else 0.0,
+    }
+
+
+def print_report(title: str, report: Dict):
+    print(f"\n{title}")
+    print(f"  {'pid':>8} {'role':<7} {'RSS MB':>9} {'PSS MB':>9} {'shared MB':>10} {'private MB':>11}")
+    for row in report['processes']:
+        print(f"  {row['pid']:>8} {row['role']:<7} {row['rss']:>9.1f} {row['pss']:>9.1f} "
+              f"{row['shared']:>10.1f} {row['private']:>11.1f}")
+    print(f"  total PSS {report['total_pss']:.1f} MB | total RSS {report['total_rss']:.1f} MB | "
+          f"per worker: RSS {report['worker_rss']:.1f} MB, private {report['worker_private']:.1f} MB")
+
+
+def run_server(shared: bool, workers: int, port: int, settle: float, chdir: str) -> Dict:
+    """Start gunicorn, wait until it serves /health, measure, stop it"""
+    env = dict(os.environ)
+    env.update({
+        'PYTHONPATH': os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get('PYTHONPATH')])),
+        'SHARED_MODEL_MEMORY': 'true' if shared else 'false',
+        # Without preloading, every worker loads its own copy at startup
+        'MODEL_LOADING': 'eager',
+        'WEB_CONCURRENCY': str(workers),
+        'PORT': str(port),
+    })
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', str(PROJECT_ROOT / 'gunicorn.conf.py'), 'api.index:app'],
+        cwd=chdir, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        deadline = time.time() + 120
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with code {server.returncode}")
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=5).read()
+                if len(child_pids(server.pid)) >= workers:
+                    break
+            except OSError:
+                pass
+            if time.time() > deadline:
+                raise RuntimeError("gunicorn did not become ready within 120s")
+            time.sleep(0.5)
+
+        # Let the remaining workers finish starting (eager loading)
+        time.sleep(settle)
+        return measure(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-worker RSS/PSS of the API server")
+    parser.add_argument('--pid', type=int, help="gunicorn master pid to measure")
+    parser.add_argument('--compare', action='store_true', help="run without and with SHARED_MODEL_MEMORY")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--settle', type=float, default=5.0, help="seconds to wait after the server is ready")
+    parser.add_argument('--chdir', default=str(PROJECT_ROOT), help="server working directory (where models/ lives)")
+    args = parser.parse_args()
+
+    if not Path('/proc/self/smaps_rollup').exists():
+        print("❌ /proc/<pid>/smaps_rollup not available (Linux 4.14+ required)")
+        sys.exit(1)
+
+    if args.pid:
+        print_report(f"Process {args.pid}", measure(args.pid))
+    elif args.compare:
+        before = run_server(False, args.workers, args.port, args.settle, args.chdir)
+        print_report(f"Per-worker loading ({args.workers} workers)", before)
+        after = run_server(True, args.workers, args.port, args.settle, args.chdir)
+        print_report(f"Shared model memory ({args.workers} workers)", after)
+
+        saved = before['total_pss'] - after['total_pss']
+        print(f"\nTotal PSS: {before['total_pss']:.1f} MB -> {after['total_pss']:.1f} MB "
+              f"({saved:+.1f} MB saved, {saved / before['total_pss'] * 100 if before['total_pss'] else 0:.0f}%)")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
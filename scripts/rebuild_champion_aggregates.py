@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Champion Aggregate Rebuild Script
+Recomputes champion_agg and champion_pair_agg from match_champions
+
+Run after applying the aggregate section of db_schema.sql to an existing
+database, and after bulk loads done with trg_champion_agg_insert disabled.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(env_path)
+
+# Override with NON_POOLING URL for direct connection (long-running statement)
+postgres_url_non_pooling = os.getenv("POSTGRES_URL_NON_POOLING")
+if postgres_url_non_pooling:
+    os.environ["POSTGRES_URL"] = postgres_url_non_pooling
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.core.database import get_db_connection, logger
+
+
+def rebuild_champion_aggregates():
+    """Rebuild both aggregate tables in one transaction"""
+    logger.info("🚀 Rebuilding champion aggregates...")
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT to_regproc('rebuild_champion_aggregates') IS NOT NULL as installed")
+        if not cursor.fetchone()['installed']:
+            logger.error("❌ rebuild_champion_aggregates() not found - apply the AGGREGATE TABLES section of db_schema.sql first")
+            return False
+
+        started = time.perf_counter()
+        cursor.execute("SELECT rebuild_champion_aggregates()")
+        conn.commit()
+
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM champion_agg) as champions,
+                (SELECT COUNT(*) FROM champion_pair_agg WHERE same_team) as teammate_pairs,
+                (SELECT COUNT(*) FROM champion_pair_agg WHERE NOT same_team) as opponent_pairs
+        """)
+        counts = cursor.fetchone()
+
+        logger.info(f"✅ Rebuild complete in {time.perf_counter() - started:.1f}s")
+        logger.info(f"   • Champions: {counts['champions']}")
+        logger.info(f"   • Teammate pairs: {counts['teammate_pairs']}")
+        logger.info(f"   • Opponent pairs: {counts['opponent_pairs']}")
+
+        cursor.close()
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Rebuild failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    success = rebuild_champion_aggregates()
+    sys.exit(0 if success else 1)
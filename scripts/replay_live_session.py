@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Live Session Replay
+Feeds a recorded live session through the live prediction path offline
+
+Every recorded allgamedata payload goes through the same stages as a
+live poll - RiotLiveClient.extract_team_data -> format_for_prediction ->
+champion matchup predictor -> game state predictor (from minute 10) - with
+the models the API loads. Reports per-stage latency and throughput and
+the session's win-probability curve.
+
+--speed replays at that multiple of the recorded wall-clock pace (and
+reports how far processing fell behind schedule); the default 0 replays
+as fast as possible. Record sessions with LIVE_RECORD_DIR on the API or
+`python live_session.py record`.
+
+Usage:
+    python scripts/replay_live_session.py recordings/session_20260101_201500.jsonl.gz
+        [--speed 0] [--repeat 3] [--curve-csv curve.csv] [--json report.json]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from live_session import read_session
+from riot_live_client import RiotLiveClient
+
+STAGES = ('extract', 'format', 'champion', 'game_state', 'total')
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def summarize(latencies: List[float]) -> Dict:
+    """Latency percentiles (ms) and single-stage throughput (calls/s)"""
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        'calls': len(latencies),
+        'per_second': len(latencies) / (total / 1000) if total else 0.0,
+        'mean': total / len(latencies) if latencies else 0.0,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'max': latencies[-1] if latencies else 0.0
+    }
+
+
+def replay(records: List, champion_predictor, win_predictor, speed: float) -> Dict:
+    """One pass over the session with a fresh client (event state starts empty): raw timings in ms, curve"""
+    client = RiotLiveClient(async_transport=False)
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    curve: List[Dict] = []
+    lag: List[float] = []
+
+    started = time.perf_counter()
+    first_t = records[0][0]
+    for timestamp, payload in records:
+        if speed > 0:
+            due = started + (timestamp - first_t) / speed
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            elif wait < -0.001:  # more than 1 ms late
+                lag.append(-wait * 1000)
+
+        t0 = time.perf_counter()
+        team_data = client.extract_team_data(payload)
+        t1 = time.perf_counter()
+        pred_data = client.format_for_prediction(team_data)
+        t2 = time.perf_counter()
+        champion = champion_predictor.predict(pred_data['blue_champions'], pred_data['red_champions'])
+        t3 = time.perf_counter()
+        state: Optional[Dict] = None
+        if pred_data['game_duration'] >= 10:
+            state = win_predictor.predict(pred_data)
+        t4 = time.perf_counter()
+
+        timings['extract'].append((t1 - t0) * 1000)
+        timings['format'].append((t2 - t1) * 1000)
+        timings['champion'].append((t3 - t2) * 1000)
+        if state is not None:
+            timings['game_state'].append((t4 - t3) * 1000)
+        timings['total'].append((t4 - t0) * 1000)
+
+        curve.append({
+            'game_time': round(team_data.get('game_time', 0.0), 1),
+            'champion_blue': round(champion['blue_win_probability'], 4),
+            'state_blue': round(state['blue_win_probability'], 4) if state else None,
+            'blue_gold': pred_data['blue_gold'],
+            'red_gold': pred_data['red_gold']
+        })
+
+    return {'elapsed_seconds': time.perf_counter() - started, 'timings': timings, 'lag': lag, 'curve': curve}
+
+
+def load_predictors():
+    """Champion and win predictors, loaded the way the API loads them"""
+    from api.services.ml_engine import ml_engine
+
+    asyncio.run(ml_engine.ensure_loaded('champion_predictor', 'win_predictor'))
+    if ml_engine.champion_predictor is None or ml_engine.win_predictor is None:
+        sys.exit("Champion / win predictor failed to load (see log above)")
+    return ml_engine.champion_predictor, ml_engine.win_predictor
+
+
+def print_report(report: Dict):
+    print(f"\n{report['records']} records x {report['passes']} pass(es), decoded in "
+          f"{report['decode_seconds'] * 1000:.0f} ms; replayed in {report['elapsed_seconds']:.2f}s "
+          f"({report['records_per_second']:.0f} records/s)")
+    print(f"{'stage':<12} {'calls':>7} {'calls/s':>10} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for stage, s in report['stages'].items():
+        print(f"{stage:<12} {s['calls']:>7} {s['per_second']:>10.0f} {s['mean']:>8.3f} {s['p50']:>8.3f} "
+              f"{s['p95']:>8.3f} {s['p99']:>8.3f} {s['max']:>8.3f}")
+    behind = report['behind_schedule']
+    if behind is not None:
+        print(f"Behind schedule: {behind['calls']} of {report['records'] * report['passes']} records "
+              f"(p95 {behind['p95']:.1f} ms, max {behind['max']:.1f} ms)")
+
+    print(f"\n{'minute':>6} {'matchup':>8} {'state':>8} {'gold diff':>10}")
+    by_minute: Dict[int, Dict] = {}
+    for point in report['curve']:
+        by_minute[int(point['game_time'] // 60)] = point  # last point of each minute
+    for minute, point in sorted(by_minute.items()):
+        state = f"{point['state_blue']:.1%}" if point['state_blue'] is not None else '-'
+        print(f"{minute:>6} {point['champion_blue']:>8.1%} {state:>8} {point['blue_gold'] - point['red_gold']:>+10,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded live session through the prediction path")
+    parser.add_argument('session', help="Session file (*.jsonl.gz) from live_session.py")
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help="Multiple of the recorded pace (default: 0 = as fast as possible)")
+    parser.add_argument('--repeat', type=int, default=1, help="Passes over the session; timings from all passes")
+    parser.add_argument('--curve-csv', help="Write the full win-probability curve to this CSV file")
+    parser.add_argument('--json', help="Write the report (timings and curve) to this JSON file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    records = list(read_session(args.session))
+    decode_seconds = time.perf_counter() - started
+    if not records:
+        sys.exit(f"No records in {args.session}")
+
+    champion_predictor, win_predictor = load_predictors()
+
+    passes = [replay(records, champion_predictor, win_predictor, args.speed) for _ in range(max(args.repeat, 1))]
+    elapsed = sum(p['elapsed_seconds'] for p in passes)
+    report = {
+        'records': len(records),
+        'passes': len(passes),
+        'decode_seconds': decode_seconds,
+        'elapsed_seconds': elapsed,
+        'records_per_second': len(records) * len(passes) / elapsed if elapsed else 0.0,
+        'stages': {stage: summarize([v for p in passes for v in p['timings'][stage]]) for stage in STAGES},
+        'behind_schedule': summarize([v for p in passes for v in p['lag']]) if args.speed > 0 else None,
+        'curve': passes[0]['curve']  # the same for every pass
+    }
+
+    print_report(report)
+
+    if args.curve_csv:
+        with open(args.curve_csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(report['curve'][0]))
+            writer.writeheader()
+            writer.writerows(report['curve'])
+        print(f"\nCurve written to {args.curve_csv}")
+    if args.json:
+        Path(args.json).write_text(json.dumps({'session': args.session, 'speed': args.speed, **report}, indent=2))
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
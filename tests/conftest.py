@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the app packages (api, riot_live_client, ...) from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
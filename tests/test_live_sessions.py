@@ -0,0 +1,91 @@
+"""
+Live session store: malformed pushes must not change session state
+"""
+
+import asyncio
+import copy
+
+import numpy as np
+import pytest
+
+from api.services.live_sessions import LiveSessionStore
+
+
+class FakeEngine:
+    async def predict_champion_matchup(self, blue_champions, red_champions):
+        return {'blue_win_probability': 0.5, 'red_win_probability': 0.5, 'confidence': 'low'}
+
+    async def predict_win(self, game_state):
+        return {'blue_win_probability': 0.5, 'red_win_probability': 0.5}
+
+
+def player(team, name, champion, kills=0, gold=500.0):
+    return {'team': team, 'summonerName': name, 'championName': champion, 'level': 1,
+            'currentGold': gold, 'scores': {'kills': kills, 'deaths': 0, 'assists': 0, 'wardScore': 0}}
+
+
+SNAPSHOT = {
+    'seq': 1,
+    'gameData': {'gameTime': 600.0},
+    'allPlayers': [player('ORDER', 'blue1', 'Ahri'), player('CHAOS', 'red1', 'Zed')],
+    'events': {'Events': [{'EventID': 0, 'EventName': 'GameStart'}]}
+}
+DRAGON = {'EventID': 1, 'EventName': 'DragonKill', 'KillerName': 'blue1'}
+
+
+def state_of(store, session_id):
+    slot = store._slots[session_id]
+    return {
+        'players': store.players[slot].copy(),
+        'objectives': store.objectives[slot].copy(),
+        'event_cursor': int(store.event_cursor[slot]),
+        'game_time': float(store.game_time[slot]),
+        'push_seq': int(store.push_seq[slot])
+    }
+
+
+def assert_same_state(before, after):
+    for key, value in before.items():
+        np.testing.assert_array_equal(after[key], value, err_msg=key)
+
+
+@pytest.fixture
+def store():
+    store = LiveSessionStore(FakeEngine(), capacity=2, idle_seconds=60)
+    asyncio.run(store.push('session1', copy.deepcopy(SNAPSHOT), full=True))
+    return store
+
+
+def test_diff_with_malformed_last_event_changes_nothing(store):
+    before = state_of(store, 'session1')
+    diff = {
+        'seq': 2,
+        'base_seq': 1,
+        'gameData': {'gameTime': 660.0},
+        'allPlayers': [{'summonerName': 'blue1', 'currentGold': 900.0, 'scores': {'kills': 1}}],
+        'events': {'Events': [DRAGON, {'EventID': 'two', 'EventName': 'BaronKill', 'KillerName': 'red1'}]}
+    }
+
+    with pytest.raises(ValueError):
+        asyncio.run(store.push('session1', diff, full=False))
+    assert_same_state(before, state_of(store, 'session1'))
+
+    # The agent's retry is applied once, not on top of a half-applied push
+    diff['events']['Events'] = [DRAGON]
+    asyncio.run(store.push('session1', diff, full=False))
+    after = state_of(store, 'session1')
+    assert after['objectives'].sum() == 1
+    assert after['event_cursor'] == 1
+    assert after['push_seq'] == 2
+
+
+def test_snapshot_with_malformed_last_event_changes_nothing(store):
+    before = state_of(store, 'session1')
+    snapshot = copy.deepcopy(SNAPSHOT)
+    snapshot.update(seq=2, gameData={'gameTime': 660.0})
+    snapshot['allPlayers'][0]['scores']['kills'] = 3
+    snapshot['events']['Events'] += [DRAGON, 'not an event']
+
+    with pytest.raises(ValueError):
+        asyncio.run(store.push('session1', snapshot, full=True))
+    assert_same_state(before, state_of(store, 'session1'))
@@ -6,8 +6,11 @@ Predicts win probability based on in-game state (kills, gold, towers, etc.)
 
 import pickle
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
 import joblib
+import numpy as np
+
+from compiled_forest import CompiledForest, MAX_COMPILED_ROWS, load_or_compile
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +21,7 @@ class WinPredictionModel:
     def __init__(self):
         self.model = None
         self.model_type = None  # 'rf' (Random Forest) or 'lr' (Logistic Regression)
+        self.compiled_model: Optional[CompiledForest] = None
 
     def load_model(self, model_path: str):
         """Load the trained win prediction model
@@ -51,6 +55,13 @@ class WinPredictionModel:
             if self.model is None:
                 raise ValueError(f"Model not found in loaded data from {model_path}")
 
+            # Compiled tree traversal for Random Forest models (LR stays on sklearn)
+            try:
+                self.compiled_model = load_or_compile(self.model, model_path)
+            except Exception as e:
+                logger.warning(f"Forest compilation failed, using sklearn: {e}")
+                self.compiled_model = None
+
             logger.info(f"✓ Win Prediction Model loaded from {model_path} (type: {self.model_type})")
 
         except Exception as e:
@@ -79,8 +90,52 @@ class WinPredictionModel:
         if not self.model:
             raise ValueError("Model not loaded. Call load_model() first.")
 
-        # Prepare feature vector (order matches training)
-        features = [[
+        features = [self._build_features(game_state)]
+
+        # Predict
+        try:
+            blue_win_prob = self._predict_proba(features)[0][1]
+        except Exception as e:
+            logger.error(f"Prediction error: {e}")
+            blue_win_prob = self._fallback_probability(game_state)
+
+        return self._format_result(blue_win_prob)
+
+    def predict_batch(self, game_states: List[Dict]) -> List[Dict]:
+        """
+        Predict win probabilities for many game states with one model call
+
+        Args:
+            game_states: List of game state dicts (same keys as predict())
+
+        Returns:
+            List of prediction dicts (same format as predict()), in input order
+        """
+        if not self.model:
+            raise ValueError("Model not loaded. Call load_model() first.")
+
+        if not game_states:
+            return []
+
+        features = np.array([self._build_features(state) for state in game_states], dtype=np.float64)
+
+        try:
+            blue_win_probs = self._predict_proba(features)[:, 1]
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+            blue_win_probs = [self._fallback_probability(state) for state in game_states]
+
+        return [self._format_result(prob) for prob in blue_win_probs]
+
+    def _predict_proba(self, features) -> np.ndarray:
+        """Class probabilities via the compiled forest when available"""
+        if self.compiled_model is not None and len(features) <= MAX_COMPILED_ROWS:
+            return self.compiled_model.predict_proba(features)
+        return self.model.predict_proba(features)
+
+    def _build_features(self, game_state: Dict) -> List[float]:
+        """Prepare feature vector (order matches training)"""
+        return [
             game_state.get('game_duration', 20),
             game_state.get('blue_kills', 0),
             game_state.get('blue_deaths', 0),
@@ -98,24 +153,20 @@ class WinPredictionModel:
             game_state.get('red_dragons', 0),
             game_state.get('red_barons', 0),
             game_state.get('red_vision_score', 0)
-        ]]
-
-        # Predict
-        try:
-            blue_win_prob = self.model.predict_proba(features)[0][1]
-            red_win_prob = 1 - blue_win_prob
-        except Exception as e:
-            logger.error(f"Prediction error: {e}")
-            # Fallback based on gold advantage
-            blue_gold = game_state.get('blue_gold', 0)
-            red_gold = game_state.get('red_gold', 0)
-            total_gold = blue_gold + red_gold
-            if total_gold > 0:
-                blue_win_prob = blue_gold / total_gold
-                red_win_prob = red_gold / total_gold
-            else:
-                blue_win_prob = 0.5
-                red_win_prob = 0.5
+        ]
+
+    def _fallback_probability(self, game_state: Dict) -> float:
+        """Fallback based on gold advantage if the model fails"""
+        blue_gold = game_state.get('blue_gold', 0)
+        red_gold = game_state.get('red_gold', 0)
+        total_gold = blue_gold + red_gold
+        if total_gold > 0:
+            return blue_gold / total_gold
+        return 0.5
+
+    def _format_result(self, blue_win_prob: float) -> Dict:
+        """Build the prediction response dict"""
+        red_win_prob = 1 - blue_win_prob
 
         # Calculate confidence
         confidence = self._calculate_confidence(blue_win_prob)